@@ -4,9 +4,6 @@ integrasi Ollama untuk chatbot
 """
 
 import streamlit as st
-import pandas as pd
-import matplotlib.pyplot as plt
-from PIL import Image
 import base64
 from io import BytesIO
 import time
@@ -14,12 +11,22 @@ import os
 import logging
 
 # Import modul helper
-from helpers.config import CUSTOM_CSS, MAX_REVIEWS_DEFAULT, BROWSER_HEADLESS_DEFAULT
+from helpers.config import (
+    CUSTOM_CSS, MAX_REVIEWS_DEFAULT, BROWSER_HEADLESS_DEFAULT, STREAMING_ANALYSIS_DEFAULT,
+    SENTIMENT_MODEL_PATH, INFERENCE_SERVER_ADDRESS, NEAR_DUPLICATE_WORDCLOUD,
+    DRIVER_POOL_ENABLED, DRIVER_POOL_PREWARM, SCRAPER_BACKEND
+)
 from helpers.scraper import scrape_tokopedia_reviews, validate_tokopedia_url
+from helpers.pipeline import stream_scrape_and_analyze
 from helpers.analyzer import (
     analyze_sentiment, generate_wordcloud, count_sentiments, 
-    get_sentiment_summary, load_sentiment_model
+    get_sentiment_summary, load_sentiment_model, generate_wordcloud_from_frequencies
 )
+from helpers.model_registry import registry
+from helpers.near_duplicates import cluster_near_duplicates
+from helpers.term_store import get_term_store
+from helpers.metrics import metrics, span, timed, start_metrics_server
+from helpers.driver_pool import prewarm_driver_pool
 from helpers.ollama_client import (
     setup_ollama, generate_conclusion, get_chat_response
 )
@@ -97,6 +104,12 @@ def setup_sidebar():
             help="Jumlah maksimal ulasan yang akan diambil"
         )
         
+        streaming_mode = st.checkbox(
+            "Analisis bertahap (streaming)", 
+            value=STREAMING_ANALYSIS_DEFAULT,
+            help="Analisis sentimen setiap halaman ulasan selagi halaman berikutnya dimuat"
+        )
+        
         # Ollama status
         st.markdown("---")
         st.subheader("🤖 Status Ollama")
@@ -116,13 +129,41 @@ def setup_sidebar():
             if st.button("🔄 Coba Lagi"):
                 st.session_state.ollama_available = setup_ollama()
                 st.experimental_rerun()
+        
+        # Status model sentimen bersama
+        st.markdown("---")
+        st.subheader("🧠 Status Model Sentimen")
+        loaded_models = registry.describe()
+        if INFERENCE_SERVER_ADDRESS and not loaded_models:
+            st.caption(f"🔌 Menggunakan server inferensi: {INFERENCE_SERVER_ADDRESS}")
+        elif loaded_models:
+            for info in loaded_models:
+                st.caption(
+                    f"✅ {info['name']} — muat {info['load_seconds']:.1f}s, "
+                    f"warm-up {info['warmup_seconds']:.2f}s, +{info['memory_mb']:.0f} MB"
+                )
+        else:
+            st.caption("⏳ Model sedang dimuat di latar belakang...")
+        
+        # Metrik waktu per tahap (opsional)
+        if st.checkbox("⏱️ Tampilkan metrik pipeline", value=False):
+            stages = metrics.snapshot()
+            if stages:
+                for stage, data in sorted(stages.items()):
+                    st.caption(
+                        f"{stage}: {data['count']}x, rata-rata {data['wall_seconds'] / data['count']:.2f}s "
+                        f"(CPU {data['cpu_seconds'] / data['count']:.2f}s), puncak {data['peak_memory_mb']:.0f} MB"
+                    )
+            else:
+                st.caption("Belum ada metrik yang tercatat")
                 
         st.markdown("---")
         st.write("QuickShop - All-in-One Tokopedia Product Analyzer")
         
-        return headless_mode, max_reviews
+        return headless_mode, max_reviews, streaming_mode
 
-def process_product_url(product_url, headless_mode, max_reviews):
+@timed("pipeline_total")
+def process_product_url(product_url, headless_mode, max_reviews, streaming_mode=False):
     """
     Proses URL produk dan lakukan scraping
     
@@ -130,6 +171,7 @@ def process_product_url(product_url, headless_mode, max_reviews):
         product_url: URL produk Tokopedia
         headless_mode: Boolean untuk mode headless
         max_reviews: Jumlah maksimum ulasan
+        streaming_mode: Analisis setiap halaman ulasan selagi scraping berjalan
         
     Returns:
         Data produk hasil scraping dan analisis
@@ -144,23 +186,41 @@ def process_product_url(product_url, headless_mode, max_reviews):
     with scraping_container:
         st.subheader("🔄 Proses Scraping dan Analisis")
         scraping_status = st.empty()
-        scraping_progress = st.progress(0)
+        scraping_progress = st.progress(0, text="Scraping ulasan")
+        analysis_progress = st.progress(0, text="Analisis sentimen")
         
         # Setup callback function untuk status
         def update_status(message, is_progress=False):
             if is_progress:
-                scraping_progress.progress(message)
+                scraping_progress.progress(message, text="Scraping ulasan")
             else:
                 scraping_status.markdown(message, unsafe_allow_html=True)
         
+        def update_progress(stage, value):
+            if stage == "scraping":
+                scraping_progress.progress(value, text="Scraping ulasan")
+            else:
+                analysis_progress.progress(value, text="Analisis sentimen")
+        
         # Lakukan scraping
         update_status("⏳ Memulai proses scraping...")
-        scraped_data = scrape_tokopedia_reviews(
-            product_url, 
-            max_reviews=max_reviews, 
-            headless=headless_mode,
-            status_callback=update_status
-        )
+        if streaming_mode:
+            # Scraping dan analisis berjalan bersamaan, halaman demi halaman
+            scraped_data, analysis_results = stream_scrape_and_analyze(
+                product_url,
+                max_reviews=max_reviews,
+                headless=headless_mode,
+                model_path=SENTIMENT_MODEL_PATH,
+                status_callback=update_status,
+                progress_callback=update_progress
+            )
+        else:
+            scraped_data = scrape_tokopedia_reviews(
+                product_url, 
+                max_reviews=max_reviews, 
+                headless=headless_mode,
+                status_callback=update_status
+            )
         
         if not scraped_data:
             st.error("❌ Gagal melakukan scraping. Silakan periksa URL produk atau coba lagi nanti.")
@@ -169,16 +229,27 @@ def process_product_url(product_url, headless_mode, max_reviews):
         # Tampilkan info produk awal
         product_name = scraped_data['product_name']
         update_status(f"✅ Scraping selesai! Berhasil mendapatkan data produk: {product_name}")
+        scraping_progress.progress(1.0, text="Scraping ulasan")
+        
+        if not streaming_mode:
+            # Load sentiment model
+            update_status("⏳ Memuat model analisis sentimen...")
+            model_loaded = load_sentiment_model(SENTIMENT_MODEL_PATH)
+            if not model_loaded:
+                st.warning("⚠️ Gagal memuat model sentimen. Menggunakan fallback.")
+            
+            # Analisis sentimen
+            update_status("⏳ Menganalisis sentimen ulasan...")
+            analysis_results = analyze_sentiment(scraped_data['reviews'])
+            analysis_progress.progress(1.0, text="Analisis sentimen")
         
-        # Load sentiment model
-        update_status("⏳ Memuat model analisis sentimen...")
-        model_loaded = load_sentiment_model("quickshop-indobert-sentiment")
-        if not model_loaded:
-            st.warning("⚠️ Gagal memuat model sentimen. Menggunakan fallback.")
+        sentiments, preprocessed_texts, positive_counts, negative_counts, confidences = analysis_results
         
-        # Analisis sentimen
-        update_status("⏳ Menganalisis sentimen ulasan...")
-        sentiments, preprocessed_texts, positive_counts, negative_counts = analyze_sentiment(scraped_data['reviews'])
+        # Kelompokkan ulasan yang hampir identik (hanya jika dipakai untuk wordcloud)
+        cluster_ids = None
+        if NEAR_DUPLICATE_WORDCLOUD:
+            with span("near_duplicates"):
+                cluster_ids = cluster_near_duplicates(preprocessed_texts)
         
         # Tambahkan hasil analisis ke data
         for i in range(len(scraped_data['reviews'])):
@@ -186,20 +257,34 @@ def process_product_url(product_url, headless_mode, max_reviews):
             scraped_data['reviews'][i]['Preprocessed'] = preprocessed_texts[i]
             scraped_data['reviews'][i]['Positive_Count'] = positive_counts[i]
             scraped_data['reviews'][i]['Negative_Count'] = negative_counts[i]
+            scraped_data['reviews'][i]['Confidence'] = round(confidences[i], 4)
+            if cluster_ids is not None:
+                scraped_data['reviews'][i]['Cluster'] = cluster_ids[i]
         
-        # Hitung statistik sentimen
-        sentiment_counts = count_sentiments(sentiments)
-        scraped_data['sentiment_counts'] = sentiment_counts
-        
-        # Generate sentiment summary
-        sentiment_summary = get_sentiment_summary(sentiments)
-        scraped_data['sentiment_summary'] = sentiment_summary
+        with span("summary"):
+            # Hitung statistik sentimen
+            sentiment_counts = count_sentiments(sentiments)
+            scraped_data['sentiment_counts'] = sentiment_counts
+            
+            # Generate sentiment summary
+            sentiment_summary = get_sentiment_summary(sentiments)
+            scraped_data['sentiment_summary'] = sentiment_summary
         
         # Generate wordcloud
         update_status("⏳ Membuat wordcloud...")
-        wordcloud_base64 = generate_wordcloud(preprocessed_texts)
+        wordcloud_base64 = generate_wordcloud(preprocessed_texts, cluster_ids)
         scraped_data['wordcloud_base64'] = wordcloud_base64
         
+        # Perbarui frekuensi kata produk dengan ulasan baru, lalu buat wordcloud per sentimen
+        term_store = get_term_store()
+        if term_store is not None:
+            product_key = format_product_name_for_filename(scraped_data['product_name'])
+            term_store.add_reviews(product_key, scraped_data['reviews'])
+            for sentiment in ("Positif", "Negatif"):
+                frequencies = term_store.frequencies(product_key, sentiment)
+                scraped_data[f'wordcloud_{sentiment.lower()}_base64'] = generate_wordcloud_from_frequencies(frequencies)
+                scraped_data[f'top_terms_{sentiment.lower()}'] = term_store.top_terms(product_key, sentiment, limit=10)
+        
         # Generate conclusion with Ollama
         if st.session_state.ollama_available:
             update_status("⏳ Menghasilkan kesimpulan dengan Ollama...")
@@ -214,7 +299,8 @@ def process_product_url(product_url, headless_mode, max_reviews):
         
         # Selesai
         update_status("✅ Analisis selesai!")
-        scraping_progress.progress(1.0)
+        scraping_progress.progress(1.0, text="Scraping ulasan")
+        analysis_progress.progress(1.0, text="Analisis sentimen")
         
         return scraped_data
 
@@ -244,6 +330,10 @@ def display_sentiment_analysis(product_data):
     Args:
         product_data: Data produk untuk ditampilkan
     """
+    # Import berat hanya saat tab statistik ditampilkan
+    import pandas as pd
+    import matplotlib.pyplot as plt
+    
     st.markdown("<h3 class='sub-header'>📊 Statistik Ulasan</h3>", unsafe_allow_html=True)
     st.write(f"**Total Ulasan yang Dianalisis:** {len(product_data['reviews'])}")
     
@@ -313,12 +403,25 @@ def display_wordcloud(product_data):
     # Convert base64 to image
     if product_data.get('wordcloud_base64'):
         try:
+            from PIL import Image
             wordcloud_img = Image.open(BytesIO(base64.b64decode(product_data['wordcloud_base64'])))
             st.image(wordcloud_img, caption='Word Cloud Ulasan Produk', use_column_width=True)
         except Exception as e:
             st.error(f"Gagal menampilkan wordcloud: {str(e)}")
     else:
         st.warning("Word cloud tidak tersedia")
+    
+    # Wordcloud per sentimen dari seluruh riwayat ulasan produk
+    col1, col2 = st.columns(2)
+    for column, sentiment in ((col1, "Positif"), (col2, "Negatif")):
+        with column:
+            st.markdown(f"#### Ulasan {sentiment}")
+            encoded = product_data.get(f'wordcloud_{sentiment.lower()}_base64')
+            if encoded:
+                st.image(BytesIO(base64.b64decode(encoded)), use_column_width=True)
+            top_terms = product_data.get(f'top_terms_{sentiment.lower()}')
+            if top_terms:
+                st.write(", ".join(f"{term} ({count})" for term, count in top_terms))
 
 def display_reviews(product_data):
     """
@@ -327,6 +430,8 @@ def display_reviews(product_data):
     Args:
         product_data: Data produk untuk ditampilkan
     """
+    import pandas as pd
+    
     st.markdown("<h3 class='sub-header'>📋 Detail Ulasan</h3>", unsafe_allow_html=True)
     
     # Konversi ke DataFrame
@@ -356,6 +461,10 @@ def display_reviews(product_data):
         else:
             filtered_df = df
         
+        # Tampilkan ID cluster ulasan hampir identik jika tersedia
+        if 'Cluster' in df.columns:
+            display_columns.append('Cluster')
+        
         # Tampilkan DataFrame
         st.dataframe(
             filtered_df[display_columns],
@@ -367,6 +476,10 @@ def display_reviews(product_data):
                     "Sentimen",
                     help="Hasil analisis sentimen",
                     width="medium"
+                ),
+                "Cluster": st.column_config.NumberColumn(
+                    "Cluster",
+                    help="Ulasan dengan cluster yang sama hampir identik"
                 )
             },
             use_container_width=True
@@ -421,6 +534,18 @@ def main():
     """
     Fungsi utama aplikasi
     """
+    # Muat dan warm-up model sentimen sekali per proses, di latar belakang
+    if not INFERENCE_SERVER_ADDRESS:
+        registry.load_in_background(SENTIMENT_MODEL_PATH)
+    
+    # Siapkan Chrome driver sekali per proses agar scraping pertama tidak menunggu browser
+    # (backend HTTP hanya memakai Chrome sebagai fallback, jadi tidak perlu prewarm)
+    if DRIVER_POOL_ENABLED and SCRAPER_BACKEND == "selenium":
+        prewarm_driver_pool(DRIVER_POOL_PREWARM)
+    
+    # Endpoint /metrics lokal jika METRICS_HTTP_PORT diatur
+    start_metrics_server()
+    
     # Inisialisasi session state
     initialize_session_state()
     
@@ -428,7 +553,7 @@ def main():
     display_header()
     
     # Setup sidebar dan dapatkan konfigurasi
-    headless_mode, max_reviews = setup_sidebar()
+    headless_mode, max_reviews, streaming_mode = setup_sidebar()
     
     # Main content
     st.markdown("<h2 class='sub-header'>🔍 Analisis Produk</h2>", unsafe_allow_html=True)
@@ -440,7 +565,10 @@ def main():
     if st.button("🚀 Analisis Sentimen"):
         if product_url:
             # Proses URL produk
-            product_data = process_product_url(product_url, headless_mode, max_reviews)
+            product_data = process_product_url(product_url, headless_mode, max_reviews, streaming_mode)
+            
+            # Ekspor metrik waktu per tahap ke file Prometheus
+            metrics.write_prometheus()
             
             if product_data:
                 # Simpan data produk ke session state
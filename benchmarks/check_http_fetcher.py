@@ -0,0 +1,135 @@
+"""
+Pemeriksaan backend HTTP scraper terhadap server fixture lokal
+
+Memastikan ulasan sintetis diambil lengkap dan dalam format scraper, dan bahwa
+kegagalan endpoint GraphQL ulasan membuat scraper beralih ke Selenium, bahwa
+kegagalan halaman ulasan berikutnya tetap menyimpan hasil sebagian, dan
+bahwa batas waktu batch scraper menghentikan request yang lambat. Script
+gagal (exit code 1) jika salah satu pemeriksaan tidak terpenuhi.
+
+Contoh:
+    python benchmarks/check_http_fetcher.py
+"""
+
+import os
+import sys
+from contextlib import contextmanager
+from typing import Iterator, List, Tuple
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+
+from benchmarks.fixture_server import start_fixture_server
+
+# URL produk Tokopedia asli; request-nya diarahkan ke server fixture lewat override_base_url
+PRODUCT_URL = "https://www.tokopedia.com/toko/produk"
+
+@contextmanager
+def serve_fixtures(**kwargs) -> Iterator[None]:
+    """
+    Jalankan server fixture dan arahkan backend HTTP ke server tersebut selama blok with
+    """
+    from helpers.http_fetcher import override_base_url
+    
+    server = start_fixture_server(**kwargs)
+    try:
+        with override_base_url(f"http://127.0.0.1:{server.server_address[1]}"):
+            yield
+    finally:
+        server.shutdown()
+        server.server_close()
+
+def check_fetch(synthetic_size: int = 95, max_reviews: int = 80) -> List[Tuple[str, bool]]:
+    """
+    Ambil ulasan dari server fixture lewat scraper dengan backend HTTP
+    """
+    from helpers.config import EMPTY_REVIEW_PLACEHOLDER
+    from helpers.scraper import scrape_tokopedia_reviews
+    
+    with serve_fixtures(synthetic_size=synthetic_size):
+        data = scrape_tokopedia_reviews(PRODUCT_URL, max_reviews=max_reviews, backend="http")
+    
+    reviews = (data or {}).get("reviews", [])
+    return [
+        ("data produk diterima", data is not None),
+        ("nama produk dari halaman", bool(data) and data["product_name"] == "Produk Sintetis QuickShop"),
+        (f"{max_reviews} ulasan diambil", len(reviews) == max_reviews),
+        ("format ulasan {Nama, Rating, Ulasan}", all(set(r) == {"Nama", "Rating", "Ulasan"} for r in reviews)),
+        ("rating 1-5", all(1 <= r["Rating"] <= 5 for r in reviews)),
+        ("ulasan kosong memakai placeholder", all(r["Ulasan"] for r in reviews)
+         and any(r["Ulasan"] == EMPTY_REVIEW_PLACEHOLDER for r in reviews)),
+    ]
+
+def check_fallback() -> List[Tuple[str, bool]]:
+    """
+    Pastikan kegagalan endpoint GraphQL ulasan diteruskan ke fallback Selenium
+    """
+    from helpers import scraper
+    
+    selenium_calls = []
+    
+    def fake_selenium(product_url, max_reviews, headless, status_callback, deadline=None):
+        selenium_calls.append(product_url)
+        yield {"type": "product", "product_name": "Selenium", "description": ""}
+    
+    original = scraper.iter_selenium_reviews
+    scraper.iter_selenium_reviews = fake_selenium
+    try:
+        with serve_fixtures(fail_graphql=True):
+            events = list(scraper.iter_tokopedia_reviews(PRODUCT_URL, max_reviews=10, backend="http"))
+    finally:
+        scraper.iter_selenium_reviews = original
+    
+    return [
+        ("Selenium dipanggil saat GraphQL gagal", len(selenium_calls) == 1),
+        ("tidak ada event produk ganda", [e["type"] for e in events] == ["product"]),
+    ]
+
+def check_partial(synthetic_size: int = 95, fail_from_page: int = 4) -> List[Tuple[str, bool]]:
+    """
+    Pastikan kegagalan halaman ulasan setelah halaman pertama tetap mengembalikan hasil sebagian
+    """
+    from helpers.scraper import scrape_tokopedia_reviews
+    
+    with serve_fixtures(synthetic_size=synthetic_size, fail_from_page=fail_from_page):
+        data = scrape_tokopedia_reviews(PRODUCT_URL, max_reviews=synthetic_size, backend="http")
+    
+    expected = (fail_from_page - 1) * 10
+    return [
+        (f"{expected} ulasan dari halaman sebelum gagal disimpan",
+         data is not None and len(data["reviews"]) == expected),
+    ]
+
+def check_deadline(delay_ms: float = 400, timeout: float = 1.0) -> List[Tuple[str, bool]]:
+    """
+    Pastikan deadline scrape_with_deadline memotong request yang sedang berjalan
+    """
+    import time
+    from helpers import batch_scraper
+    
+    # 0.4s per respons: 20 halaman ulasan butuh ~2s dengan 4 worker;
+    # 3s per respons: satu request sudah melewati batas waktu
+    error = None
+    with serve_fixtures(synthetic_size=200, delay_ms=delay_ms):
+        start = time.monotonic()
+        try:
+            batch_scraper.scrape_with_deadline(PRODUCT_URL, 200, True, timeout, backend="http")
+        except Exception as e:
+            error = e
+        elapsed = time.monotonic() - start
+    
+    label = f"respons {delay_ms / 1000:.1f}s"
+    return [
+        (f"{label}: scraping dihentikan dengan TimeoutError", isinstance(error, TimeoutError)),
+        (f"{label}: berhenti dekat batas waktu {timeout:.0f}s", elapsed < timeout + 0.3),
+    ]
+
+def main() -> int:
+    failed = False
+    for name, ok in check_fetch() + check_fallback() + check_partial() + check_deadline() + check_deadline(delay_ms=3000):
+        failed = failed or not ok
+        print(f"{'OK   ' if ok else 'GAGAL'} {name}")
+    return 1 if failed else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,105 @@
+"""
+Generator korpus ulasan Tokopedia sintetis berbahasa Indonesia untuk benchmark
+
+Korpus bersifat reproducible (seed tetap) dan memuat slang, emoji, huruf
+berulang, tanda baca, ulasan duplikat, serta placeholder "Tidak ada ulasan".
+"""
+
+import random
+from typing import Any, Dict, List
+
+from helpers.config import EMOJI_REPLACEMENTS, POSITIVE_WORDS, NEGATIVE_WORDS, EMPTY_REVIEW_PLACEHOLDER
+
+# Kata-kata netral yang umum muncul di ulasan produk
+NEUTRAL_WORDS = [
+    "barang", "produk", "pengiriman", "packing", "seller", "toko", "harga", "kualitas",
+    "sesuai", "deskripsi", "gambar", "warna", "ukuran", "kurir", "sampai", "pesanan",
+    "sudah", "diterima", "dengan", "baik", "semoga", "awet", "dipakai", "coba", "dulu",
+    "ya", "kak", "min", "nya", "juga", "untuk", "harganya", "lumayan", "standar"
+]
+
+SLANG_WORDS = ["gk", "ga", "tdk", "bgt", "bgtt", "ok", "mantul", "sip", "gan", "bund"]
+
+EMOJIS = list(EMOJI_REPLACEMENTS.keys())
+PUNCTUATION = ["!", "!!", "!!!", ".", "..", ",", "?", " :)", " :("]
+PLACEHOLDER_REVIEW = EMPTY_REVIEW_PLACEHOLDER
+
+def _elongate(word: str, rng: random.Random) -> str:
+    """
+    Ulangi huruf terakhir kata, misalnya "mantap" menjadi "mantaaap"
+    """
+    vowels = [i for i, char in enumerate(word) if char in "aiueo"]
+    if not vowels:
+        return word
+    position = vowels[-1]
+    return word[:position] + word[position] * rng.randint(3, 6) + word[position + 1:]
+
+def generate_review_text(rng: random.Random, sentiment: int) -> str:
+    """
+    Buat satu teks ulasan sintetis
+    
+    Args:
+        rng: Random generator
+        sentiment: 0 negatif, 1 netral, 2 positif
+        
+    Returns:
+        Teks ulasan
+    """
+    length = rng.randint(3, 40)
+    words = []
+    for _ in range(length):
+        roll = rng.random()
+        if roll < 0.2 and sentiment == 2:
+            word = rng.choice(POSITIVE_WORDS)
+        elif roll < 0.2 and sentiment == 0:
+            word = rng.choice(NEGATIVE_WORDS)
+        elif roll < 0.3:
+            word = rng.choice(SLANG_WORDS)
+        else:
+            word = rng.choice(NEUTRAL_WORDS)
+        
+        if rng.random() < 0.08:
+            word = _elongate(word, rng)
+        if rng.random() < 0.05:
+            word = word.upper()
+        if rng.random() < 0.1:
+            word += rng.choice(PUNCTUATION)
+        if rng.random() < 0.06:
+            word += " " + rng.choice(EMOJIS) * rng.randint(1, 3)
+        words.append(word)
+    return " ".join(words)
+
+def generate_reviews(
+    size: int,
+    seed: int = 42,
+    duplicate_rate: float = 0.1,
+    placeholder_rate: float = 0.05
+) -> List[Dict[str, Any]]:
+    """
+    Buat korpus ulasan sintetis dengan format hasil scraper
+    
+    Args:
+        size: Jumlah ulasan
+        seed: Seed random agar korpus reproducible
+        duplicate_rate: Proporsi ulasan yang menyalin ulasan sebelumnya
+        placeholder_rate: Proporsi ulasan tanpa teks ("Tidak ada ulasan")
+        
+    Returns:
+        List dictionary {"Nama", "Rating", "Ulasan"}
+    """
+    rng = random.Random(seed)
+    reviews = []
+    for i in range(size):
+        sentiment = rng.choices([0, 1, 2], weights=[0.2, 0.15, 0.65])[0]
+        rating = {0: rng.choice([1, 2, 2, 3]), 1: rng.choice([3, 3, 4]), 2: rng.choice([4, 5, 5])}[sentiment]
+        
+        roll = rng.random()
+        if reviews and roll < duplicate_rate:
+            text = rng.choice(reviews)["Ulasan"]
+        elif roll < duplicate_rate + placeholder_rate:
+            text = PLACEHOLDER_REVIEW
+        else:
+            text = generate_review_text(rng, sentiment)
+        
+        reviews.append({"Nama": f"P***{i % 97}", "Rating": rating, "Ulasan": text})
+    return reviews
@@ -0,0 +1,206 @@
+"""
+Server fixture lokal yang memutar ulang respons halaman produk dan GraphQL ulasan Tokopedia
+
+Dipakai untuk mencoba dan mengukur backend HTTP scraper tanpa mengakses
+Tokopedia. Respons diambil dari direktori fixture hasil --capture, atau dibuat
+dari korpus sintetis jika fixture tidak tersedia.
+
+Contoh:
+    python benchmarks/fixture_server.py --capture https://www.tokopedia.com/toko/produk --fixtures fixtures/produk
+    python benchmarks/fixture_server.py --fixtures fixtures/produk --port 8765
+    python benchmarks/fixture_server.py --synthetic 500 --delay-ms 50
+
+Untuk scraper, atur HTTP_BASE_URL_OVERRIDE = "http://127.0.0.1:8765" (atau pakai
+http_fetcher.override_base_url) lalu scrape https://www.tokopedia.com/toko/produk.
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+
+from benchmarks.corpus import generate_reviews
+
+PRODUCT_FILE = "product.html"
+REVIEW_PAGE_FILE = "reviews_{page}.json"
+SYNTHETIC_PRODUCT_ID = "100001"
+
+def synthetic_product_page(product_id: str = SYNTHETIC_PRODUCT_ID) -> str:
+    """
+    HTML halaman produk minimal dengan elemen yang dibaca parse_product_page
+    """
+    return (
+        "<html><head><script>window.__cache={\"productID\":\"" + product_id + "\"}</script></head><body>"
+        "<h1 data-testid=\"lblPDPDetailProductName\">Produk Sintetis QuickShop</h1>"
+        "<div data-testid=\"lblPDPDescriptionProduk\">Deskripsi produk sintetis untuk pengujian lokal.</div>"
+        "</body></html>"
+    )
+
+def synthetic_review_page(reviews: List[Dict[str, Any]], page: int, limit: int) -> List[Dict[str, Any]]:
+    """
+    Respons GraphQL productReviewList dari korpus sintetis
+    """
+    start = (page - 1) * limit
+    items = [
+        {
+            "id": str(start + offset + 1),
+            "message": "" if review["Ulasan"] == "Tidak ada ulasan" else review["Ulasan"],
+            "productRating": review["Rating"],
+            "user": {"fullName": review["Nama"]}
+        }
+        for offset, review in enumerate(reviews[start:start + limit])
+    ]
+    return [{"data": {"productrevGetProductReviewList": {
+        "productID": SYNTHETIC_PRODUCT_ID,
+        "list": items,
+        "hasNext": start + limit < len(reviews),
+        "totalReviews": len(reviews)
+    }}}]
+
+def capture_fixtures(product_url: str, fixtures_dir: str, max_pages: int) -> int:
+    """
+    Rekam halaman produk dan halaman ulasan asli ke direktori fixture
+    
+    Returns:
+        Jumlah halaman ulasan yang direkam
+    """
+    from helpers.http_fetcher import (
+        get_http_session, parse_product_page, fetch_review_page, HTTP_FETCH_TIMEOUT
+    )
+    
+    os.makedirs(fixtures_dir, exist_ok=True)
+    response = get_http_session().get(product_url, timeout=HTTP_FETCH_TIMEOUT)
+    response.raise_for_status()
+    with open(os.path.join(fixtures_dir, PRODUCT_FILE), "w", encoding="utf-8") as f:
+        f.write(response.text)
+    
+    product_id = parse_product_page(response.text)[0]
+    pages = 0
+    for page in range(1, max_pages + 1):
+        result = fetch_review_page(product_id, page, product_url=product_url)
+        with open(os.path.join(fixtures_dir, REVIEW_PAGE_FILE.format(page=page)), "w", encoding="utf-8") as f:
+            json.dump([{"data": {"productrevGetProductReviewList": result}}], f, ensure_ascii=False)
+        pages += 1
+        if not result.get("hasNext"):
+            break
+    return pages
+
+def make_handler(fixtures_dir: Optional[str], synthetic: List[Dict[str, Any]], delay: float,
+                 fail_graphql: bool = False, fail_from_page: Optional[int] = None):
+    class FixtureHandler(BaseHTTPRequestHandler):
+        def _send(self, status: int, body: bytes, content_type: str):
+            time.sleep(delay)
+            try:
+                self.send_response(status)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+            except (BrokenPipeError, ConnectionResetError):
+                # Klien sudah berhenti menunggu (misalnya deadline scraper lewat)
+                pass
+        
+        def _fixture(self, filename: str) -> Optional[bytes]:
+            if not fixtures_dir:
+                return None
+            path = os.path.join(fixtures_dir, filename)
+            if not os.path.exists(path):
+                return None
+            with open(path, "rb") as f:
+                return f.read()
+        
+        def do_GET(self):
+            body = self._fixture(PRODUCT_FILE) or synthetic_product_page().encode("utf-8")
+            self._send(200, body, "text/html; charset=utf-8")
+        
+        def do_POST(self):
+            if not self.path.startswith("/graphql"):
+                self._send(404, b"{}", "application/json")
+                return
+            if fail_graphql:
+                self._send(403, b'{"errors": ["forbidden"]}', "application/json")
+                return
+            length = int(self.headers.get("Content-Length", 0))
+            payload = json.loads(self.rfile.read(length) or b"[]")
+            variables = (payload[0] if isinstance(payload, list) else payload).get("variables", {})
+            page, limit = int(variables.get("page", 1)), int(variables.get("limit", 10))
+            if fail_from_page is not None and page >= fail_from_page:
+                self._send(403, b'{"errors": ["forbidden"]}', "application/json")
+                return
+            
+            body = self._fixture(REVIEW_PAGE_FILE.format(page=page))
+            if body is None:
+                body = json.dumps(synthetic_review_page(synthetic, page, limit), ensure_ascii=False).encode("utf-8")
+            self._send(200, body, "application/json")
+        
+        def log_message(self, format, *args):
+            pass
+    
+    return FixtureHandler
+
+def start_fixture_server(
+    fixtures_dir: Optional[str] = None,
+    synthetic_size: int = 200,
+    delay_ms: float = 0,
+    port: int = 0,
+    fail_graphql: bool = False,
+    fail_from_page: Optional[int] = None
+) -> ThreadingHTTPServer:
+    """
+    Jalankan server fixture di thread latar belakang
+    
+    Args:
+        fixtures_dir: Direktori fixture (opsional)
+        synthetic_size: Jumlah ulasan sintetis jika fixture tidak ada
+        delay_ms: Latensi buatan per respons
+        port: Port HTTP (0 = port bebas acak)
+        fail_graphql: Tolak semua request GraphQL dengan status 403
+        fail_from_page: Tolak halaman ulasan mulai nomor ini dengan status 403 (opsional)
+        
+    Returns:
+        Server yang sedang berjalan (hentikan dengan shutdown() lalu server_close())
+    """
+    handler = make_handler(
+        fixtures_dir, generate_reviews(synthetic_size), delay_ms / 1000, fail_graphql, fail_from_page
+    )
+    server = ThreadingHTTPServer(("127.0.0.1", port), handler)
+    threading.Thread(target=server.serve_forever, daemon=True, name="fixture-server").start()
+    return server
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Server fixture Tokopedia lokal")
+    parser.add_argument("--fixtures", help="Direktori fixture (product.html, reviews_<n>.json)")
+    parser.add_argument("--capture", metavar="PRODUCT_URL", help="Rekam fixture dari URL produk asli lalu keluar")
+    parser.add_argument("--capture-pages", type=int, default=5, help="Jumlah halaman ulasan yang direkam")
+    parser.add_argument("--synthetic", type=int, default=200, help="Jumlah ulasan sintetis jika fixture tidak ada")
+    parser.add_argument("--delay-ms", type=float, default=0, help="Latensi buatan per respons")
+    parser.add_argument("--port", type=int, default=8765)
+    args = parser.parse_args()
+    
+    if args.capture:
+        if not args.fixtures:
+            parser.error("--capture membutuhkan --fixtures")
+        pages = capture_fixtures(args.capture, args.fixtures, args.capture_pages)
+        print(f"{pages} halaman ulasan direkam ke {args.fixtures}")
+        return 0
+    
+    server = start_fixture_server(args.fixtures, args.synthetic, args.delay_ms, args.port)
+    print(f"Server fixture berjalan: http://127.0.0.1:{args.port} (HTTP_BASE_URL_OVERRIDE)")
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.shutdown()
+        server.server_close()
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,102 @@
+"""
+Pemeriksaan anggaran waktu import untuk `helpers` dan `app`
+
+Setiap target diimpor di proses Python baru (cold start) beberapa kali. Script
+gagal (exit code 1) jika waktu import terbaik melebihi anggaran, atau jika
+dependensi berat ikut termuat padahal seharusnya ditunda.
+
+Contoh:
+    python benchmarks/import_budget.py
+    python benchmarks/import_budget.py --runs 5 --json hasil_import.json
+"""
+
+import os
+import sys
+import json
+import argparse
+import subprocess
+from typing import Any, Dict, List
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Dependensi berat yang harus ditunda sampai fungsi yang membutuhkannya dipanggil
+HEAVY_MODULES = [
+    "torch", "transformers", "matplotlib", "wordcloud",
+    "selenium", "webdriver_manager", "pandas"
+]
+
+# Target import, anggaran waktu (detik), dan modul yang tidak boleh ikut termuat
+IMPORT_BUDGETS = [
+    {"target": "helpers", "budget": 0.5, "forbidden": HEAVY_MODULES},
+    {"target": "helpers.analyzer", "budget": 1.0, "forbidden": HEAVY_MODULES},
+    {"target": "helpers.scraper", "budget": 0.5, "forbidden": HEAVY_MODULES},
+    # Streamlit sendiri sudah memuat pandas, jadi pandas tidak diperiksa untuk app
+    {"target": "app", "budget": 4.0, "forbidden": [m for m in HEAVY_MODULES if m != "pandas"]},
+]
+
+MEASURE_SNIPPET = """
+import sys, json, time
+start = time.perf_counter()
+import {target}
+elapsed = time.perf_counter() - start
+print(json.dumps({{"seconds": elapsed, "loaded": [m for m in {heavy!r} if m in sys.modules]}}))
+"""
+
+def measure_import(target: str, runs: int) -> Dict[str, Any]:
+    """
+    Ukur waktu import sebuah modul di proses baru
+    
+    Args:
+        target: Nama modul yang diimpor
+        runs: Jumlah pengulangan (diambil waktu terbaik)
+        
+    Returns:
+        Dictionary berisi waktu terbaik, semua waktu, dan modul berat yang termuat
+    """
+    timings = []
+    loaded: List[str] = []
+    for _ in range(runs):
+        result = subprocess.run(
+            [sys.executable, "-c", MEASURE_SNIPPET.format(target=target, heavy=HEAVY_MODULES)],
+            cwd=REPO_ROOT,
+            capture_output=True,
+            text=True
+        )
+        if result.returncode != 0:
+            return {"error": result.stderr.strip().splitlines()[-1] if result.stderr else "import gagal"}
+        # Baris terakhir stdout adalah hasil pengukuran, baris lain berasal dari log modul
+        measurement = json.loads(result.stdout.strip().splitlines()[-1])
+        timings.append(measurement["seconds"])
+        loaded = measurement["loaded"]
+    return {"seconds": min(timings), "timings": timings, "loaded": loaded}
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Periksa anggaran waktu import QuickShop")
+    parser.add_argument("--runs", type=int, default=3, help="Jumlah pengulangan per target")
+    parser.add_argument("--json", dest="json_path", help="Simpan hasil ke file JSON")
+    args = parser.parse_args()
+    
+    results = []
+    failed = False
+    for entry in IMPORT_BUDGETS:
+        measurement = measure_import(entry["target"], args.runs)
+        unexpected = [m for m in measurement.get("loaded", []) if m in entry["forbidden"]]
+        ok = "error" not in measurement and measurement["seconds"] <= entry["budget"] and not unexpected
+        failed = failed or not ok
+        results.append({**entry, **measurement, "unexpected": unexpected, "ok": ok})
+        
+        if "error" in measurement:
+            print(f"GAGAL {entry['target']}: {measurement['error']}")
+        else:
+            status = "OK   " if ok else "GAGAL"
+            extra = f" (memuat: {', '.join(unexpected)})" if unexpected else ""
+            print(f"{status} {entry['target']}: {measurement['seconds']:.3f}s / anggaran {entry['budget']:.1f}s{extra}")
+    
+    if args.json_path:
+        with open(args.json_path, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+    
+    return 1 if failed else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
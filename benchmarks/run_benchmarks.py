@@ -0,0 +1,212 @@
+"""
+Micro-benchmark untuk jalur utama analyzer QuickShop
+
+Mengukur preprocess_text, replace_emojis, penghitungan leksikon,
+analyze_sentiment, generate_wordcloud, dan count_sentiments pada korpus
+sintetis berbagai ukuran, lalu menulis hasilnya sebagai JSON.
+
+Contoh:
+    python benchmarks/run_benchmarks.py --output bench.json
+    python benchmarks/run_benchmarks.py --sizes 10 1000 --compare bench.json
+"""
+
+import os
+import sys
+import json
+import time
+import platform
+import argparse
+import statistics
+import subprocess
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, List, Optional
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+
+from benchmarks.corpus import generate_reviews
+
+DEFAULT_SIZES = [10, 100, 1000, 10000, 100000]
+
+def time_call(func: Callable[[], Any], repeats: int) -> List[float]:
+    """
+    Jalankan fungsi beberapa kali dan catat durasinya
+    
+    Args:
+        func: Fungsi tanpa argumen yang diukur
+        repeats: Jumlah pengulangan
+        
+    Returns:
+        List durasi dalam detik
+    """
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return timings
+
+def git_commit() -> Optional[str]:
+    """
+    Commit git saat ini untuk dicatat di hasil benchmark
+    """
+    try:
+        return subprocess.check_output(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=REPO_ROOT, text=True, stderr=subprocess.DEVNULL
+        ).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def build_cases(model_path: Optional[str]) -> Dict[str, Dict[str, Any]]:
+    """
+    Definisi benchmark: fungsi yang diukur untuk korpus tertentu dan batas ukurannya
+    
+    Args:
+        model_path: Path model sentimen untuk benchmark analyze_sentiment
+        
+    Returns:
+        Dictionary nama benchmark ke {"setup": fungsi(reviews) -> callable, "max_size": int}
+    """
+    from helpers import analyzer
+    from helpers.lexicon import count_sentiment_words
+    
+    def preprocess_case(reviews):
+        texts = [review["Ulasan"] for review in reviews]
+        return lambda: [analyzer.preprocess_text(text) for text in texts]
+    
+    def emoji_case(reviews):
+        texts = [review["Ulasan"] for review in reviews]
+        return lambda: [analyzer.replace_emojis(text) for text in texts]
+    
+    def lexicon_case(reviews):
+        texts = analyzer.preprocess_many(review["Ulasan"] for review in reviews)
+        return lambda: [count_sentiment_words(text) for text in texts]
+    
+    def sentiment_case(reviews):
+        if not analyzer.load_sentiment_model(model_path):
+            raise RuntimeError("model sentimen tidak dapat dimuat")
+        return lambda: analyzer.analyze_sentiment(reviews, use_cache=False)
+    
+    def wordcloud_case(reviews):
+        import wordcloud  # noqa: F401  (lewati benchmark jika tidak terpasang)
+        texts = analyzer.preprocess_many(review["Ulasan"] for review in reviews)
+        # Tanpa cache: setiap pengulangan harus benar-benar me-render gambar
+        return lambda: analyzer.generate_wordcloud(texts, use_cache=False)
+    
+    def count_case(reviews):
+        labels = ["Positif", "Netral", "Negatif"]
+        sentiments = [labels[review["Rating"] % 3] for review in reviews]
+        return lambda: analyzer.count_sentiments(sentiments)
+    
+    return {
+        "preprocess_text": {"setup": preprocess_case, "max_size": None},
+        "replace_emojis": {"setup": emoji_case, "max_size": None},
+        "lexicon_count": {"setup": lexicon_case, "max_size": None},
+        "analyze_sentiment": {"setup": sentiment_case, "max_size": 1000},
+        "generate_wordcloud": {"setup": wordcloud_case, "max_size": 10000},
+        "count_sentiments": {"setup": count_case, "max_size": None},
+    }
+
+def run(sizes: List[int], repeats: int, only: Optional[List[str]], model_path: Optional[str], seed: int) -> Dict[str, Any]:
+    """
+    Jalankan semua benchmark dan kumpulkan hasilnya
+    
+    Returns:
+        Dictionary hasil siap ditulis sebagai JSON
+    """
+    cases = build_cases(model_path)
+    results = []
+    
+    for size in sizes:
+        reviews = generate_reviews(size, seed=seed)
+        for name, case in cases.items():
+            if only and name not in only:
+                continue
+            if case["max_size"] is not None and size > case["max_size"]:
+                continue
+            
+            entry: Dict[str, Any] = {"name": name, "size": size}
+            try:
+                func = case["setup"](reviews)
+                func()  # Warm-up: cache internal, model, dan import dimuat terlebih dahulu
+                timings = time_call(func, repeats)
+                entry.update({
+                    "repeats": repeats,
+                    "min_seconds": min(timings),
+                    "median_seconds": statistics.median(timings),
+                    "items_per_second": size / min(timings) if min(timings) > 0 else None,
+                })
+                print(f"{name:20s} n={size:<7d} min={entry['min_seconds'] * 1000:10.2f} ms")
+            except Exception as e:
+                entry["skipped"] = f"{type(e).__name__}: {e}"
+                print(f"{name:20s} n={size:<7d} dilewati ({entry['skipped']})")
+            results.append(entry)
+    
+    return {
+        "created_at": datetime.now(timezone.utc).isoformat(),
+        "commit": git_commit(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "seed": seed,
+        "results": results,
+    }
+
+def compare(current: Dict[str, Any], baseline: Dict[str, Any], threshold: float) -> List[str]:
+    """
+    Bandingkan hasil dengan run sebelumnya dan laporkan regresi
+    
+    Args:
+        current: Hasil run saat ini
+        baseline: Hasil run pembanding
+        threshold: Batas perlambatan relatif, misalnya 0.2 untuk 20%
+        
+    Returns:
+        List pesan regresi
+    """
+    previous = {
+        (entry["name"], entry["size"]): entry
+        for entry in baseline.get("results", []) if "min_seconds" in entry
+    }
+    regressions = []
+    for entry in current["results"]:
+        old = previous.get((entry["name"], entry["size"]))
+        if old is None or "min_seconds" not in entry:
+            continue
+        ratio = entry["min_seconds"] / old["min_seconds"] if old["min_seconds"] > 0 else 1.0
+        entry["baseline_min_seconds"] = old["min_seconds"]
+        entry["ratio"] = ratio
+        if ratio > 1 + threshold:
+            regressions.append(f"{entry['name']} n={entry['size']}: {ratio:.2f}x lebih lambat")
+    return regressions
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark analyzer QuickShop")
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES, help="Ukuran korpus")
+    parser.add_argument("--repeats", type=int, default=3, help="Pengulangan per benchmark")
+    parser.add_argument("--only", nargs="+", help="Hanya jalankan benchmark tertentu")
+    parser.add_argument("--model", default="quickshop-indobert-sentiment", help="Path model sentimen")
+    parser.add_argument("--seed", type=int, default=42, help="Seed korpus sintetis")
+    parser.add_argument("--output", default="bench_output.json", help="File JSON hasil")
+    parser.add_argument("--compare", help="File JSON hasil run sebelumnya")
+    parser.add_argument("--threshold", type=float, default=0.2, help="Batas regresi relatif")
+    args = parser.parse_args()
+    
+    report = run(args.sizes, args.repeats, args.only, args.model, args.seed)
+    
+    regressions = []
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            regressions = compare(report, json.load(f), args.threshold)
+        report["regressions"] = regressions
+        for message in regressions:
+            print(f"REGRESI {message}")
+    
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+    print(f"Hasil benchmark ditulis ke {args.output}")
+    
+    return 1 if regressions else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,7 +1,26 @@
 """
 Package initialization for QuickShop helpers
+
+Submodul dimuat secara lazy saat pertama kali diakses (misalnya `helpers.analyzer`)
+agar `import helpers` tidak ikut memuat torch, transformers, selenium, dan lainnya.
 """
 
-from helpers import config, scraper, analyzer, ollama_client, utils
+import importlib
+
+__all__ = [
+    'config', 'scraper', 'analyzer', 'ollama_client', 'utils',
+    'preprocessor', 'lexicon', 'onnx_backend', 'sentiment_cache', 'inference_pool',
+    'pipeline', 'model_registry', 'inference_server',
+    'cascade', 'distillation', 'near_duplicates', 'term_store', 'metrics', 'driver_pool',
+    'batch_scraper', 'http_fetcher', 'dom_selectors'
+]
+
+def __getattr__(name):
+    if name in __all__:
+        module = importlib.import_module(f"helpers.{name}")
+        globals()[name] = module
+        return module
+    raise AttributeError(f"module 'helpers' has no attribute '{name}'")
 
-__all__ = ['config', 'scraper', 'analyzer', 'ollama_client', 'utils']
\ No newline at end of file
+def __dir__():
+    return sorted(list(globals().keys()) + __all__)
\ No newline at end of file
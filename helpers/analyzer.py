@@ -3,28 +3,47 @@ Module untuk analisis sentimen dan pengolahan ulasan
 """
 
 import re
+import queue
 import base64
+import hashlib
+import threading
 from io import BytesIO
 import logging
-from typing import List, Dict, Tuple, Any, Optional
+from collections import Counter, OrderedDict
+from typing import List, Dict, Tuple, Any, Optional, Iterable, Iterator
 import numpy as np
 
-import matplotlib.pyplot as plt
-from wordcloud import WordCloud
-import torch
-from transformers import AutoTokenizer, AutoModelForSequenceClassification
-
-from helpers.config import SENTIMENT_LABELS, POSITIVE_WORDS, NEGATIVE_WORDS
+from helpers.preprocessor import get_preprocessor, preprocess_many
+from helpers.lexicon import count_sentiment_words
+from helpers.sentiment_cache import get_sentiment_cache, make_cache_key
+from helpers.model_registry import registry, LoadedModel
+from helpers.metrics import span, timed
+from helpers.config import (
+    SENTIMENT_LABELS, SENTIMENT_BATCH_SIZE, SENTIMENT_MAX_LENGTH, SENTIMENT_BACKEND,
+    SENTIMENT_PIPELINE_DEPTH, SENTIMENT_MODEL_PATH,
+    SENTIMENT_CACHE_ENABLED, SENTIMENT_NUM_WORKERS, SENTIMENT_POOL_MIN_REVIEWS,
+    INFERENCE_SERVER_ADDRESS, CASCADE_ENABLED, CASCADE_AUDIT_RATE, EMPTY_REVIEW_PLACEHOLDER,
+    NEAR_DUPLICATE_ENABLED, WORDCLOUD_WIDTH, WORDCLOUD_HEIGHT, WORDCLOUD_MAX_WORDS,
+    WORDCLOUD_CACHE_SIZE
+)
 
 # Setup logging
 logging.basicConfig(level=logging.INFO, 
                    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
 logger = logging.getLogger("analyzer")
 
-# Variable global untuk model dan tokenizer
-tokenizer = None
-model = None
-models_loaded = False
+# Model aktif yang dipakai analyze_sentiment (diambil dari registry bersama)
+active_model: Optional[LoadedModel] = None
+
+# Penanda bahwa pemanggil belum menentukan klien server inferensi (lihat get_remote_client)
+_UNRESOLVED_CLIENT = object()
+
+# Pola kata untuk tabel frekuensi wordcloud
+WORD_PATTERN = re.compile(r"\w+")
+
+# Cache PNG wordcloud (base64) berdasarkan hash tabel frekuensi
+_wordcloud_cache: "OrderedDict[str, str]" = OrderedDict()
+_wordcloud_cache_lock = threading.Lock()
 
 def replace_emojis(text: str) -> str:
     """
@@ -36,15 +55,7 @@ def replace_emojis(text: str) -> str:
     Returns:
         Teks yang sudah diganti emojinya
     """
-    emoji_dict = {
-        "😍": "senang", "❤️": "cinta", "💔": "sedih", "😡": "marah", "😢": "sedih",
-        "😊": "senang", "😁": "senang", "😭": "sedih", "👍": "bagus", "👎": "jelek",
-        "🥰": "senang", "💖": "cinta", "💗": "cinta", "💕": "cinta", "💞": "cinta", 
-        "😞": "kecewa", "😔": "kecewa", "😃": "senang", "🤗": "senang", "😎": "keren"
-    }
-    for emoji, replacement in emoji_dict.items():
-        text = text.replace(emoji, f" {replacement} ")
-    return text
+    return get_preprocessor().replace_emojis(text)
 
 def preprocess_text(text: str) -> str:
     """
@@ -56,166 +67,621 @@ def preprocess_text(text: str) -> str:
     Returns:
         Teks yang sudah diproses
     """
-    text = str(text).lower()
-    text = replace_emojis(text)
-    
-    # Penggantian singkatan dan kata sehari-hari
-    text = text.replace("gk", "tidak").replace("tdk", "tidak").replace("ga", "tidak")
-    text = text.replace("bgt", "banget").replace("bgtt", "banget").replace("bgttt", "banget")
-    text = text.replace("ok", "oke")
+    return get_preprocessor().preprocess(text)
+
+@timed("model_load")
+def load_sentiment_model(
+    model_path: Optional[str] = None,
+    backend: str = SENTIMENT_BACKEND,
+    num_threads: Optional[int] = None,
+    use_server: bool = True
+) -> bool:
+    """
+    Muat model analisis sentimen lewat registry bersama dan jadikan model aktif
     
-    # Hapus karakter berulang
-    text = re.sub(r'(.)\\1{2,}', r'\\1', text)
+    Model yang sama hanya dimuat sekali per proses walaupun dipanggil dari banyak sesi.
     
-    # Hapus tanda baca
-    text = re.sub(r'[^\\w\\s]', ' ', text)
+    Args:
+        model_path: Path ke model sentiment analysis (opsional)
+        backend: "torch" untuk PyTorch atau "onnx" untuk ONNX Runtime
+        num_threads: Batas thread inferensi (opsional, default sesuai library)
+        use_server: Lewati pemuatan lokal jika server inferensi dapat dihubungi
+        
+    Returns:
+        Boolean sukses atau gagal
+    """
+    global active_model
     
-    # Hapus spasi berlebih
-    text = re.sub(r'\\s+', ' ', text).strip()
+    # Jika server inferensi tersedia, model tidak perlu dimuat di proses ini
+    if use_server and get_remote_client() is not None:
+        return True
     
-    # Coba menghapus stopword jika Sastrawi tersedia
     try:
-        from Sastrawi.StopWordRemover.StopWordRemoverFactory import StopWordRemoverFactory
-        factory = StopWordRemoverFactory()
-        stopword_remover = factory.create_stop_word_remover()
-        text = stopword_remover.remove(text)
+        active_model = registry.load(model_path, backend=backend, num_threads=num_threads)
+        return True
     except Exception as e:
-        logger.warning(f"Couldn't remove stopwords: {str(e)}")
+        logger.error(f"Error loading sentiment model: {str(e)}")
+        return False
+
+def get_active_model() -> LoadedModel:
+    """
+    Dapatkan model aktif di proses ini, memuat SENTIMENT_MODEL_PATH jika belum ada
     
-    # Hapus spasi berlebih lagi setelah penghapusan stopword
-    text = re.sub(r'\\s+', ' ', text).strip()
+    Dipakai juga sebagai fallback saat server inferensi tidak dapat dihubungi,
+    sehingga model lokal selalu dimuat walaupun server dikonfigurasi. Jika model
+    lokal gagal dimuat, DEFAULT_SENTIMENT_MODEL dari Hugging Face dipakai.
     
-    return text
+    Returns:
+        LoadedModel yang sedang aktif
+    """
+    if active_model is None and not load_sentiment_model(SENTIMENT_MODEL_PATH, use_server=False):
+        logger.warning("Model lokal gagal dimuat, menggunakan fallback dari Hugging Face")
+        if not load_sentiment_model(None, use_server=False):
+            raise RuntimeError("Model sentimen tidak dapat dimuat")
+    return active_model
+
+def get_remote_client():
+    """
+    Dapatkan klien server inferensi lokal jika dikonfigurasi dan dapat dihubungi
+    
+    Returns:
+        InferenceClient, atau None jika model dijalankan di proses ini
+    """
+    if not INFERENCE_SERVER_ADDRESS:
+        return None
+    
+    from helpers.inference_server import get_inference_client
+    client = get_inference_client(INFERENCE_SERVER_ADDRESS)
+    # Selalu tanya server; info() yang tersimpan tidak berarti server masih hidup
+    return client if client.ping() else None
 
-def load_sentiment_model(model_path: Optional[str] = None) -> bool:
+def get_model_identity(client: Any = _UNRESOLVED_CLIENT) -> Tuple[str, str]:
     """
-    Muat model analisis sentimen
+    Identitas model yang sedang dipakai, untuk kunci cache hasil
     
     Args:
-        model_path: Path ke model sentiment analysis (opsional)
+        client: Klien server inferensi dari get_remote_client (None = model lokal,
+            default ditentukan ulang)
         
     Returns:
-        Boolean sukses atau gagal
+        Tuple dari (model_id, model_version)
     """
-    global tokenizer, model, models_loaded
+    if client is _UNRESOLVED_CLIENT:
+        client = get_remote_client()
+    if client is not None:
+        info = client.info()
+        return info["model_id"], info["model_version"]
+    loaded = get_active_model()
+    return loaded.model_id, loaded.model_version
+
+def _tokenize_batch(tokenizer: Any, texts: List[str], return_tensors: str) -> Dict[str, Any]:
+    """
+    Tokenisasi satu batch dengan padding sepanjang teks terpanjang di batch
+    """
+    return tokenizer(
+        texts, padding=True, truncation=True, max_length=SENTIMENT_MAX_LENGTH,
+        return_tensors=return_tensors
+    )
+
+def iter_tokenized_batches(
+    tokenizer: Any,
+    texts: List[str],
+    batches: List[List[int]],
+    return_tensors: str,
+    depth: int = SENTIMENT_PIPELINE_DEPTH
+) -> Iterator[Tuple[List[int], Dict[str, Any]]]:
+    """
+    Tokenisasi batch di thread terpisah selagi pemanggil menjalankan model
     
-    if models_loaded:
-        return True
+    Tokenizer cepat (Rust) melepas GIL, sehingga tokenisasi batch N+1 berjalan
+    bersamaan dengan forward pass batch N. Antrian dibatasi `depth` batch agar
+    tokenizer tidak berjalan terlalu jauh di depan model.
     
+    Args:
+        tokenizer: Tokenizer model
+        texts: List teks
+        batches: Indeks teks untuk setiap batch, sesuai urutan eksekusi
+        return_tensors: Format tensor ("np" atau "pt")
+        depth: Jumlah batch maksimum yang menunggu di antrian
+        
+    Yields:
+        Tuple dari (indeks teks, input model) per batch
+    """
+    # Satu batch saja tidak perlu thread
+    if len(batches) <= 1 or depth <= 0:
+        for indices in batches:
+            yield indices, _tokenize_batch(tokenizer, [texts[i] for i in indices], return_tensors)
+        return
+    
+    ready: "queue.Queue" = queue.Queue(maxsize=depth)
+    stop = threading.Event()
+    done = object()
+    
+    def produce():
+        try:
+            for indices in batches:
+                item = (indices, _tokenize_batch(tokenizer, [texts[i] for i in indices], return_tensors))
+                # Tunggu slot kosong, tetapi berhenti jika konsumen sudah selesai
+                while not stop.is_set():
+                    try:
+                        ready.put(item, timeout=0.1)
+                        break
+                    except queue.Full:
+                        continue
+                if stop.is_set():
+                    return
+            ready.put(done)
+        except BaseException as e:
+            ready.put(e)
+    
+    producer = threading.Thread(target=produce, daemon=True, name="tokenizer-pipeline")
+    producer.start()
     try:
-        logger.info("Loading sentiment analysis model...")
+        while True:
+            item = ready.get()
+            if item is done:
+                break
+            if isinstance(item, BaseException):
+                raise item
+            yield item
+    finally:
+        stop.set()
+        # Kosongkan antrian agar producer yang sedang menunggu bisa selesai
+        while True:
+            try:
+                ready.get_nowait()
+            except queue.Empty:
+                break
+        producer.join()
+
+def predict_logits(
+    texts: List[str],
+    batch_size: int = SENTIMENT_BATCH_SIZE,
+    loaded_model: Optional[LoadedModel] = None
+) -> np.ndarray:
+    """
+    Jalankan model sentimen secara batch untuk sekumpulan teks
+    
+    Teks diurutkan berdasarkan panjangnya sehingga setiap batch hanya di-padding
+    sepanjang teks terpanjang di batch itu. Tokenisasi batch berikutnya berjalan
+    di thread terpisah selagi model memproses batch saat ini.
+    
+    Args:
+        texts: List teks yang sudah diproses
+        batch_size: Jumlah teks per forward pass
+        loaded_model: Model dari registry (default model aktif)
         
-        # Opsi 1: Jika path model disediakan, gunakan model lokal
-        if model_path:
-            logger.info(f"Loading local model from {model_path}")
-            tokenizer = AutoTokenizer.from_pretrained(model_path)
-            model = AutoModelForSequenceClassification.from_pretrained(model_path)
+    Returns:
+        Array logits berukuran (jumlah teks, jumlah label) sesuai urutan input
+    """
+    logits = np.zeros((len(texts), len(SENTIMENT_LABELS)), dtype=np.float32)
+    if not texts:
+        return logits
+    
+    batch_size = max(1, int(batch_size))
+    loaded = loaded_model or get_active_model()
+    tokenizer, model = loaded.tokenizer, loaded.model
+    
+    # Kelompokkan teks dengan panjang serupa agar padding minimal
+    order = sorted(range(len(texts)), key=lambda i: len(texts[i]))
+    batches = [order[start:start + batch_size] for start in range(0, len(order), batch_size)]
+    
+    return_tensors = "np" if loaded.backend == "onnx" else "pt"
+    for indices, inputs in iter_tokenized_batches(tokenizer, texts, batches, return_tensors):
+        if loaded.backend == "onnx":
+            logits[indices] = model.predict(inputs)
+        else:
+            import torch
             
-        # Opsi 2: Gunakan model IndoBERT dari Hugging Face
+            with torch.no_grad():
+                outputs = model(**inputs)
+            logits[indices] = outputs.logits.float().cpu().numpy()
+    
+    return logits
+
+def run_model_with_identity(
+    texts: List[str],
+    batch_size: int = SENTIMENT_BATCH_SIZE,
+    num_workers: int = SENTIMENT_NUM_WORKERS,
+    client: Any = _UNRESOLVED_CLIENT
+) -> Tuple[np.ndarray, Tuple[str, str]]:
+    """
+    Jalankan model di server inferensi lokal, di proses ini, atau di pool multi-proses
+    
+    Args:
+        texts: List teks yang sudah diproses
+        batch_size: Jumlah teks per forward pass
+        num_workers: Jumlah proses worker (0 atau 1 = tanpa pool)
+        client: Klien server inferensi dari get_remote_client (None = model lokal,
+            default ditentukan ulang)
+        
+    Returns:
+        Tuple dari (array logits sesuai urutan input, (model_id, model_version) dari
+        model yang benar-benar menghasilkan logits tersebut)
+    """
+    if client is _UNRESOLVED_CLIENT:
+        client = get_remote_client()
+    if client is not None:
+        try:
+            info = client.info()
+            return client.predict_logits(texts), (info["model_id"], info["model_version"])
+        except Exception as e:
+            logger.warning(f"Request ke server inferensi gagal, menggunakan model lokal: {str(e)}")
+    
+    loaded = get_active_model()
+    if num_workers > 1 and len(texts) >= SENTIMENT_POOL_MIN_REVIEWS:
+        from helpers.inference_pool import predict_logits_parallel
+        logits = predict_logits_parallel(
+            texts, num_workers, model_path=loaded.model_path, backend=loaded.backend, batch_size=batch_size
+        )
+    else:
+        logits = predict_logits(texts, batch_size=batch_size, loaded_model=loaded)
+    return logits, (loaded.model_id, loaded.model_version)
+
+def run_model(
+    texts: List[str],
+    batch_size: int = SENTIMENT_BATCH_SIZE,
+    num_workers: int = SENTIMENT_NUM_WORKERS,
+    client: Any = _UNRESOLVED_CLIENT
+) -> np.ndarray:
+    """
+    Jalankan model dan kembalikan logits saja (lihat run_model_with_identity)
+    """
+    return run_model_with_identity(texts, batch_size=batch_size, num_workers=num_workers, client=client)[0]
+
+def predict_logits_cached(
+    texts: List[str],
+    batch_size: int = SENTIMENT_BATCH_SIZE,
+    stats: Optional[Dict[str, Any]] = None,
+    num_workers: int = SENTIMENT_NUM_WORKERS,
+    client: Any = _UNRESOLVED_CLIENT
+) -> np.ndarray:
+    """
+    Jalankan model hanya untuk teks yang belum ada di cache sentimen
+    
+    Args:
+        texts: List teks yang sudah diproses
+        batch_size: Jumlah teks per forward pass
+        stats: Dictionary opsional untuk mencatat jumlah cache hit/miss
+        num_workers: Jumlah proses worker untuk teks yang belum di-cache
+        client: Klien server inferensi dari get_remote_client (None = model lokal,
+            default ditentukan ulang)
+        
+    Returns:
+        Array logits berukuran (jumlah teks, jumlah label) sesuai urutan input
+    """
+    if client is _UNRESOLVED_CLIENT:
+        client = get_remote_client()
+    
+    cache = get_sentiment_cache()
+    if cache is None:
+        return run_model(texts, batch_size=batch_size, num_workers=num_workers, client=client)
+    
+    model_id, model_version = get_model_identity(client)
+    keys = [make_cache_key(text, model_id, model_version) for text in texts]
+    cached = cache.get_many(keys)
+    
+    logits = np.zeros((len(texts), len(SENTIMENT_LABELS)), dtype=np.float32)
+    miss_positions = {}
+    for i, key in enumerate(keys):
+        if key in cached:
+            logits[i] = cached[key][0]
         else:
-            logger.info("Loading IndoBERT from Hugging Face")
-            model_name = "indobenchmark/indobert-base-p1"
-            tokenizer = AutoTokenizer.from_pretrained(model_name)
-            model = AutoModelForSequenceClassification.from_pretrained(model_name, num_labels=3)
+            miss_positions.setdefault(key, []).append(i)
+    
+    if miss_positions:
+        miss_keys = list(miss_positions)
+        miss_texts = [texts[miss_positions[key][0]] for key in miss_keys]
+        miss_logits, identity = run_model_with_identity(
+            miss_texts, batch_size=batch_size, num_workers=num_workers, client=client
+        )
+        for key, row in zip(miss_keys, miss_logits):
+            logits[miss_positions[key]] = row
         
-        models_loaded = True
-        logger.info("Sentiment model loaded successfully")
-        return True
+        # Simpan dengan identitas model yang benar-benar menghasilkan logits
+        # (bisa berbeda jika server inferensi mati di tengah jalan)
+        if identity != (model_id, model_version):
+            miss_keys = [make_cache_key(text, *identity) for text in miss_texts]
+        cache.put_many(dict(zip(miss_keys, miss_logits)))
+    
+    if stats is not None:
+        stats['cache_hits'] = len(texts) - sum(len(p) for p in miss_positions.values())
+        stats['cache_misses'] = len(miss_positions)
+    
+    return logits
+
+def ratings_to_array(ratings: List[Any]) -> np.ndarray:
+    """
+    Ubah daftar rating menjadi array numerik, rating yang tidak valid menjadi 0
+    
+    Args:
+        ratings: List rating ulasan
         
-    except Exception as e:
-        logger.error(f"Error loading sentiment model: {str(e)}")
-        return False
+    Returns:
+        Array float berisi rating
+    """
+    values = np.zeros(len(ratings), dtype=np.float64)
+    for i, rating in enumerate(ratings):
+        try:
+            values[i] = float(rating)
+        except (TypeError, ValueError):
+            values[i] = 0
+    return np.nan_to_num(values)
+
+def apply_sentiment_corrections(
+    logits: np.ndarray,
+    ratings: np.ndarray,
+    positive_counts: np.ndarray,
+    negative_counts: np.ndarray
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Hitung label dari logits lalu koreksi berdasarkan rating dan kata positif/negatif
+    
+    Semua aturan dijalankan sebagai operasi array untuk seluruh batch sekaligus,
+    dengan urutan prioritas yang sama seperti rantai if/elif per ulasan.
+    
+    Args:
+        logits: Array logits berukuran (jumlah ulasan, jumlah label)
+        ratings: Array rating ulasan
+        positive_counts: Array jumlah kata positif
+        negative_counts: Array jumlah kata negatif
+        
+    Returns:
+        Tuple dari (indeks label hasil koreksi, confidence model untuk label aslinya)
+    """
+    logits = np.asarray(logits, dtype=np.float32).reshape(-1, len(SENTIMENT_LABELS))
+    
+    # Softmax yang stabil secara numerik
+    shifted = logits - logits.max(axis=1, keepdims=True)
+    probabilities = np.exp(shifted)
+    probabilities /= probabilities.sum(axis=1, keepdims=True)
+    
+    sentiment = logits.argmax(axis=1)
+    confidence = probabilities[np.arange(len(sentiment)), sentiment]
+    
+    neutral_rating = ratings == 3
+    high_rating = (ratings == 4) | (ratings == 5)
+    low_rating = (ratings == 1) | (ratings == 2)
+    more_positive = positive_counts > negative_counts
+    more_negative = negative_counts > positive_counts
+    
+    conditions = [
+        (sentiment == 0) & neutral_rating,                  # Negatif ke netral jika rating 3
+        (sentiment == 2) & neutral_rating,                  # Positif ke netral jika rating 3
+        (sentiment == 0) & (high_rating | more_positive),   # Negatif ke netral jika rating tinggi atau banyak kata positif
+        (sentiment == 2) & (low_rating | more_negative),    # Positif ke netral jika rating rendah atau banyak kata negatif
+        (sentiment == 1) & (high_rating | more_positive),   # Netral ke positif jika rating tinggi atau banyak kata positif
+        (sentiment == 1) & (low_rating | more_negative),    # Netral ke negatif jika rating rendah atau banyak kata negatif
+    ]
+    corrected = np.select(conditions, [1, 1, 1, 1, 2, 0], default=sentiment)
+    
+    return corrected, confidence
 
-def analyze_sentiment(reviews: List[Dict[str, Any]]) -> Tuple[List[str], List[str], List[int], List[int]]:
+def rating_only_labels(ratings: np.ndarray) -> np.ndarray:
+    """
+    Tentukan label hanya dari rating untuk ulasan tanpa teks
+    
+    Args:
+        ratings: Array rating ulasan
+        
+    Returns:
+        Array indeks label (rating 4-5 positif, 1-2 negatif, selain itu netral)
+    """
+    return np.select([ratings >= 4, (ratings >= 1) & (ratings <= 2)], [2, 0], default=1)
+
+@timed("sentiment")
+def analyze_sentiment(
+    reviews: List[Dict[str, Any]],
+    batch_size: int = SENTIMENT_BATCH_SIZE,
+    use_cache: bool = SENTIMENT_CACHE_ENABLED,
+    stats: Optional[Dict[str, Any]] = None,
+    num_workers: int = SENTIMENT_NUM_WORKERS,
+    cascade: bool = CASCADE_ENABLED,
+    near_duplicates: bool = NEAR_DUPLICATE_ENABLED
+) -> Tuple[List[str], List[str], List[int], List[int], List[float]]:
     """
     Analisis sentimen untuk daftar ulasan
     
     Args:
         reviews: List dari dictionary ulasan
+        batch_size: Jumlah ulasan per forward pass model
+        use_cache: Gunakan cache sentimen di disk untuk teks yang pernah dianalisis
+        stats: Dictionary opsional yang diisi statistik proses (misalnya cache hit/miss,
+            jumlah ulasan kosong dan teks unik yang dikirim ke model)
+        num_workers: Jumlah proses worker untuk inferensi paralel (0 = satu proses)
+        cascade: Beri label ulasan yang mudah tanpa IndoBERT (statistiknya di stats['cascade'])
+        near_duplicates: Jalankan model hanya untuk satu perwakilan setiap cluster ulasan
+            yang hampir identik
         
     Returns:
-        Tuple dari (label sentimen, teks yang sudah diproses, jumlah kata positif, jumlah kata negatif)
+        Tuple dari (label sentimen, teks yang sudah diproses, jumlah kata positif,
+        jumlah kata negatif, confidence model)
     """
-    # Load model jika belum dimuat
-    if not models_loaded:
-        load_sentiment_model()
+    # Server inferensi diperiksa sekali per panggilan agar seluruh batch memakai backend yang sama;
+    # model lokal dimuat jika belum ada dan server tidak tersedia
+    client = get_remote_client()
+    if client is None:
+        get_active_model()
         
-    sentiments = []
-    preprocessed_texts = []
     positive_counts = []
     negative_counts = []
     
-    for review in reviews:
-        clean_text = preprocess_text(review["Ulasan"])
-        preprocessed_texts.append(clean_text)
-
-        # Hitung kata positif dan negatif
-        positive_count = sum(1 for word in POSITIVE_WORDS if word in clean_text.lower())
-        negative_count = sum(1 for word in NEGATIVE_WORDS if word in clean_text.lower())
+    preprocessed_texts = preprocess_many(review["Ulasan"] for review in reviews)
+    
+    for clean_text in preprocessed_texts:
+        # Hitung kata positif dan negatif dalam satu pemindaian
+        positive_count, negative_count = count_sentiment_words(clean_text)
         positive_counts.append(positive_count)
         negative_counts.append(negative_count)
 
-        # Analisis sentimen menggunakan model
-        inputs = tokenizer(clean_text, return_tensors="pt", padding=True, truncation=True)
-        with torch.no_grad():
-            outputs = model(**inputs)
-        logits = outputs.logits.squeeze()
-        sentiment = torch.argmax(logits).item()
-        confidence = torch.softmax(logits, dim=-1)
-        max_confidence = confidence[sentiment].item()
-
-        # Koreksi sentimen berdasarkan rating, kata positif/negatif
-        rating = review["Rating"]
-        if sentiment == 0 and (rating == 3):
-            sentiment = 1  # Ubah negatif ke netral jika rating 3
-        elif sentiment == 2 and (rating == 3):
-            sentiment = 1  # Ubah positif ke netral jika rating 3
-        elif sentiment == 0 and (rating in [4, 5] or positive_count > negative_count):
-            sentiment = 1  # Ubah negatif ke netral jika rating tinggi atau banyak kata positif
-        elif sentiment == 2 and (rating in [1, 2] or negative_count > positive_count):
-            sentiment = 1  # Ubah positif ke netral jika rating rendah atau banyak kata negatif
-        elif sentiment == 1 and (rating in [4, 5] or positive_count > negative_count):
-            sentiment = 2  # Ubah netral ke positif jika rating tinggi atau banyak kata positif
-        elif sentiment == 1 and (rating in [1, 2] or negative_count > positive_count):
-            sentiment = 0  # Ubah netral ke negatif jika rating rendah atau banyak kata negatif
+    ratings = ratings_to_array([review["Rating"] for review in reviews])
+    positive_array = np.asarray(positive_counts)
+    negative_array = np.asarray(negative_counts)
+    
+    # Ulasan tanpa teks (kosong atau placeholder scraper) cukup diberi label dari rating
+    empty = np.array([
+        not clean_text or str(review["Ulasan"]).strip() == EMPTY_REVIEW_PLACEHOLDER
+        for review, clean_text in zip(reviews, preprocessed_texts)
+    ], dtype=bool)
+    
+    # Tahap cepat cascade: ulasan yang sudah pasti tidak dikirim ke model
+    decided = np.zeros(len(reviews), dtype=bool)
+    audited = np.zeros(len(reviews), dtype=bool)
+    if cascade and reviews:
+        from helpers.cascade import fast_stage, get_fast_classifier
+        classifier = get_fast_classifier()
+        fast_labels, fast_confidences, decided = fast_stage(
+            preprocessed_texts, ratings, positive_array, negative_array, classifier=classifier
+        )
+        # Sebagian kecil tetap diperiksa model untuk mengukur kesesuaian label cepat
+        rng = np.random.default_rng(len(reviews))
+        audited = decided & ~empty & (rng.random(len(reviews)) < CASCADE_AUDIT_RATE)
+    
+    model_positions = np.flatnonzero((~decided | audited) & ~empty)
+    
+    # Teks identik setelah preprocessing cukup dianalisis sekali lalu disebar ke semua posisinya
+    unique_index: Dict[str, int] = {}
+    inverse = np.array([
+        unique_index.setdefault(preprocessed_texts[i], len(unique_index)) for i in model_positions
+    ], dtype=np.int64)
+    model_texts = list(unique_index)
+    
+    # Ulasan yang hampir identik memakai hasil model dari perwakilan clusternya
+    if near_duplicates and len(model_texts) > 1:
+        from helpers.near_duplicates import cluster_near_duplicates, cluster_representatives
+        cluster_ids = cluster_near_duplicates(model_texts)
+        model_texts = [model_texts[i] for i in cluster_representatives(cluster_ids)]
+        inverse = np.asarray(cluster_ids, dtype=np.int64)[inverse]
+    
+    if stats is not None:
+        stats['empty_reviews'] = int(empty.sum())
+        stats['model_reviews'] = int(len(model_positions))
+        stats['unique_model_texts'] = len(model_texts)
+    
+    # Analisis sentimen menggunakan model, satu forward pass per batch
+    logits = np.zeros((len(reviews), len(SENTIMENT_LABELS)), dtype=np.float32)
+    if model_texts:
+        with span("model_inference"):
+            if use_cache:
+                model_logits = predict_logits_cached(
+                    model_texts, batch_size=batch_size, stats=stats, num_workers=num_workers, client=client
+                )
+            else:
+                model_logits = run_model(model_texts, batch_size=batch_size, num_workers=num_workers, client=client)
+        logits[model_positions] = model_logits[inverse]
+    
+    # Koreksi sentimen berdasarkan rating, kata positif/negatif untuk seluruh batch
+    labels, confidences = apply_sentiment_corrections(logits, ratings, positive_array, negative_array)
+    
+    if cascade and reviews:
+        from helpers.cascade import summarize_cascade
+        cascade_stats = summarize_cascade(len(reviews), decided, audited, fast_labels, labels, empty)
+        logger.info(
+            f"Cascade: {cascade_stats['short_circuited']}/{len(reviews) - cascade_stats['empty']} ulasan berteks tanpa IndoBERT, "
+            f"kesesuaian audit {cascade_stats['agreement']}"
+        )
+        if stats is not None:
+            stats['cascade'] = cascade_stats
+        
+        # Ulasan yang tidak diaudit memakai label tahap cepat
+        skipped = decided & ~audited
+        labels[skipped] = fast_labels[skipped]
+        confidences[skipped] = fast_confidences[skipped]
+        
+        # Latih model linear dengan label mentah IndoBERT dari ulasan yang dikirim ke model
+        if classifier is not None and model_texts:
+            try:
+                classifier.partial_fit(model_texts, model_logits.argmax(axis=1))
+                classifier.save_if_due()
+            except Exception as e:
+                logger.warning(f"Gagal memperbarui model cascade: {str(e)}")
+    
+    # Label ulasan tanpa teks hanya dari rating; tidak ada keluaran model untuk dinilai
+    labels[empty] = rating_only_labels(ratings[empty])
+    confidences[empty] = 1.0
+    
+    sentiments = [SENTIMENT_LABELS[int(label)] for label in labels]
+        
+    return sentiments, preprocessed_texts, positive_counts, negative_counts, confidences.tolist()
 
-        sentiments.append(SENTIMENT_LABELS[sentiment])
+def count_words(texts: Iterable[str], frequencies: Optional[Counter] = None) -> Counter:
+    """
+    Hitung frekuensi kata, bisa ditambahkan bertahap ke tabel yang sudah ada
+    
+    Args:
+        texts: Teks ulasan yang sudah diproses
+        frequencies: Tabel frekuensi yang akan diperbarui (None untuk tabel baru)
         
-    return sentiments, preprocessed_texts, positive_counts, negative_counts
+    Returns:
+        Tabel frekuensi kata
+    """
+    if frequencies is None:
+        frequencies = Counter()
+    for text in texts:
+        frequencies.update(WORD_PATTERN.findall(text))
+    return frequencies
 
-def generate_wordcloud(texts: List[str]) -> str:
+def frequency_table_hash(frequencies: Dict[str, float]) -> str:
     """
-    Menghasilkan wordcloud dari kumpulan teks
+    Hash stabil dari tabel frekuensi, dipakai sebagai kunci cache wordcloud
+    """
+    digest = hashlib.sha1()
+    for word, count in sorted(frequencies.items()):
+        digest.update(f"{word}\t{count}\n".encode("utf-8"))
+    return digest.hexdigest()
+
+@timed("wordcloud")
+def generate_wordcloud_from_frequencies(frequencies: Dict[str, float], use_cache: bool = True) -> str:
+    """
+    Render wordcloud dari tabel frekuensi tanpa matplotlib
+    
+    Gambar di-encode langsung dari image PIL milik WordCloud sehingga aman
+    dipanggil bersamaan dari beberapa sesi, lalu disimpan di cache LRU.
     
     Args:
-        texts: List teks ulasan
+        frequencies: Tabel frekuensi kata
+        use_cache: Pakai dan isi cache LRU wordcloud (False untuk selalu render ulang)
         
     Returns:
-        String base64 dari gambar wordcloud
+        String base64 dari gambar wordcloud (PNG)
     """
     try:
-        text = ' '.join(texts)
+        from wordcloud import WordCloud, STOPWORDS
+        
+        # Sama seperti WordCloud.generate (include_numbers=False): token angka murni dibuang
+        frequencies = {
+            word: count for word, count in frequencies.items()
+            if count > 0 and not word.isdigit() and word.lower() not in STOPWORDS
+        }
+        if not frequencies:
+            return ""
+        
+        key = frequency_table_hash(frequencies)
+        if use_cache:
+            with _wordcloud_cache_lock:
+                if key in _wordcloud_cache:
+                    _wordcloud_cache.move_to_end(key)
+                    return _wordcloud_cache[key]
+        
         wordcloud = WordCloud(
-            width=800, 
-            height=400, 
+            width=WORDCLOUD_WIDTH, 
+            height=WORDCLOUD_HEIGHT, 
             background_color='white',
-            max_words=200,
-            collocations=False,
-            regexp=r'\w+'
-        ).generate(text)
+            max_words=WORDCLOUD_MAX_WORDS
+        ).generate_from_frequencies(frequencies)
         
-        plt.figure(figsize=(10, 5))
-        plt.imshow(wordcloud, interpolation='bilinear')
-        plt.axis("off")
-
         # Save to BytesIO object
         img_data = BytesIO()
-        plt.savefig(img_data, format='png', bbox_inches='tight')
-        img_data.seek(0)
+        wordcloud.to_image().save(img_data, format='PNG')
 
         # Convert to base64 for easy transfer
-        encoded = base64.b64encode(img_data.read()).decode('utf-8')
-        plt.close()
+        encoded = base64.b64encode(img_data.getvalue()).decode('utf-8')
+        
+        if use_cache:
+            with _wordcloud_cache_lock:
+                _wordcloud_cache[key] = encoded
+                while len(_wordcloud_cache) > WORDCLOUD_CACHE_SIZE:
+                    _wordcloud_cache.popitem(last=False)
         
         return encoded
     except Exception as e:
@@ -223,6 +689,29 @@ def generate_wordcloud(texts: List[str]) -> str:
         # Return empty string on error
         return ""
 
+def generate_wordcloud(
+    texts: List[str],
+    cluster_ids: Optional[List[int]] = None,
+    use_cache: bool = True
+) -> str:
+    """
+    Menghasilkan wordcloud dari kumpulan teks
+    
+    Args:
+        texts: List teks ulasan
+        cluster_ids: ID cluster ulasan hampir identik (opsional); setiap cluster
+            hanya dihitung sekali agar ulasan spam tidak mendominasi
+        use_cache: Pakai cache wordcloud untuk tabel frekuensi yang sama
+        
+    Returns:
+        String base64 dari gambar wordcloud
+    """
+    if cluster_ids is not None:
+        from helpers.near_duplicates import cluster_representatives
+        texts = [texts[i] for i in cluster_representatives(cluster_ids)]
+        
+    return generate_wordcloud_from_frequencies(count_words(texts), use_cache=use_cache)
+
 def count_sentiments(sentiments: List[str]) -> Dict[str, int]:
     """
     Menghitung jumlah untuk setiap kategori sentimen
@@ -0,0 +1,254 @@
+"""
+Module untuk scraping banyak produk Tokopedia secara paralel dengan jumlah browser terbatas
+
+Setiap URL dikerjakan oleh salah satu worker yang meminjam Chrome driver dari
+pool bersama. Permintaan ke domain yang sama diberi jeda minimum, setiap URL
+memiliki batas waktu dan percobaan ulang, dan hasil dikirim segera setelah
+produk selesai di-scrape.
+
+Contoh:
+    python -m helpers.batch_scraper urls.txt --workers 2 --max-reviews 50
+"""
+
+import os
+import sys
+import json
+import time
+import logging
+import argparse
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+from urllib.parse import urlparse
+
+from helpers.config import (
+    MAX_REVIEWS_DEFAULT, BROWSER_HEADLESS_DEFAULT, DRIVER_POOL_ENABLED, DRIVER_POOL_SIZE, BATCH_SCRAPE_TIMEOUT,
+    BATCH_SCRAPE_RETRIES, BATCH_SCRAPE_RETRY_BACKOFF, BATCH_SCRAPE_DOMAIN_INTERVAL, SCRAPER_BACKEND
+)
+from helpers.scraper import iter_tokopedia_reviews, validate_tokopedia_url
+from helpers.metrics import span
+
+# Setup logging
+logging.basicConfig(level=logging.INFO, 
+                   format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+logger = logging.getLogger("batch_scraper")
+
+class DomainRateLimiter:
+    """
+    Jeda minimum antar permintaan yang dimulai ke domain yang sama
+    """
+    
+    def __init__(self, min_interval: float = BATCH_SCRAPE_DOMAIN_INTERVAL):
+        """
+        Args:
+            min_interval: Jeda minimum antar permintaan per domain (detik)
+        """
+        self.min_interval = min_interval
+        self._lock = threading.Lock()
+        self._next_allowed: Dict[str, float] = {}
+    
+    def wait(self, url: str) -> float:
+        """
+        Tunggu giliran untuk domain URL, lalu pesan slot berikutnya
+        
+        Args:
+            url: URL yang akan diminta
+            
+        Returns:
+            Lama menunggu (detik)
+        """
+        domain = urlparse(url).netloc.lower()
+        with self._lock:
+            now = time.monotonic()
+            start_at = max(now, self._next_allowed.get(domain, now))
+            self._next_allowed[domain] = start_at + self.min_interval
+        delay = start_at - now
+        if delay > 0:
+            time.sleep(delay)
+        return delay
+
+def scrape_with_deadline(
+    product_url: str,
+    max_reviews: int,
+    headless: bool,
+    timeout: float,
+    backend: str = SCRAPER_BACKEND
+) -> Dict[str, Any]:
+    """
+    Scrape satu produk dan hentikan jika melewati batas waktu
+    
+    Deadline diteruskan ke scraper sehingga tunggu, navigasi, dan request di
+    dalamnya juga dipotong; generator ditutup sehingga driver tetap
+    dikembalikan ke pool.
+    
+    Args:
+        product_url: URL produk Tokopedia
+        max_reviews: Jumlah maksimum ulasan
+        headless: Mode headless browser
+        timeout: Batas waktu (detik)
+        backend: Backend scraper ("http" atau "selenium")
+        
+    Returns:
+        Dictionary data produk seperti scrape_tokopedia_reviews
+    """
+    deadline = time.monotonic() + timeout
+    scraped_data = None
+    
+    events = iter_tokopedia_reviews(product_url, max_reviews, headless, backend=backend, deadline=deadline)
+    try:
+        for event in events:
+            if event["type"] == "error":
+                raise RuntimeError(event["message"])
+            if event["type"] == "product":
+                scraped_data = {
+                    "product_name": event["product_name"],
+                    "description": event["description"],
+                    "reviews": []
+                }
+            elif event["type"] == "reviews":
+                scraped_data["reviews"].extend(event["reviews"])
+            
+            if time.monotonic() > deadline:
+                raise TimeoutError(f"Scraping melewati batas waktu {timeout:.0f}s")
+    finally:
+        events.close()
+    
+    if scraped_data is None:
+        raise RuntimeError("Data produk tidak ditemukan")
+    return scraped_data
+
+def scrape_many(
+    product_urls: Iterable[str],
+    max_reviews: int = MAX_REVIEWS_DEFAULT,
+    headless: bool = BROWSER_HEADLESS_DEFAULT,
+    max_workers: Optional[int] = None,
+    timeout: float = BATCH_SCRAPE_TIMEOUT,
+    retries: int = BATCH_SCRAPE_RETRIES,
+    rate_limiter: Optional[DomainRateLimiter] = None,
+    backend: str = SCRAPER_BACKEND
+) -> Iterator[Dict[str, Any]]:
+    """
+    Scrape banyak produk secara paralel dan hasilkan setiap hasil segera setelah selesai
+    
+    Dengan backend Selenium, jumlah worker dibatasi ukuran pool driver
+    (DRIVER_POOL_SIZE) jika pool aktif, karena worker tambahan hanya akan
+    menunggu driver dan menghabiskan batas waktunya di antrean. Dengan backend
+    HTTP, Chrome hanya dipakai sebagai fallback dan dibatasi oleh batas waktu
+    acquire pool, sehingga jumlah worker mengikuti jumlah core CPU.
+    
+    Args:
+        product_urls: URL produk Tokopedia
+        max_reviews: Jumlah maksimum ulasan per produk
+        headless: Mode headless browser
+        max_workers: Jumlah worker paralel (default ukuran pool untuk Selenium,
+            jumlah core CPU untuk HTTP, paling sedikit ukuran pool)
+        timeout: Batas waktu per percobaan scraping satu URL (detik)
+        retries: Jumlah percobaan ulang setelah percobaan pertama gagal
+        rate_limiter: Pembatas jeda per domain (default DomainRateLimiter baru)
+        backend: Backend scraper ("http" atau "selenium")
+        
+    Yields:
+        Dictionary {"url", "status" ("ok"/"error"), "data", "error", "attempts", "seconds"}
+        sesuai urutan selesai
+    """
+    urls = list(dict.fromkeys(product_urls))
+    rate_limiter = rate_limiter or DomainRateLimiter()
+    
+    if max_workers is None:
+        max_workers = DRIVER_POOL_SIZE if backend == "selenium" else max(DRIVER_POOL_SIZE, os.cpu_count() or 1)
+    
+    if backend == "selenium" and DRIVER_POOL_ENABLED:
+        from helpers.driver_pool import get_driver_pool
+        pool_size = get_driver_pool().max_size
+        if max_workers > pool_size:
+            logger.warning(f"Jumlah worker {max_workers} dibatasi menjadi ukuran pool driver {pool_size}")
+            max_workers = pool_size
+    
+    def worker(url: str) -> Dict[str, Any]:
+        start = time.perf_counter()
+        if not validate_tokopedia_url(url):
+            return {"url": url, "status": "error", "data": None, "error": "URL produk tidak valid",
+                    "attempts": 0, "seconds": 0.0}
+        
+        error = None
+        for attempt in range(1, retries + 2):
+            rate_limiter.wait(url)
+            try:
+                with span("batch_scrape_product"):
+                    data = scrape_with_deadline(url, max_reviews, headless, timeout, backend)
+                return {"url": url, "status": "ok", "data": data, "error": None,
+                        "attempts": attempt, "seconds": time.perf_counter() - start}
+            except Exception as e:
+                error = str(e)
+                logger.warning(f"Percobaan {attempt} gagal untuk {url}: {error}")
+                if attempt <= retries:
+                    time.sleep(BATCH_SCRAPE_RETRY_BACKOFF * attempt)
+        
+        return {"url": url, "status": "error", "data": None, "error": error,
+                "attempts": retries + 1, "seconds": time.perf_counter() - start}
+    
+    with ThreadPoolExecutor(max_workers=max(1, max_workers), thread_name_prefix="batch-scraper") as executor:
+        futures = [executor.submit(worker, url) for url in urls]
+        try:
+            for future in as_completed(futures):
+                result = future.result()
+                logger.info(
+                    f"{result['status'].upper()} {result['url']} "
+                    f"({result['attempts']} percobaan, {result['seconds']:.1f}s)"
+                )
+                yield result
+        finally:
+            # Batalkan URL yang belum dimulai jika pemanggil berhenti lebih awal
+            for future in futures:
+                future.cancel()
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Scraping banyak produk Tokopedia sekaligus")
+    parser.add_argument("urls_file", help="File teks berisi satu URL produk per baris")
+    parser.add_argument("--max-reviews", type=int, default=MAX_REVIEWS_DEFAULT)
+    parser.add_argument("--workers", type=int, default=None,
+                        help=f"Jumlah worker paralel (default jumlah core untuk HTTP; "
+                             f"Selenium maksimum DRIVER_POOL_SIZE={DRIVER_POOL_SIZE})")
+    parser.add_argument("--backend", choices=["http", "selenium"], default=SCRAPER_BACKEND)
+    parser.add_argument("--timeout", type=float, default=BATCH_SCRAPE_TIMEOUT)
+    parser.add_argument("--retries", type=int, default=BATCH_SCRAPE_RETRIES)
+    parser.add_argument("--no-headless", action="store_true", help="Tampilkan jendela Chrome")
+    parser.add_argument("--save", action="store_true", help="Simpan ulasan setiap produk ke data/*.csv")
+    args = parser.parse_args()
+    
+    from helpers.utils import create_directories, save_product_data, format_product_name_for_filename
+    
+    with open(args.urls_file, encoding="utf-8") as f:
+        urls = [line.strip() for line in f if line.strip() and not line.startswith("#")]
+    
+    if args.save:
+        create_directories()
+    
+    failed = 0
+    for result in scrape_many(
+        urls,
+        max_reviews=args.max_reviews,
+        headless=not args.no_headless,
+        max_workers=args.workers,
+        timeout=args.timeout,
+        retries=args.retries,
+        backend=args.backend
+    ):
+        data = result["data"]
+        if data and args.save:
+            save_product_data(data, format_product_name_for_filename(data["product_name"]))
+        failed += result["status"] != "ok"
+        print(json.dumps({
+            "url": result["url"],
+            "status": result["status"],
+            "product_name": data["product_name"] if data else None,
+            "reviews": len(data["reviews"]) if data else 0,
+            "attempts": result["attempts"],
+            "seconds": round(result["seconds"], 1),
+            "error": result["error"]
+        }, ensure_ascii=False), flush=True)
+    
+    return 1 if failed else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,290 @@
+"""
+Module untuk cascade sentimen: tahap cepat (rating, leksikon, model linear n-gram)
+sebelum IndoBERT, sehingga ulasan yang mudah tidak perlu melewati transformer
+"""
+
+import os
+import atexit
+import logging
+import tempfile
+import threading
+from typing import Any, Dict, Optional, Tuple
+
+import numpy as np
+
+from helpers.config import (
+    SENTIMENT_LABELS, CASCADE_CONFIDENCE_THRESHOLD, CASCADE_MODEL_PATH,
+    CASCADE_MIN_TRAINING_SAMPLES, CASCADE_HASH_FEATURES, CASCADE_SAVE_INTERVAL
+)
+from helpers.analyzer import apply_sentiment_corrections
+
+# Setup logging
+logging.basicConfig(level=logging.INFO, 
+                   format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+logger = logging.getLogger("cascade")
+
+class HashedNgramClassifier:
+    """
+    Model linear kecil atas fitur unigram/bigram yang di-hash, memprediksi label mentah IndoBERT
+    
+    Model dilatih secara online (partial_fit) dari hasil IndoBERT untuk ulasan yang
+    tetap dikirim ke transformer, lalu disimpan ke disk secara berkala dan saat
+    proses selesai.
+    """
+    
+    def __init__(self, path: str = CASCADE_MODEL_PATH, n_features: int = CASCADE_HASH_FEATURES):
+        """
+        Args:
+            path: Lokasi file model (joblib)
+            n_features: Jumlah dimensi fitur hash
+        """
+        from sklearn.feature_extraction.text import HashingVectorizer
+        from sklearn.linear_model import SGDClassifier
+        
+        self.path = path
+        self.vectorizer = HashingVectorizer(
+            n_features=n_features, ngram_range=(1, 2), alternate_sign=False, norm="l2"
+        )
+        self.classifier = SGDClassifier(loss="log_loss", alpha=1e-5, random_state=0)
+        self.samples_seen = 0
+        self.unsaved_samples = 0
+        self._lock = threading.Lock()
+        self._load()
+    
+    def _load(self):
+        if not os.path.exists(self.path):
+            return
+        try:
+            import joblib
+            state = joblib.load(self.path)
+            self.classifier = state["classifier"]
+            self.samples_seen = state["samples_seen"]
+            logger.info(f"Model cascade dimuat dari {self.path} ({self.samples_seen} sampel)")
+        except Exception as e:
+            logger.warning(f"Gagal memuat model cascade: {str(e)}")
+    
+    def save(self):
+        """
+        Simpan model ke disk secara atomik
+        
+        Model ditulis ke file sementara di direktori yang sama lalu dipindahkan
+        dengan os.replace, sehingga file lama tetap utuh jika proses berhenti
+        di tengah penulisan.
+        """
+        import joblib
+        directory = os.path.dirname(self.path) or "."
+        os.makedirs(directory, exist_ok=True)
+        
+        fd, temp_path = tempfile.mkstemp(dir=directory, prefix=".cascade-", suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f, self._lock:
+                joblib.dump({"classifier": self.classifier, "samples_seen": self.samples_seen}, f)
+                saved_samples = self.unsaved_samples
+            os.replace(temp_path, self.path)
+        except BaseException:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
+        with self._lock:
+            self.unsaved_samples -= saved_samples
+    
+    def save_if_due(self, interval: int = CASCADE_SAVE_INTERVAL) -> bool:
+        """
+        Simpan model jika sampel yang belum disimpan sudah mencapai interval
+        
+        Args:
+            interval: Jumlah sampel baru minimum sebelum disimpan
+            
+        Returns:
+            Boolean menandakan model disimpan atau tidak
+        """
+        if self.unsaved_samples < max(1, interval):
+            return False
+        self.save()
+        return True
+    
+    @property
+    def is_ready(self) -> bool:
+        """
+        Model sudah melihat cukup sampel untuk dipakai
+        """
+        return self.samples_seen >= CASCADE_MIN_TRAINING_SAMPLES
+    
+    def predict_proba(self, texts) -> Optional[np.ndarray]:
+        """
+        Probabilitas label mentah IndoBERT untuk setiap teks
+        
+        Args:
+            texts: List teks yang sudah diproses
+            
+        Returns:
+            Array (jumlah teks, jumlah label), atau None jika model belum siap
+        """
+        if not self.is_ready or len(texts) == 0:
+            return None
+        with self._lock:
+            probabilities = self.classifier.predict_proba(self.vectorizer.transform(texts))
+        # Susun ulang kolom sesuai indeks label walaupun ada kelas yang belum pernah terlihat
+        full = np.full((len(texts), len(SENTIMENT_LABELS)), 1e-6)
+        full[:, self.classifier.classes_.astype(int)] = probabilities
+        return full / full.sum(axis=1, keepdims=True)
+    
+    def partial_fit(self, texts, labels):
+        """
+        Perbarui model dengan label mentah IndoBERT
+        
+        Args:
+            texts: List teks yang sudah diproses
+            labels: Label argmax dari logits IndoBERT
+        """
+        if len(texts) == 0:
+            return
+        with self._lock:
+            self.classifier.partial_fit(
+                self.vectorizer.transform(texts),
+                np.asarray(labels, dtype=int),
+                classes=np.arange(len(SENTIMENT_LABELS))
+            )
+            self.samples_seen += len(texts)
+            self.unsaved_samples += len(texts)
+
+def rule_prior(ratings: np.ndarray, positive_counts: np.ndarray, negative_counts: np.ndarray) -> np.ndarray:
+    """
+    Perkiraan kasar label mentah IndoBERT dari rating dan hit leksikon
+    
+    Ulasan bintang 4-5 yang hanya berisi kata positif hampir selalu diberi label
+    positif oleh model (begitu juga sebaliknya), selain itu prior dibuat seragam.
+    
+    Returns:
+        Array (jumlah ulasan, jumlah label) berisi probabilitas prior
+    """
+    prior = np.full((len(ratings), len(SENTIMENT_LABELS)), 1 / len(SENTIMENT_LABELS))
+    clearly_positive = (ratings >= 4) & (positive_counts > 0) & (negative_counts == 0)
+    clearly_negative = (ratings >= 1) & (ratings <= 2) & (negative_counts > 0) & (positive_counts == 0)
+    prior[clearly_positive] = [0.03, 0.07, 0.90]
+    prior[clearly_negative] = [0.90, 0.07, 0.03]
+    return prior
+
+def fast_stage(
+    texts,
+    ratings: np.ndarray,
+    positive_counts: np.ndarray,
+    negative_counts: np.ndarray,
+    classifier: Optional[HashedNgramClassifier] = None,
+    threshold: float = CASCADE_CONFIDENCE_THRESHOLD
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Tentukan label akhir tanpa transformer untuk ulasan yang cukup pasti
+    
+    Untuk setiap kemungkinan label mentah model, aturan koreksi rating/leksikon
+    dijalankan untuk mendapatkan label akhirnya. Probabilitas label akhir adalah
+    jumlah probabilitas label mentah yang berujung ke label tersebut.
+    
+    Args:
+        texts: List teks yang sudah diproses
+        ratings: Array rating ulasan
+        positive_counts: Array jumlah kata positif
+        negative_counts: Array jumlah kata negatif
+        classifier: Model linear n-gram (opsional)
+        threshold: Probabilitas minimum agar ulasan tidak dikirim ke transformer
+        
+    Returns:
+        Tuple dari (label akhir, probabilitasnya, mask ulasan yang sudah diputuskan)
+    """
+    n = len(ratings)
+    num_labels = len(SENTIMENT_LABELS)
+    
+    probabilities = rule_prior(ratings, positive_counts, negative_counts)
+    linear = classifier.predict_proba(texts) if classifier is not None else None
+    if linear is not None:
+        probabilities = probabilities * linear
+        probabilities /= probabilities.sum(axis=1, keepdims=True)
+    
+    # Label akhir jika model memberi label mentah s, untuk setiap s
+    final_probabilities = np.zeros((n, num_labels))
+    for raw_label in range(num_labels):
+        one_hot = np.zeros((n, num_labels), dtype=np.float32)
+        one_hot[:, raw_label] = 1
+        outcome, _ = apply_sentiment_corrections(one_hot, ratings, positive_counts, negative_counts)
+        final_probabilities[np.arange(n), outcome] += probabilities[:, raw_label]
+    
+    labels = final_probabilities.argmax(axis=1)
+    confidence = final_probabilities[np.arange(n), labels]
+    return labels, confidence, confidence >= threshold
+
+# Model linear bersama, dibuat saat pertama kali digunakan
+_classifier: Optional[HashedNgramClassifier] = None
+_classifier_lock = threading.Lock()
+
+def get_fast_classifier() -> Optional[HashedNgramClassifier]:
+    """
+    Dapatkan model linear n-gram bersama
+    
+    Returns:
+        HashedNgramClassifier, atau None jika scikit-learn tidak tersedia
+    """
+    global _classifier
+    with _classifier_lock:
+        if _classifier is None:
+            try:
+                _classifier = HashedNgramClassifier()
+            except ImportError as e:
+                logger.warning(f"Model linear cascade tidak tersedia: {str(e)}")
+                return None
+        return _classifier
+
+def save_fast_classifier():
+    """
+    Simpan sampel model linear yang belum tersimpan (dipanggil otomatis saat proses selesai)
+    """
+    with _classifier_lock:
+        classifier = _classifier
+    if classifier is not None and classifier.unsaved_samples > 0:
+        try:
+            classifier.save()
+        except Exception as e:
+            logger.warning(f"Gagal menyimpan model cascade: {str(e)}")
+
+atexit.register(save_fast_classifier)
+
+def summarize_cascade(
+    total: int,
+    decided: np.ndarray,
+    audited: np.ndarray,
+    fast_labels: np.ndarray,
+    model_labels: np.ndarray,
+    empty: Optional[np.ndarray] = None
+) -> Dict[str, Any]:
+    """
+    Ringkasan satu run cascade
+    
+    Args:
+        total: Jumlah ulasan
+        decided: Mask ulasan yang diputuskan tahap cepat
+        audited: Mask ulasan yang diputuskan tahap cepat tetapi tetap diperiksa model
+            (tidak dihitung sebagai short-circuit)
+        fast_labels: Label tahap cepat
+        model_labels: Label akhir dari model (hanya valid untuk ulasan yang dikirim ke model)
+        empty: Mask ulasan tanpa teks yang labelnya dipaksa dari rating
+            (dilaporkan terpisah, tidak dihitung sebagai short-circuit)
+        
+    Returns:
+        Dictionary statistik cascade
+    """
+    if empty is None:
+        empty = np.zeros(total, dtype=bool)
+    empty_count = int(empty.sum())
+    text_total = total - empty_count
+    short_circuited = int((decided & ~audited & ~empty).sum())
+    audited_count = int(audited.sum())
+    agreement = None
+    if audited_count:
+        agreement = float((fast_labels[audited] == model_labels[audited]).mean())
+    return {
+        "total": total,
+        "empty": empty_count,
+        "short_circuited": short_circuited,
+        "short_circuit_rate": short_circuited / text_total if text_total else 0.0,
+        "audited": audited_count,
+        "agreement": agreement,
+    }
@@ -9,7 +9,42 @@ OLLAMA_MODEL = "bangundwir/bahasa-4b-chat"  # Model Bahasa Indonesia untuk Ollam
 # Scraper configuration
 MAX_REVIEWS_DEFAULT = 50
 BROWSER_HEADLESS_DEFAULT = True
+STREAMING_ANALYSIS_DEFAULT = True  # Analisis per halaman ulasan selagi scraping berjalan
 TOKOPEDIA_DOMAIN = "tokopedia.com"
+EMPTY_REVIEW_PLACEHOLDER = "Tidak ada ulasan"  # Teks pengganti untuk ulasan yang hanya berisi rating
+
+# Batas waktu tunggu kondisi halaman saat scraping (detik)
+SCRAPER_PAGE_LOAD_TIMEOUT = 15  # Nama produk muncul setelah halaman dibuka
+SCRAPER_POPUP_TIMEOUT = 3  # Popup iklan muncul / tertutup
+SCRAPER_CONTENT_TIMEOUT = 10  # Kontainer ulasan muncul setelah scroll
+SCRAPER_DESCRIPTION_TIMEOUT = 3  # Deskripsi lengkap terbuka setelah "Lihat Selengkapnya"
+SCRAPER_PAGE_CHANGE_TIMEOUT = 10  # Halaman ulasan berganti setelah "Laman berikutnya"
+SCRAPER_POLL_INTERVAL = 0.2  # Interval pemeriksaan kondisi
+DRIVER_PAGE_LOAD_TIMEOUT = 30  # Batas waktu navigasi driver.get (detik)
+DRIVER_SCRIPT_TIMEOUT = 10  # Batas waktu execute_script/execute_async_script (detik)
+
+# Pool Chrome driver yang dipakai ulang antar scraping
+DRIVER_POOL_ENABLED = True
+DRIVER_POOL_SIZE = 2  # Jumlah Chrome driver hidup maksimum
+DRIVER_POOL_MAX_USES = 20  # Driver diganti setelah dipakai sebanyak ini
+DRIVER_POOL_ACQUIRE_TIMEOUT = 120  # Batas waktu menunggu driver tersedia (detik)
+DRIVER_POOL_PREWARM = 1  # Jumlah driver yang diluncurkan saat aplikasi mulai
+
+# Scraping banyak produk sekaligus
+BATCH_SCRAPE_TIMEOUT = 300  # Batas waktu per percobaan satu URL (detik)
+BATCH_SCRAPE_RETRIES = 2  # Percobaan ulang setelah percobaan pertama gagal
+BATCH_SCRAPE_RETRY_BACKOFF = 5  # Jeda sebelum percobaan ulang, dikali nomor percobaan (detik)
+BATCH_SCRAPE_DOMAIN_INTERVAL = 2  # Jeda minimum antar produk baru ke domain yang sama (detik)
+
+# Pengambilan ulasan lewat HTTP/GraphQL tanpa browser
+SCRAPER_BACKEND = "http"  # "http" (fallback ke Selenium jika gagal) atau "selenium"
+TOKOPEDIA_GQL_URL = "https://gql.tokopedia.com/graphql/productReviewList"
+HTTP_BASE_URL_OVERRIDE = None  # scheme://host pengganti Tokopedia untuk backend HTTP (misalnya server fixture lokal)
+HTTP_FETCH_WORKERS = 4  # Jumlah halaman ulasan yang diminta paralel
+HTTP_FETCH_TIMEOUT = 15  # Batas waktu per request (detik)
+HTTP_FETCH_RETRIES = 2  # Percobaan ulang untuk error koneksi dan status 429/5xx
+HTTP_REVIEWS_PER_PAGE = 10  # Jumlah ulasan per halaman GraphQL
+HTTP_USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
 
 # Sentiment analysis configuration
 SENTIMENT_LABELS = {
@@ -18,6 +53,55 @@ SENTIMENT_LABELS = {
     2: "Positif"
 }
 
+# Model sentimen
+SENTIMENT_MODEL_PATH = "quickshop-indobert-sentiment"  # Model lokal hasil fine-tuning
+DEFAULT_SENTIMENT_MODEL = "indobenchmark/indobert-base-p1"  # Fallback dari Hugging Face
+MODEL_WARMUP_TEXT = "barang bagus pengiriman cepat"  # Teks untuk forward pass warm-up
+
+# Batch inference configuration
+SENTIMENT_BATCH_SIZE = 32  # Jumlah ulasan per forward pass model
+SENTIMENT_MAX_LENGTH = 512  # Panjang token maksimum per ulasan
+SENTIMENT_PIPELINE_DEPTH = 2  # Batch hasil tokenisasi yang boleh menunggu model (0 = tanpa thread)
+
+# Backend inferensi: "torch" (PyTorch fp32) atau "onnx" (ONNX Runtime)
+SENTIMENT_BACKEND = "torch"
+ONNX_MODEL_DIR = "models"  # Lokasi hasil ekspor ONNX
+ONNX_QUANTIZE = True  # Gunakan kuantisasi dinamis int8
+ONNX_INTRA_OP_THREADS = 0  # 0 = default ONNX Runtime
+
+# Cache hasil model di disk, dikunci dengan hash teks, identitas model, dan versinya
+SENTIMENT_CACHE_ENABLED = True
+SENTIMENT_CACHE_PATH = "data/sentiment_cache.sqlite"
+SENTIMENT_CACHE_MAX_ENTRIES = 100000
+
+# Inferensi paralel multi-proses (0 = nonaktif), hanya untuk jumlah ulasan besar
+SENTIMENT_NUM_WORKERS = 0
+SENTIMENT_POOL_MIN_REVIEWS = 500
+
+# Cascade: ulasan yang mudah diberi label tanpa IndoBERT
+CASCADE_ENABLED = False
+CASCADE_CONFIDENCE_THRESHOLD = 0.9  # Probabilitas minimum label tahap cepat
+CASCADE_AUDIT_RATE = 0.1  # Proporsi ulasan short-circuit yang tetap diperiksa model
+CASCADE_MODEL_PATH = "models/cascade_linear.joblib"  # Model linear n-gram
+CASCADE_MIN_TRAINING_SAMPLES = 200  # Sampel minimum sebelum model linear dipakai
+CASCADE_HASH_FEATURES = 2 ** 16  # Dimensi fitur n-gram yang di-hash
+CASCADE_SAVE_INTERVAL = 1000  # Sampel baru sebelum model linear disimpan lagi (sisanya saat proses selesai)
+
+# Deteksi ulasan hampir identik (MinHash + LSH)
+NEAR_DUPLICATE_ENABLED = False  # Jalankan model hanya untuk satu perwakilan per cluster
+NEAR_DUPLICATE_WORDCLOUD = False  # Hitung setiap cluster sekali saja di wordcloud (juga kolom Cluster)
+NEAR_DUPLICATE_THRESHOLD = 0.7  # Kemiripan Jaccard minimum antar ulasan
+MINHASH_NUM_PERM = 128  # Jumlah fungsi hash MinHash
+MINHASH_SHINGLE_SIZE = 4  # Panjang shingle karakter
+LSH_BANDS = 16  # Jumlah band LSH (MINHASH_NUM_PERM / LSH_BANDS baris per band)
+
+# Server inferensi lokal bersama, misalnya "unix:/tmp/quickshop-sentiment.sock" atau
+# "127.0.0.1:8765" (None = model dijalankan di proses aplikasi)
+INFERENCE_SERVER_ADDRESS = None
+INFERENCE_SERVER_MAX_BATCH_SIZE = 64  # Jumlah teks maksimum per micro-batch
+INFERENCE_SERVER_MAX_WAIT_MS = 10  # Waktu tunggu maksimum sebelum micro-batch dijalankan
+INFERENCE_SERVER_TIMEOUT = 120  # Batas waktu request ke server (detik)
+
 # Word list untuk analisis sentimen
 POSITIVE_WORDS = [
     "mantap", "bagus", "jernih", "nyaman", "original", "premium", 
@@ -32,6 +116,42 @@ NEGATIVE_WORDS = [
     "bocor", "palsu", "pecah", "suram", "rugi", "tidak worth it"
 ]
 
+# File leksikon tambahan (satu kata/frasa per baris), None jika tidak digunakan
+POSITIVE_WORDS_FILE = None
+NEGATIVE_WORDS_FILE = None
+
+# Cocokkan kata leksikon hanya sebagai kata utuh (misalnya "ok" tidak cocok di dalam "toko")
+LEXICON_WORD_BOUNDARY = False
+
+# Wordcloud
+WORDCLOUD_WIDTH = 800
+WORDCLOUD_HEIGHT = 400
+WORDCLOUD_MAX_WORDS = 200
+WORDCLOUD_CACHE_SIZE = 32  # Jumlah gambar wordcloud yang disimpan di memori
+TERM_STORE_PATH = "data/term_frequencies.sqlite"  # Frekuensi kata per produk dan sentimen
+
+# Metrik waktu per tahap pipeline
+METRICS_ENABLED = True
+METRICS_EXPORT_PATH = "data/metrics.prom"  # File teks format Prometheus
+METRICS_HTTP_PORT = None  # Port endpoint /metrics lokal (None = nonaktif)
+METRICS_HISTOGRAM_BUCKETS = [0.1, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300]  # Detik
+METRICS_MEMORY_SAMPLE_INTERVAL = 0.05  # Interval sampling RSS selama span aktif (detik)
+
+# Kamus penggantian emoji menjadi kata
+EMOJI_REPLACEMENTS = {
+    "😍": "senang", "❤️": "cinta", "💔": "sedih", "😡": "marah", "😢": "sedih",
+    "😊": "senang", "😁": "senang", "😭": "sedih", "👍": "bagus", "👎": "jelek",
+    "🥰": "senang", "💖": "cinta", "💗": "cinta", "💕": "cinta", "💞": "cinta", 
+    "😞": "kecewa", "😔": "kecewa", "😃": "senang", "🤗": "senang", "😎": "keren"
+}
+
+# Kamus normalisasi singkatan dan kata sehari-hari (dicocokkan per kata)
+SLANG_REPLACEMENTS = {
+    "gk": "tidak", "tdk": "tidak", "ga": "tidak",
+    "bgt": "banget", "bgtt": "banget", "bgttt": "banget",
+    "ok": "oke"
+}
+
 # Konfigurasi style untuk Streamlit
 CUSTOM_CSS = """
 <style>
@@ -0,0 +1,277 @@
+"""
+Module untuk distilasi model sentimen IndoBERT menjadi model student yang lebih kecil (CPU-only)
+
+Student adalah BERT dengan lebih sedikit layer yang diinisialisasi dari layer
+teacher, dilatih dengan logits teacher pada ulasan yang tersimpan di data/*.csv,
+lalu disimpan dengan format direktori Hugging Face yang sama sehingga dapat
+dimuat tanpa perubahan lewat `load_sentiment_model(path)`.
+
+Contoh:
+    python -m helpers.distillation --teacher quickshop-indobert-sentiment \\
+        --output models/quickshop-indobert-student --layers 3
+"""
+
+import os
+import sys
+import glob
+import json
+import time
+import random
+import logging
+import argparse
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from helpers.config import SENTIMENT_MODEL_PATH, SENTIMENT_BATCH_SIZE
+
+# Setup logging
+logging.basicConfig(level=logging.INFO, 
+                   format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+logger = logging.getLogger("distillation")
+
+def load_review_texts(pattern: str = os.path.join("data", "*.csv")) -> Tuple[List[str], List[Any]]:
+    """
+    Kumpulkan teks ulasan unik dari file CSV produk, diproses ulang dari kolom Ulasan
+    
+    Args:
+        pattern: Pola glob file CSV
+        
+    Returns:
+        Tuple dari (teks yang sudah diproses, rating masing-masing)
+    """
+    import pandas as pd
+    from helpers.preprocessor import preprocess_many
+    
+    texts, ratings, seen = [], [], set()
+    for filepath in sorted(glob.glob(pattern)):
+        try:
+            df = pd.read_csv(filepath)
+        except Exception as e:
+            logger.warning(f"Lewati {filepath}: {str(e)}")
+            continue
+        # Selalu proses ulang Ulasan: kolom Preprocessed di CSV lama berasal dari
+        # regex preprocessing versi lama yang keliru
+        if "Ulasan" in df.columns:
+            column = preprocess_many(df["Ulasan"].fillna("").astype(str))
+        elif "Preprocessed" in df.columns:
+            column = df["Preprocessed"].fillna("").astype(str).tolist()
+        else:
+            continue
+        file_ratings = df["Rating"].tolist() if "Rating" in df.columns else [0] * len(column)
+        for text, rating in zip(column, file_ratings):
+            if text and text not in seen:
+                seen.add(text)
+                texts.append(text)
+                ratings.append(rating)
+    logger.info(f"Memuat {len(texts)} ulasan unik dari {pattern}")
+    return texts, ratings
+
+def build_student(teacher, num_layers: int):
+    """
+    Buat student BERT dengan layer lebih sedikit, diinisialisasi dari teacher
+    
+    Embedding, pooler, dan classifier disalin utuh; layer encoder diambil dari
+    teacher dengan jarak merata (misalnya layer 0, 5, 11 untuk 3 layer).
+    
+    Args:
+        teacher: Model BertForSequenceClassification teacher
+        num_layers: Jumlah layer encoder student
+        
+    Returns:
+        Model student dengan kelas dan konfigurasi yang sama seperti teacher
+    """
+    import copy
+    
+    config = copy.deepcopy(teacher.config)
+    teacher_layers = config.num_hidden_layers
+    num_layers = max(1, min(num_layers, teacher_layers))
+    config.num_hidden_layers = num_layers
+    student = type(teacher)(config)
+    
+    selected = np.linspace(0, teacher_layers - 1, num_layers).round().astype(int).tolist()
+    teacher_state = teacher.state_dict()
+    student_state = student.state_dict()
+    for key in student_state:
+        source_key = key
+        if ".encoder.layer." in key:
+            prefix, rest = key.split(".encoder.layer.", 1)
+            index, suffix = rest.split(".", 1)
+            source_key = f"{prefix}.encoder.layer.{selected[int(index)]}.{suffix}"
+        if source_key in teacher_state and teacher_state[source_key].shape == student_state[key].shape:
+            student_state[key] = teacher_state[source_key].clone()
+    student.load_state_dict(student_state)
+    
+    logger.info(f"Student {num_layers} layer diinisialisasi dari layer teacher {selected}")
+    return student
+
+def measure_latency(loaded_model, texts: List[str], batch_size: int = SENTIMENT_BATCH_SIZE, repeats: int = 3) -> float:
+    """
+    Ukur latensi inferensi rata-rata per ulasan
+    
+    Args:
+        loaded_model: LoadedModel dari registry
+        texts: Teks untuk diukur
+        batch_size: Ukuran batch inferensi
+        repeats: Jumlah pengulangan (diambil yang tercepat)
+        
+    Returns:
+        Latensi dalam milidetik per ulasan
+    """
+    from helpers.analyzer import predict_logits
+    
+    best = float("inf")
+    for _ in range(repeats):
+        start = time.perf_counter()
+        predict_logits(texts, batch_size=batch_size, loaded_model=loaded_model)
+        best = min(best, time.perf_counter() - start)
+    return best * 1000 / max(len(texts), 1)
+
+def distill(
+    teacher_path: str = SENTIMENT_MODEL_PATH,
+    output_path: str = os.path.join("models", "quickshop-indobert-student"),
+    data_pattern: str = os.path.join("data", "*.csv"),
+    num_layers: int = 3,
+    epochs: int = 3,
+    batch_size: int = SENTIMENT_BATCH_SIZE,
+    learning_rate: float = 5e-5,
+    temperature: float = 2.0,
+    holdout_ratio: float = 0.1,
+    seed: int = 42
+) -> Dict[str, Any]:
+    """
+    Latih student dari logits teacher dan simpan beserta laporan kesesuaian dan latensi
+    
+    Args:
+        teacher_path: Path model teacher
+        output_path: Direktori output student (format Hugging Face)
+        data_pattern: Pola glob CSV ulasan
+        num_layers: Jumlah layer encoder student
+        epochs: Jumlah epoch pelatihan
+        batch_size: Ukuran batch
+        learning_rate: Learning rate AdamW
+        temperature: Temperatur distilasi
+        holdout_ratio: Proporsi data untuk evaluasi
+        seed: Seed random
+        
+    Returns:
+        Dictionary laporan distilasi
+    """
+    import torch
+    import torch.nn.functional as F
+    from transformers import AutoTokenizer
+    from helpers.analyzer import predict_logits, apply_sentiment_corrections, ratings_to_array
+    from helpers.model_registry import LoadedModel, registry
+    
+    random.seed(seed)
+    np.random.seed(seed)
+    torch.manual_seed(seed)
+    
+    texts, ratings = load_review_texts(data_pattern)
+    if len(texts) < 10:
+        raise ValueError(f"Data terlalu sedikit untuk distilasi ({len(texts)} ulasan)")
+    
+    order = np.random.permutation(len(texts))
+    holdout_size = max(1, int(len(texts) * holdout_ratio))
+    holdout_idx, train_idx = order[:holdout_size], order[holdout_size:]
+    
+    # Logits teacher untuk semua teks, dihitung sekali
+    teacher = registry.load(teacher_path, backend="torch", warmup=False)
+    teacher_logits = predict_logits(texts, batch_size=batch_size, loaded_model=teacher)
+    
+    tokenizer = AutoTokenizer.from_pretrained(teacher_path)
+    student_model = build_student(teacher.model, num_layers)
+    optimizer = torch.optim.AdamW(student_model.parameters(), lr=learning_rate)
+    
+    for epoch in range(epochs):
+        student_model.train()
+        np.random.shuffle(train_idx)
+        total_loss = 0.0
+        for start in range(0, len(train_idx), batch_size):
+            batch_idx = train_idx[start:start + batch_size]
+            inputs = tokenizer(
+                [texts[i] for i in batch_idx], padding=True, truncation=True, return_tensors="pt"
+            )
+            targets = torch.from_numpy(teacher_logits[batch_idx])
+            student_logits = student_model(**inputs).logits
+            loss = F.kl_div(
+                F.log_softmax(student_logits / temperature, dim=-1),
+                F.softmax(targets / temperature, dim=-1),
+                reduction="batchmean"
+            ) * temperature ** 2
+            optimizer.zero_grad()
+            loss.backward()
+            optimizer.step()
+            total_loss += loss.item() * len(batch_idx)
+        logger.info(f"Epoch {epoch + 1}/{epochs}: loss {total_loss / max(len(train_idx), 1):.4f}")
+    
+    student_model.eval()
+    os.makedirs(output_path, exist_ok=True)
+    student_model.save_pretrained(output_path)
+    tokenizer.save_pretrained(output_path)
+    
+    # Evaluasi pada data holdout: label mentah dan label akhir setelah koreksi rating/leksikon
+    student = LoadedModel("student", output_path, "torch", tokenizer, student_model)
+    holdout_texts = [texts[i] for i in holdout_idx]
+    student_logits = predict_logits(holdout_texts, batch_size=batch_size, loaded_model=student)
+    holdout_teacher = teacher_logits[holdout_idx]
+    
+    from helpers.lexicon import count_sentiment_words
+    counts = np.array([count_sentiment_words(text) for text in holdout_texts]).reshape(-1, 2)
+    holdout_ratings = ratings_to_array([ratings[i] for i in holdout_idx])
+    teacher_final, _ = apply_sentiment_corrections(holdout_teacher, holdout_ratings, counts[:, 0], counts[:, 1])
+    student_final, _ = apply_sentiment_corrections(student_logits, holdout_ratings, counts[:, 0], counts[:, 1])
+    
+    teacher_latency = measure_latency(teacher, holdout_texts, batch_size)
+    student_latency = measure_latency(student, holdout_texts, batch_size)
+    
+    report = {
+        "teacher": teacher_path,
+        "student": output_path,
+        "student_layers": student_model.config.num_hidden_layers,
+        "train_reviews": int(len(train_idx)),
+        "holdout_reviews": int(len(holdout_idx)),
+        "raw_label_agreement": float((student_logits.argmax(1) == holdout_teacher.argmax(1)).mean()),
+        "final_label_agreement": float((student_final == teacher_final).mean()),
+        "teacher_ms_per_review": teacher_latency,
+        "student_ms_per_review": student_latency,
+        "speedup": teacher_latency / student_latency if student_latency else None,
+        "teacher_parameters": int(sum(p.numel() for p in teacher.model.parameters())),
+        "student_parameters": int(sum(p.numel() for p in student_model.parameters())),
+    }
+    with open(os.path.join(output_path, "distillation_report.json"), "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+    
+    logger.info(
+        f"Student disimpan ke {output_path}: kesesuaian {report['final_label_agreement']:.1%}, "
+        f"speedup {report['speedup']:.1f}x"
+    )
+    return report
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Distilasi model sentimen QuickShop")
+    parser.add_argument("--teacher", default=SENTIMENT_MODEL_PATH, help="Path model teacher")
+    parser.add_argument("--output", default=os.path.join("models", "quickshop-indobert-student"))
+    parser.add_argument("--data", default=os.path.join("data", "*.csv"), help="Pola glob CSV ulasan")
+    parser.add_argument("--layers", type=int, default=3, help="Jumlah layer encoder student")
+    parser.add_argument("--epochs", type=int, default=3)
+    parser.add_argument("--batch-size", type=int, default=SENTIMENT_BATCH_SIZE)
+    parser.add_argument("--learning-rate", type=float, default=5e-5)
+    parser.add_argument("--temperature", type=float, default=2.0)
+    args = parser.parse_args()
+    
+    report = distill(
+        teacher_path=args.teacher,
+        output_path=args.output,
+        data_pattern=args.data,
+        num_layers=args.layers,
+        epochs=args.epochs,
+        batch_size=args.batch_size,
+        learning_rate=args.learning_rate,
+        temperature=args.temperature
+    )
+    print(json.dumps(report, indent=2))
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
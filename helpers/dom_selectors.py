@@ -0,0 +1,22 @@
+"""
+Module berisi semua selector DOM halaman produk Tokopedia yang dipakai scraper
+
+Jika Tokopedia mengubah markup halaman, cukup perbarui selector di sini.
+"""
+
+# Informasi produk
+PRODUCT_NAME = "h1[data-testid='lblPDPDetailProductName']"
+PRODUCT_DESCRIPTION = "div[data-testid='lblPDPDescriptionProduk']"
+SEE_MORE_BUTTON_XPATH = "//button[@data-testid='btnPDPSeeMore']"
+
+# Popup iklan
+POPUP = ".css-11hzwo5"
+POPUP_BUTTON = ".css-11hzwo5 button"
+
+# Ulasan
+REVIEW_TOTAL = "p[data-testid='reviewSortingSubtitle']"
+REVIEW_CONTAINER = "article.css-15m2bcr"
+REVIEW_TEXT = "p span[data-testid='lblItemUlasan']"
+REVIEW_NAME = "div.css-k4rf3m span.name"
+REVIEW_RATING = "div[data-testid='icnStarRating']"
+NEXT_PAGE_BUTTON_XPATH = "//button[@aria-label='Laman berikutnya']"
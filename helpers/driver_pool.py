@@ -0,0 +1,326 @@
+"""
+Module untuk pool Chrome driver yang sudah diluncurkan dan dipakai ulang antar scraping
+
+Path binary chromedriver hanya di-resolve sekali per proses. Driver dipinjam per
+scraping, di-reset (cookie, storage, dan tab tambahan dibersihkan) saat
+dikembalikan, diperiksa kesehatannya, dan diganti setelah N pemakaian atau crash.
+"""
+
+import time
+import atexit
+import logging
+import threading
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Optional, Set, TYPE_CHECKING
+from urllib.parse import urlparse
+
+from helpers.config import (
+    TOKOPEDIA_DOMAIN, BROWSER_HEADLESS_DEFAULT, DRIVER_POOL_SIZE, DRIVER_POOL_MAX_USES,
+    DRIVER_POOL_ACQUIRE_TIMEOUT
+)
+
+# Setup logging
+logging.basicConfig(level=logging.INFO, 
+                   format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+logger = logging.getLogger("driver_pool")
+
+if TYPE_CHECKING:
+    from selenium import webdriver
+
+_chromedriver_path: Optional[str] = None
+_chromedriver_path_lock = threading.Lock()
+
+def get_chromedriver_path() -> str:
+    """
+    Resolve path chromedriver lewat webdriver_manager sekali per proses
+    
+    Returns:
+        Path binary chromedriver
+    """
+    global _chromedriver_path
+    with _chromedriver_path_lock:
+        if _chromedriver_path is None:
+            from webdriver_manager.chrome import ChromeDriverManager
+            _chromedriver_path = ChromeDriverManager().install()
+            logger.info(f"Chromedriver: {_chromedriver_path}")
+        return _chromedriver_path
+
+def is_driver_healthy(driver: "webdriver.Chrome") -> bool:
+    """
+    Periksa apakah browser masih merespons
+    """
+    try:
+        return bool(driver.window_handles)
+    except Exception:
+        return False
+
+def get_origin(url: str) -> Optional[str]:
+    """
+    Origin (scheme://host[:port]) dari URL halaman web, atau None untuk halaman seperti about:blank
+    """
+    parsed = urlparse(url or "")
+    if parsed.scheme not in ("http", "https") or not parsed.netloc:
+        return None
+    return f"{parsed.scheme}://{parsed.netloc}"
+
+def reset_driver(driver: "webdriver.Chrome"):
+    """
+    Bersihkan state driver agar scraping berikutnya mulai dari sesi bersih
+    
+    Tab tambahan ditutup, cookie semua domain dan storage origin yang dikunjungi
+    (localStorage, IndexedDB, cache, service worker, dll.) dihapus lewat CDP,
+    batas waktu navigasi dan script dikembalikan ke default, lalu tab dikosongkan.
+    """
+    from helpers.scraper import set_driver_timeouts
+    
+    origins: Set[str] = {f"https://www.{TOKOPEDIA_DOMAIN}"}
+    handles = driver.window_handles
+    for handle in reversed(handles):
+        driver.switch_to.window(handle)
+        origin = get_origin(driver.current_url)
+        if origin:
+            origins.add(origin)
+        if handle != handles[0]:
+            driver.close()
+    driver.switch_to.window(handles[0])
+    
+    # delete_all_cookies hanya menghapus cookie domain halaman aktif
+    driver.execute_cdp_cmd("Network.clearBrowserCookies", {})
+    for origin in origins:
+        driver.execute_cdp_cmd("Storage.clearDataForOrigin", {"origin": origin, "storageTypes": "all"})
+    set_driver_timeouts(driver)
+    driver.get("about:blank")
+
+class DriverPool:
+    """
+    Pool Chrome driver dengan batas ukuran, reset saat dikembalikan, dan daur ulang
+    """
+    
+    def __init__(self, max_size: int = DRIVER_POOL_SIZE, max_uses: int = DRIVER_POOL_MAX_USES):
+        """
+        Args:
+            max_size: Jumlah driver hidup maksimum (dipinjam maupun menganggur)
+            max_uses: Jumlah pemakaian sebelum driver diganti dengan yang baru
+        """
+        self.max_size = max(1, max_size)
+        self.max_uses = max(1, max_uses)
+        self._condition = threading.Condition()
+        self._idle: Dict[bool, List["webdriver.Chrome"]] = {True: [], False: []}
+        self._uses: Dict[int, int] = {}
+        self._headless: Dict[int, bool] = {}
+        self._live = 0
+        self._closed = False
+    
+    def _launch(self, headless: bool) -> "webdriver.Chrome":
+        from helpers.scraper import setup_driver
+        
+        start = time.perf_counter()
+        driver = setup_driver(headless=headless)
+        logger.info(f"Chrome driver baru diluncurkan ({time.perf_counter() - start:.1f}s)")
+        return driver
+    
+    def _discard(self, driver: "webdriver.Chrome"):
+        """
+        Tutup driver dan bebaskan slotnya (dipanggil tanpa memegang lock)
+        """
+        try:
+            driver.quit()
+        except Exception as e:
+            logger.warning(f"Gagal menutup Chrome driver: {str(e)}")
+        with self._condition:
+            self._uses.pop(id(driver), None)
+            self._headless.pop(id(driver), None)
+            self._live -= 1
+            self._condition.notify()
+    
+    def acquire(self, headless: bool = BROWSER_HEADLESS_DEFAULT,
+                timeout: float = DRIVER_POOL_ACQUIRE_TIMEOUT) -> "webdriver.Chrome":
+        """
+        Pinjam driver dari pool, meluncurkan driver baru jika masih ada slot
+        
+        Args:
+            headless: Mode headless driver yang dibutuhkan
+            timeout: Batas waktu menunggu driver tersedia (detik)
+            
+        Returns:
+            Objek webdriver.Chrome
+        """
+        deadline = time.monotonic() + timeout
+        while True:
+            stale = None
+            with self._condition:
+                if self._closed:
+                    raise RuntimeError("Pool driver sudah ditutup")
+                if self._idle[headless]:
+                    driver = self._idle[headless].pop()
+                elif self._live < self.max_size:
+                    self._live += 1
+                    driver = None
+                elif self._idle[not headless]:
+                    # Ganti driver menganggur dengan mode lain agar slot bisa dipakai
+                    stale = self._idle[not headless].pop()
+                    driver = None
+                else:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        raise TimeoutError("Tidak ada Chrome driver yang tersedia")
+                    self._condition.wait(remaining)
+                    continue
+            
+            if stale is not None:
+                self._discard(stale)
+                continue
+            
+            if driver is not None:
+                if is_driver_healthy(driver):
+                    return driver
+                logger.warning("Chrome driver di pool tidak merespons, diganti")
+                self._discard(driver)
+                continue
+            
+            try:
+                driver = self._launch(headless)
+            except BaseException:
+                with self._condition:
+                    self._live -= 1
+                    self._condition.notify()
+                raise
+            with self._condition:
+                self._uses[id(driver)] = 0
+                self._headless[id(driver)] = headless
+            return driver
+    
+    def release(self, driver: "webdriver.Chrome"):
+        """
+        Kembalikan driver ke pool setelah di-reset, atau tutup jika rusak/sudah terlalu sering dipakai
+        
+        Args:
+            driver: Driver yang dipinjam dari acquire()
+        """
+        with self._condition:
+            self._uses[id(driver)] = self._uses.get(id(driver), 0) + 1
+            uses = self._uses[id(driver)]
+            headless = self._headless.get(id(driver), BROWSER_HEADLESS_DEFAULT)
+            closed = self._closed
+        
+        if closed or uses >= self.max_uses or not is_driver_healthy(driver):
+            self._discard(driver)
+            return
+        
+        try:
+            reset_driver(driver)
+        except Exception as e:
+            logger.warning(f"Gagal me-reset Chrome driver, diganti: {str(e)}")
+            self._discard(driver)
+            return
+        
+        with self._condition:
+            self._idle[headless].append(driver)
+            self._condition.notify()
+    
+    @contextmanager
+    def driver(self, headless: bool = BROWSER_HEADLESS_DEFAULT) -> Iterator["webdriver.Chrome"]:
+        """
+        Pinjam driver selama blok with, lalu kembalikan ke pool
+        """
+        driver = self.acquire(headless)
+        try:
+            yield driver
+        finally:
+            self.release(driver)
+    
+    def prewarm(self, count: int = 1, headless: bool = BROWSER_HEADLESS_DEFAULT) -> threading.Thread:
+        """
+        Luncurkan driver di thread latar belakang agar scraping pertama tidak menunggu Chrome
+        
+        Args:
+            count: Jumlah driver yang disiapkan (dibatasi ukuran pool)
+            headless: Mode headless driver
+            
+        Returns:
+            Thread yang sedang meluncurkan driver
+        """
+        def target():
+            drivers = []
+            try:
+                for _ in range(min(count, self.max_size)):
+                    with self._condition:
+                        if self._live >= self.max_size or len(self._idle[headless]) >= count:
+                            break
+                    drivers.append(self.acquire(headless, timeout=0))
+            except Exception as e:
+                logger.warning(f"Gagal menyiapkan Chrome driver: {str(e)}")
+            for driver in drivers:
+                self.release(driver)
+        
+        thread = threading.Thread(target=target, daemon=True, name="driver-pool-prewarm")
+        thread.start()
+        return thread
+    
+    def shutdown(self):
+        """
+        Tutup semua driver yang menganggur; driver yang sedang dipinjam ditutup saat dikembalikan
+        """
+        with self._condition:
+            self._closed = True
+            idle = self._idle[True] + self._idle[False]
+            self._idle = {True: [], False: []}
+        for driver in idle:
+            self._discard(driver)
+    
+    def describe(self) -> Dict[str, int]:
+        """
+        Ringkasan status pool untuk ditampilkan di UI
+        """
+        with self._condition:
+            idle = len(self._idle[True]) + len(self._idle[False])
+            return {"live": self._live, "idle": idle, "in_use": self._live - idle, "max_size": self.max_size}
+
+# Pool bersama, dibuat saat pertama kali digunakan
+_default_pool: Optional[DriverPool] = None
+_default_pool_lock = threading.Lock()
+
+def get_driver_pool() -> DriverPool:
+    """
+    Dapatkan pool Chrome driver bersama untuk seluruh proses
+    """
+    global _default_pool
+    with _default_pool_lock:
+        if _default_pool is None:
+            _default_pool = DriverPool()
+        return _default_pool
+
+# Prewarm hanya sekali per proses (Streamlit menjalankan ulang app.py setiap interaksi)
+_prewarmed = False
+_prewarmed_lock = threading.Lock()
+
+def prewarm_driver_pool(count: int = 1, headless: bool = BROWSER_HEADLESS_DEFAULT) -> bool:
+    """
+    Siapkan driver di pool bersama sekali per proses
+    
+    Args:
+        count: Jumlah driver yang disiapkan
+        headless: Mode headless driver
+        
+    Returns:
+        Boolean menandakan prewarm dimulai oleh panggilan ini
+    """
+    global _prewarmed
+    with _prewarmed_lock:
+        if _prewarmed:
+            return False
+        _prewarmed = True
+    get_driver_pool().prewarm(count, headless)
+    return True
+
+def shutdown_driver_pool():
+    """
+    Tutup pool driver bersama (dipanggil otomatis saat proses selesai)
+    """
+    global _default_pool
+    with _default_pool_lock:
+        pool, _default_pool = _default_pool, None
+    if pool is not None:
+        pool.shutdown()
+
+atexit.register(shutdown_driver_pool)
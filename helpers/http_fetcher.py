@@ -0,0 +1,408 @@
+"""
+Module untuk mengambil ulasan Tokopedia langsung lewat HTTP/GraphQL tanpa browser
+
+Halaman produk diambil sekali untuk nama, deskripsi, dan ID produk, lalu
+halaman-halaman ulasan diminta ke endpoint GraphQL `productReviewList` yang
+juga dipanggil oleh halaman produk itu sendiri. Halaman ulasan diambil paralel
+memakai satu session HTTP dengan connection pool. Jika cara ini gagal,
+scraper kembali memakai Selenium.
+"""
+
+import re
+import math
+import time
+import logging
+import threading
+from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+from urllib.parse import urlparse, urlunparse
+
+from helpers.config import (
+    MAX_REVIEWS_DEFAULT, EMPTY_REVIEW_PLACEHOLDER, TOKOPEDIA_GQL_URL, HTTP_FETCH_WORKERS,
+    HTTP_FETCH_TIMEOUT, HTTP_FETCH_RETRIES, HTTP_REVIEWS_PER_PAGE, HTTP_USER_AGENT, HTTP_BASE_URL_OVERRIDE
+)
+from helpers import dom_selectors as selectors
+from helpers.scraper import time_left
+
+# Setup logging
+logging.basicConfig(level=logging.INFO, 
+                   format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+logger = logging.getLogger("http_fetcher")
+
+# Query GraphQL yang sama dengan yang dikirim halaman produk (hanya field yang dipakai)
+PRODUCT_REVIEW_LIST_QUERY = """query productReviewList($productID: String!, $page: Int!, $limit: Int!, $sortBy: String, $filterBy: String) {
+  productrevGetProductReviewList(productID: $productID, page: $page, limit: $limit, sortBy: $sortBy, filterBy: $filterBy) {
+    productID
+    list {
+      id: feedbackID
+      message
+      productRating
+      user {
+        fullName
+      }
+    }
+    hasNext
+    totalReviews
+  }
+}"""
+
+# Pola ID produk di HTML halaman produk
+PRODUCT_ID_PATTERNS = [
+    re.compile(r'"productID"\s*:\s*"?(\d+)'),
+    re.compile(r'"product_id"\s*:\s*"?(\d+)'),
+    re.compile(r'tokopedia://product/(\d+)'),
+]
+
+# Status yang dicoba ulang dan jeda dasar backoff eksponensial (detik)
+RETRY_STATUS_CODES = (429, 500, 502, 503, 504)
+RETRY_BACKOFF_FACTOR = 0.5
+
+class HttpFetchError(Exception):
+    """
+    Ulasan tidak dapat diambil lewat HTTP (pemanggil sebaiknya memakai Selenium)
+    """
+
+_sessions: Dict[bool, Any] = {}
+_session_lock = threading.Lock()
+
+def get_http_session(retries: bool = True):
+    """
+    Dapatkan session HTTP bersama dengan connection pool dan retry
+    
+    Args:
+        retries: Percobaan ulang otomatis oleh urllib3 (False untuk request dengan
+            deadline, yang dicoba ulang oleh send_request)
+    
+    Returns:
+        Objek requests.Session
+    """
+    with _session_lock:
+        if retries not in _sessions:
+            import requests
+            from requests.adapters import HTTPAdapter
+            from urllib3.util.retry import Retry
+            
+            retry = Retry(
+                total=HTTP_FETCH_RETRIES if retries else 0,
+                backoff_factor=RETRY_BACKOFF_FACTOR,
+                status_forcelist=RETRY_STATUS_CODES,
+                allowed_methods=("GET", "POST"),
+                raise_on_status=False
+            )
+            adapter = HTTPAdapter(
+                pool_connections=HTTP_FETCH_WORKERS, pool_maxsize=HTTP_FETCH_WORKERS, max_retries=retry
+            )
+            session = requests.Session()
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+            session.headers.update({
+                "User-Agent": HTTP_USER_AGENT,
+                "Accept-Language": "id-ID,id;q=0.9"
+            })
+            _sessions[retries] = session
+        return _sessions[retries]
+
+def send_request(method: str, url: str, deadline: Optional[float] = None, **kwargs):
+    """
+    Kirim request lewat session bersama tanpa melewati deadline
+    
+    Tanpa deadline, retry ditangani urllib3 dengan HTTP_FETCH_TIMEOUT per percobaan.
+    Dengan deadline, setiap percobaan memakai min(HTTP_FETCH_TIMEOUT, sisa waktu)
+    dan percobaan ulang berhenti saat deadline lewat.
+    
+    Args:
+        method: Metode HTTP
+        url: URL tujuan
+        deadline: Batas akhir dalam detik time.monotonic() (opsional)
+        **kwargs: Argumen tambahan untuk requests.Session.request
+        
+    Returns:
+        Objek requests.Response
+        
+    Raises:
+        TimeoutError: Jika deadline lewat
+    """
+    if deadline is None:
+        return get_http_session().request(method, url, timeout=HTTP_FETCH_TIMEOUT, **kwargs)
+    
+    import requests
+    
+    session = get_http_session(retries=False)
+    for attempt in range(HTTP_FETCH_RETRIES + 1):
+        last_attempt = attempt == HTTP_FETCH_RETRIES
+        try:
+            response = session.request(method, url, timeout=time_left(deadline, HTTP_FETCH_TIMEOUT), **kwargs)
+            if response.status_code not in RETRY_STATUS_CODES or last_attempt:
+                return response
+        except (requests.exceptions.ConnectionError, requests.exceptions.Timeout):
+            # Timeout karena deadline habis dilaporkan sebagai TimeoutError, bukan kegagalan HTTP
+            time_left(deadline, 0)
+            if last_attempt:
+                raise
+        time.sleep(time_left(deadline, RETRY_BACKOFF_FACTOR * 2 ** attempt))
+
+# scheme://host pengganti untuk semua request backend HTTP (None = host asli Tokopedia)
+_base_url_override: Optional[str] = HTTP_BASE_URL_OVERRIDE
+
+@contextmanager
+def override_base_url(base_url: Optional[str]) -> Iterator[None]:
+    """
+    Arahkan request backend HTTP ke host lain selama blok with (misalnya server fixture)
+    
+    URL produk tetap URL Tokopedia asli sehingga tetap lolos validasi; hanya
+    scheme dan host request yang diganti.
+    
+    Args:
+        base_url: scheme://host[:port] pengganti, atau None untuk host asli
+    """
+    global _base_url_override
+    previous, _base_url_override = _base_url_override, base_url
+    try:
+        yield
+    finally:
+        _base_url_override = previous
+
+def rebase_url(url: str) -> str:
+    """
+    Ganti scheme dan host URL dengan base URL pengganti jika diatur
+    
+    Args:
+        url: URL Tokopedia
+        
+    Returns:
+        URL yang benar-benar diminta
+    """
+    if not _base_url_override:
+        return url
+    base = urlparse(_base_url_override)
+    return urlunparse(urlparse(url)._replace(scheme=base.scheme, netloc=base.netloc))
+
+def resolve_gql_url() -> str:
+    """
+    Tentukan endpoint GraphQL productReviewList (memperhitungkan base URL pengganti)
+    
+    Returns:
+        URL endpoint GraphQL productReviewList
+    """
+    return rebase_url(TOKOPEDIA_GQL_URL)
+
+def parse_product_page(html: str) -> Tuple[str, str, str]:
+    """
+    Ambil ID, nama, dan deskripsi produk dari HTML halaman produk
+    
+    Args:
+        html: HTML halaman produk
+        
+    Returns:
+        Tuple dari (ID produk, nama produk, deskripsi)
+    """
+    from bs4 import BeautifulSoup
+    
+    product_id = None
+    for pattern in PRODUCT_ID_PATTERNS:
+        match = pattern.search(html)
+        if match:
+            product_id = match.group(1)
+            break
+    if product_id is None:
+        raise HttpFetchError("ID produk tidak ditemukan di halaman produk")
+    
+    soup = BeautifulSoup(html, "html.parser")
+    product_name_elem = soup.select_one(selectors.PRODUCT_NAME)
+    product_name = product_name_elem.get_text(strip=True) if product_name_elem else "Produk Tidak Diketahui"
+    description_elem = soup.select_one(selectors.PRODUCT_DESCRIPTION)
+    description = description_elem.get_text(strip=True) if description_elem else "Deskripsi tidak ditemukan"
+    return product_id, product_name, description
+
+def fetch_review_page(
+    product_id: str,
+    page: int,
+    limit: int = HTTP_REVIEWS_PER_PAGE,
+    product_url: Optional[str] = None,
+    gql_url: str = TOKOPEDIA_GQL_URL,
+    deadline: Optional[float] = None
+) -> Dict[str, Any]:
+    """
+    Minta satu halaman ulasan ke endpoint GraphQL
+    
+    Args:
+        product_id: ID produk
+        page: Nomor halaman (mulai dari 1)
+        limit: Jumlah ulasan per halaman
+        product_url: URL produk untuk header Referer
+        gql_url: URL endpoint GraphQL
+        deadline: Batas akhir dalam detik time.monotonic() (opsional)
+        
+    Returns:
+        Objek productrevGetProductReviewList (list, hasNext, totalReviews)
+    """
+    import requests
+    
+    payload = [{
+        "operationName": "productReviewList",
+        "variables": {
+            "productID": product_id,
+            "page": page,
+            "limit": limit,
+            "sortBy": "create_time desc",
+            "filterBy": ""
+        },
+        "query": PRODUCT_REVIEW_LIST_QUERY
+    }]
+    headers = {"X-Source": "tokopedia-lite", "X-Tkpd-Lite-Service": "zeus"}
+    if product_url:
+        headers["Referer"] = product_url
+    
+    try:
+        response = send_request("POST", gql_url, deadline, json=payload, headers=headers)
+        response.raise_for_status()
+        body = response.json()
+    except (requests.exceptions.RequestException, ValueError) as e:
+        raise HttpFetchError(f"Gagal mengambil halaman ulasan {page}: {str(e)}") from e
+    
+    if isinstance(body, list):
+        body = body[0] if body else {}
+    result = (body.get("data") or {}).get("productrevGetProductReviewList")
+    if result is None:
+        raise HttpFetchError(f"Respons ulasan halaman {page} tidak dikenali: {body.get('errors')}")
+    return result
+
+def map_review(item: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Ubah item ulasan GraphQL menjadi format ulasan scraper
+    
+    Args:
+        item: Item dari daftar ulasan GraphQL
+        
+    Returns:
+        Dictionary {"Nama", "Rating", "Ulasan"}
+    """
+    message = (item.get("message") or "").strip()
+    try:
+        rating = int(item.get("productRating") or 0)
+    except (TypeError, ValueError):
+        rating = 0
+    return {
+        "Nama": ((item.get("user") or {}).get("fullName") or "Unknown").strip(),
+        "Rating": rating,
+        "Ulasan": message or EMPTY_REVIEW_PLACEHOLDER
+    }
+
+def iter_http_reviews(
+    product_url: str,
+    max_reviews: int = MAX_REVIEWS_DEFAULT,
+    status_callback = None,
+    max_workers: int = HTTP_FETCH_WORKERS,
+    gql_url: Optional[str] = None,
+    deadline: Optional[float] = None
+) -> Iterator[Dict[str, Any]]:
+    """
+    Ambil data produk dan ulasan lewat HTTP dengan event yang sama seperti iter_tokopedia_reviews
+    
+    Args:
+        product_url: URL produk Tokopedia
+        max_reviews: Jumlah maksimum ulasan yang akan diambil
+        status_callback: Callback function untuk melaporkan status (opsional)
+        max_workers: Jumlah halaman ulasan yang diminta paralel
+        gql_url: URL endpoint GraphQL (default dari resolve_gql_url)
+        deadline: Batas akhir pengambilan dalam detik time.monotonic() (opsional)
+        
+    Yields:
+        Dictionary event "product" lalu "reviews" per halaman
+        
+    Raises:
+        HttpFetchError: Jika halaman produk atau halaman ulasan pertama tidak dapat diambil
+            (kegagalan halaman berikutnya menghentikan pengambilan dengan hasil sebagian)
+        TimeoutError: Jika deadline lewat
+    """
+    import requests
+    
+    gql_url = gql_url or resolve_gql_url()
+    
+    def update_status(message):
+        logger.info(message)
+        if status_callback:
+            status_callback(f"<div class='scraping-container'>{message}</div>")
+    
+    update_status("⏳ Mengambil halaman produk lewat HTTP...")
+    try:
+        response = send_request("GET", rebase_url(product_url), deadline)
+        response.raise_for_status()
+    except requests.exceptions.RequestException as e:
+        raise HttpFetchError(f"Gagal mengambil halaman produk: {str(e)}") from e
+    
+    product_id, product_name, description = parse_product_page(response.text)
+    
+    # Halaman pertama menentukan total ulasan dan jumlah halaman yang perlu diambil.
+    # Diambil sebelum event produk dikirim agar kegagalan endpoint ulasan masih bisa
+    # ditangani pemanggil dengan beralih ke Selenium.
+    first_page = fetch_review_page(product_id, 1, product_url=product_url, gql_url=gql_url, deadline=deadline)
+    
+    update_status(f"✅ Produk terdeteksi: {product_name}")
+    yield {"type": "product", "product_name": product_name, "description": description}
+    
+    total_available = int(first_page.get("totalReviews") or 0)
+    if total_available:
+        max_reviews = min(max_reviews, total_available)
+        update_status(f"ℹ️ Menemukan {total_available} ulasan, akan mengambil hingga {max_reviews}")
+    
+    review_count = 0
+    collected_ids = set()
+    
+    def collect(page: int, result: Dict[str, Any]) -> List[Dict[str, Any]]:
+        nonlocal review_count
+        page_reviews = []
+        for item in result.get("list") or []:
+            if review_count >= max_reviews:
+                break
+            review_id = item.get("id") or (item.get("user") or {}).get("fullName", "") + (item.get("message") or "")
+            if review_id in collected_ids:
+                continue
+            collected_ids.add(review_id)
+            page_reviews.append(map_review(item))
+            review_count += 1
+        if status_callback and max_reviews:
+            status_callback(min(review_count / max_reviews, 1.0), is_progress=True)
+        return page_reviews
+    
+    page_reviews = collect(1, first_page)
+    if page_reviews:
+        yield {"type": "reviews", "page": 1, "reviews": page_reviews}
+    
+    page_count = math.ceil(max_reviews / HTTP_REVIEWS_PER_PAGE)
+    if review_count >= max_reviews or not first_page.get("hasNext") or page_count <= 1:
+        update_status(f"✅ Pengambilan selesai! Berhasil mengambil {review_count} ulasan")
+        return
+    
+    # Halaman berikutnya diminta paralel, hasil dikirim sesuai urutan halaman
+    update_status(f"⏳ Mengambil {page_count - 1} halaman ulasan lagi secara paralel...")
+    executor = ThreadPoolExecutor(max_workers=max(1, max_workers), thread_name_prefix="http-reviews")
+    futures = {
+        page: executor.submit(
+            fetch_review_page, product_id, page, HTTP_REVIEWS_PER_PAGE, product_url, gql_url, deadline
+        )
+        for page in range(2, page_count + 1)
+    }
+    try:
+        for page, future in futures.items():
+            # Tunggu halaman paling lama sampai deadline (None = tanpa batas)
+            wait_timeout = time_left(deadline, float("inf")) if deadline is not None else None
+            try:
+                result = future.result(timeout=wait_timeout)
+            except HttpFetchError as e:
+                # Sama seperti Selenium: berhenti di halaman yang gagal dan simpan ulasan yang sudah ada
+                logger.warning(f"Pengambilan dihentikan di halaman {page}: {str(e)}")
+                update_status(f"⚠️ Halaman ulasan {page} tidak dapat diambil, memakai {review_count} ulasan yang sudah ada")
+                break
+            page_reviews = collect(page, result)
+            if page_reviews:
+                yield {"type": "reviews", "page": page, "reviews": page_reviews}
+            if review_count >= max_reviews or not result.get("hasNext"):
+                break
+    finally:
+        # Jangan menunggu request yang masih berjalan (misalnya saat deadline lewat);
+        # request tersebut sudah dibatasi timeout-nya sendiri
+        executor.shutdown(wait=False, cancel_futures=True)
+    
+    update_status(f"✅ Pengambilan selesai! Berhasil mengambil {review_count} ulasan")
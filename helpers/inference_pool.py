@@ -0,0 +1,137 @@
+"""
+Module untuk inferensi sentimen paralel multi-proses pada kumpulan ulasan besar
+"""
+
+import os
+import atexit
+import logging
+import threading
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+from helpers.config import SENTIMENT_BATCH_SIZE, SENTIMENT_BACKEND, SENTIMENT_LABELS
+
+# Setup logging
+logging.basicConfig(level=logging.INFO, 
+                   format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+logger = logging.getLogger("inference_pool")
+
+# Pool bersama beserta konfigurasi yang dipakai untuk membuatnya
+_pool: Optional[ProcessPoolExecutor] = None
+_pool_config: Optional[Tuple[str, str, int]] = None
+_pool_lock = threading.Lock()
+
+def threads_per_worker(num_workers: int) -> int:
+    """
+    Hitung jumlah thread per worker agar total thread tidak melebihi jumlah core
+    
+    Args:
+        num_workers: Jumlah proses worker
+        
+    Returns:
+        Jumlah thread untuk setiap worker (minimal 1)
+    """
+    return max(1, (os.cpu_count() or 1) // max(1, num_workers))
+
+def _init_worker(model_path: Optional[str], backend: str, num_threads: int):
+    """
+    Inisialisasi proses worker: batasi thread lalu muat model sekali per worker
+    """
+    for variable in ("OMP_NUM_THREADS", "MKL_NUM_THREADS"):
+        os.environ[variable] = str(num_threads)
+    
+    from helpers import analyzer
+    analyzer.load_sentiment_model(model_path, backend=backend, num_threads=num_threads, use_server=False)
+
+def _predict_shard(texts: List[str], batch_size: int) -> np.ndarray:
+    """
+    Jalankan model untuk satu shard teks di dalam proses worker
+    """
+    from helpers import analyzer
+    return analyzer.predict_logits(texts, batch_size=batch_size)
+
+def get_inference_pool(
+    num_workers: int,
+    model_path: Optional[str] = None,
+    backend: str = SENTIMENT_BACKEND
+) -> ProcessPoolExecutor:
+    """
+    Dapatkan pool proses bersama, dibuat ulang jika konfigurasinya berubah
+    
+    Args:
+        num_workers: Jumlah proses worker
+        model_path: Path model yang dimuat setiap worker
+        backend: Backend inferensi ("torch" atau "onnx")
+        
+    Returns:
+        ProcessPoolExecutor yang worker-nya sudah memuat model
+    """
+    global _pool, _pool_config
+    config = (model_path, backend, num_workers)
+    
+    with _pool_lock:
+        if _pool is not None and _pool_config != config:
+            _pool.shutdown(wait=True)
+            _pool = None
+        
+        if _pool is None:
+            num_threads = threads_per_worker(num_workers)
+            logger.info(f"Menjalankan {num_workers} worker inferensi ({num_threads} thread per worker)")
+            _pool = ProcessPoolExecutor(
+                max_workers=num_workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_init_worker,
+                initargs=(model_path, backend, num_threads)
+            )
+            _pool_config = config
+        
+        return _pool
+
+def shutdown_inference_pool():
+    """
+    Hentikan pool proses bersama jika ada
+    """
+    global _pool, _pool_config
+    with _pool_lock:
+        if _pool is not None:
+            _pool.shutdown(wait=True)
+            _pool = None
+            _pool_config = None
+
+atexit.register(shutdown_inference_pool)
+
+def predict_logits_parallel(
+    texts: List[str],
+    num_workers: int,
+    model_path: Optional[str] = None,
+    backend: str = SENTIMENT_BACKEND,
+    batch_size: int = SENTIMENT_BATCH_SIZE
+) -> np.ndarray:
+    """
+    Bagi teks menjadi shard, jalankan di beberapa proses, dan gabungkan sesuai urutan input
+    
+    Args:
+        texts: List teks yang sudah diproses
+        num_workers: Jumlah proses worker
+        model_path: Path model yang dimuat setiap worker
+        backend: Backend inferensi ("torch" atau "onnx")
+        batch_size: Jumlah teks per forward pass di setiap worker
+        
+    Returns:
+        Array logits berukuran (jumlah teks, jumlah label)
+    """
+    if not texts:
+        return np.zeros((0, len(SENTIMENT_LABELS)), dtype=np.float32)
+    
+    pool = get_inference_pool(num_workers, model_path=model_path, backend=backend)
+    
+    # Beberapa shard per worker agar beban tetap seimbang jika panjang teks bervariasi
+    shard_count = min(len(texts), num_workers * 4)
+    shard_size = -(-len(texts) // shard_count)
+    shards = [texts[start:start + shard_size] for start in range(0, len(texts), shard_size)]
+    
+    futures = [pool.submit(_predict_shard, shard, batch_size) for shard in shards]
+    return np.concatenate([future.result() for future in futures], axis=0)
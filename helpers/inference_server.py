@@ -0,0 +1,364 @@
+"""
+Module untuk server inferensi sentimen lokal dengan dynamic micro-batching
+
+Server asyncio ini memegang satu salinan model dan menggabungkan request dari
+semua sesi Streamlit menjadi micro-batch. Protokolnya JSON per baris, lewat
+Unix socket ("unix:/path/ke/socket") atau TCP localhost ("127.0.0.1:8765").
+
+Contoh menjalankan server:
+    python -m helpers.inference_server --address unix:/tmp/quickshop-sentiment.sock
+"""
+
+import os
+import sys
+import json
+import socket
+import asyncio
+import logging
+import argparse
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from helpers.config import (
+    SENTIMENT_MODEL_PATH, SENTIMENT_BACKEND, SENTIMENT_BATCH_SIZE, SENTIMENT_LABELS,
+    INFERENCE_SERVER_MAX_BATCH_SIZE, INFERENCE_SERVER_MAX_WAIT_MS, INFERENCE_SERVER_TIMEOUT
+)
+
+# Setup logging
+logging.basicConfig(level=logging.INFO, 
+                   format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+logger = logging.getLogger("inference_server")
+
+# Batas ukuran satu baris request/response
+MAX_MESSAGE_BYTES = 64 * 1024 * 1024
+
+def parse_address(address: str) -> Tuple[str, Any]:
+    """
+    Uraikan alamat server menjadi jenis dan target
+    
+    Args:
+        address: "unix:/path/socket" atau "host:port"
+        
+    Returns:
+        Tuple ("unix", path) atau ("tcp", (host, port))
+    """
+    if address.startswith("unix:"):
+        return "unix", address[len("unix:"):]
+    host, _, port = address.rpartition(":")
+    return "tcp", (host or "127.0.0.1", int(port))
+
+class MicroBatcher:
+    """
+    Kumpulkan request dari banyak klien menjadi satu batch model
+    
+    Batch dijalankan ketika jumlah teks mencapai max_batch_size atau ketika
+    request tertua sudah menunggu max_wait_ms, mana yang lebih dulu.
+    """
+    
+    def __init__(self, loaded_model, max_batch_size: int, max_wait_ms: float, batch_size: int):
+        """
+        Args:
+            loaded_model: LoadedModel dari registry
+            max_batch_size: Jumlah teks maksimum per micro-batch
+            max_wait_ms: Waktu tunggu maksimum request pertama sebelum batch dijalankan
+            batch_size: Ukuran batch forward pass di dalam micro-batch
+        """
+        self.loaded_model = loaded_model
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000
+        self.batch_size = batch_size
+        self.queue: "asyncio.Queue[Tuple[List[str], asyncio.Future]]" = asyncio.Queue()
+        # Satu thread agar model hanya menjalankan satu batch pada satu waktu
+        self.executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="inference")
+        self.batches = 0
+        self.texts = 0
+    
+    async def predict(self, texts: List[str]) -> np.ndarray:
+        """
+        Masukkan teks ke antrian dan tunggu hasil micro-batch-nya
+        """
+        future = asyncio.get_running_loop().create_future()
+        await self.queue.put((texts, future))
+        return await future
+    
+    async def run(self):
+        """
+        Loop utama pengumpulan dan eksekusi micro-batch
+        """
+        from helpers.analyzer import predict_logits
+        
+        loop = asyncio.get_running_loop()
+        while True:
+            pending = [await self.queue.get()]
+            total = len(pending[0][0])
+            deadline = loop.time() + self.max_wait
+            
+            while total < self.max_batch_size:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    item = await asyncio.wait_for(self.queue.get(), timeout)
+                except asyncio.TimeoutError:
+                    break
+                pending.append(item)
+                total += len(item[0])
+            
+            texts = [text for request_texts, _ in pending for text in request_texts]
+            try:
+                logits = await loop.run_in_executor(
+                    self.executor, predict_logits, texts, self.batch_size, self.loaded_model
+                )
+            except Exception as e:
+                for _, future in pending:
+                    if not future.done():
+                        future.set_exception(e)
+                continue
+            
+            self.batches += 1
+            self.texts += len(texts)
+            offset = 0
+            for request_texts, future in pending:
+                if not future.done():
+                    future.set_result(logits[offset:offset + len(request_texts)])
+                offset += len(request_texts)
+
+async def _handle_client(reader, writer, batcher: MicroBatcher):
+    """
+    Layani satu koneksi klien: satu request JSON per baris, satu response per baris
+    """
+    try:
+        while True:
+            line = await reader.readline()
+            if not line:
+                break
+            try:
+                request = json.loads(line)
+                if request.get("op") == "info":
+                    response = {
+                        "model_id": batcher.loaded_model.model_id,
+                        "model_version": batcher.loaded_model.model_version,
+                        "batches": batcher.batches,
+                        "texts": batcher.texts,
+                    }
+                else:
+                    texts = [str(text) for text in request.get("texts", [])]
+                    logits = await batcher.predict(texts) if texts else np.zeros((0, len(SENTIMENT_LABELS)))
+                    response = {"logits": np.asarray(logits).tolist()}
+            except Exception as e:
+                logger.error(f"Error memproses request: {str(e)}")
+                response = {"error": str(e)}
+            writer.write((json.dumps(response) + "\n").encode("utf-8"))
+            await writer.drain()
+    except (ConnectionError, asyncio.IncompleteReadError):
+        pass
+    finally:
+        writer.close()
+
+async def serve(
+    address: str,
+    model_path: Optional[str] = SENTIMENT_MODEL_PATH,
+    backend: str = SENTIMENT_BACKEND,
+    max_batch_size: int = INFERENCE_SERVER_MAX_BATCH_SIZE,
+    max_wait_ms: float = INFERENCE_SERVER_MAX_WAIT_MS,
+    batch_size: int = SENTIMENT_BATCH_SIZE
+):
+    """
+    Jalankan server inferensi sampai dihentikan
+    
+    Args:
+        address: "unix:/path/socket" atau "host:port"
+        model_path: Path model yang dimuat server
+        backend: Backend inferensi ("torch" atau "onnx")
+        max_batch_size: Jumlah teks maksimum per micro-batch
+        max_wait_ms: Waktu tunggu maksimum sebelum micro-batch dijalankan
+        batch_size: Ukuran batch forward pass
+    """
+    from helpers.model_registry import registry
+    
+    loaded_model = registry.load(model_path, backend=backend)
+    batcher = MicroBatcher(loaded_model, max_batch_size, max_wait_ms, batch_size)
+    batch_task = asyncio.create_task(batcher.run())
+    
+    def handler(reader, writer):
+        return _handle_client(reader, writer, batcher)
+    
+    kind, target = parse_address(address)
+    if kind == "unix":
+        if os.path.exists(target):
+            os.unlink(target)
+        server = await asyncio.start_unix_server(handler, path=target, limit=MAX_MESSAGE_BYTES)
+    else:
+        host, port = target
+        server = await asyncio.start_server(handler, host=host, port=port, limit=MAX_MESSAGE_BYTES)
+    
+    logger.info(
+        f"Server inferensi berjalan di {address} "
+        f"(max batch {max_batch_size}, max wait {max_wait_ms} ms)"
+    )
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        batch_task.cancel()
+        if kind == "unix" and os.path.exists(target):
+            os.unlink(target)
+
+class InferenceClient:
+    """
+    Klien sinkron untuk server inferensi lokal
+    """
+    
+    def __init__(self, address: str, timeout: float = INFERENCE_SERVER_TIMEOUT):
+        """
+        Args:
+            address: "unix:/path/socket" atau "host:port"
+            timeout: Batas waktu koneksi dan response dalam detik
+        """
+        self.address = address
+        self.timeout = timeout
+        self._info: Optional[Dict[str, Any]] = None
+        self._local = threading.local()
+    
+    def _connect(self):
+        kind, target = parse_address(self.address)
+        family = socket.AF_UNIX if kind == "unix" else socket.AF_INET
+        sock = socket.socket(family, socket.SOCK_STREAM)
+        sock.settimeout(self.timeout)
+        sock.connect(target)
+        return sock, sock.makefile("rb")
+    
+    def _request(self, payload: Dict[str, Any]) -> Dict[str, Any]:
+        # Satu koneksi persisten per thread, dibuka ulang jika terputus.
+        # Percobaan ulang hanya jika request belum terkirim (koneksi ditolak atau
+        # koneksi lama sudah diputus); timeout saat membaca tidak diulang agar
+        # batch yang lambat tidak dihitung dua kali oleh server.
+        for attempt in range(2):
+            connection = getattr(self._local, "connection", None)
+            sent = False
+            try:
+                if connection is None:
+                    connection = self._connect()
+                    self._local.connection = connection
+                sock, reader = connection
+                sock.sendall((json.dumps(payload) + "\n").encode("utf-8"))
+                sent = True
+                line = reader.readline()
+                if not line:
+                    raise ConnectionError("Koneksi ditutup oleh server")
+                response = json.loads(line)
+                if "error" in response:
+                    raise RuntimeError(response["error"])
+                return response
+            except OSError as e:
+                self.close()
+                retryable = not sent and isinstance(e, ConnectionError)
+                if attempt or not retryable:
+                    raise
+        raise ConnectionError("Server inferensi tidak dapat dihubungi")
+    
+    def info(self, refresh: bool = False) -> Dict[str, Any]:
+        """
+        Identitas model di server (model_id dan model_version)
+        
+        Args:
+            refresh: Ambil ulang dari server walaupun sudah tersimpan
+            
+        Returns:
+            Dictionary informasi model dan statistik batch
+        """
+        if self._info is None or refresh:
+            self._info = self._request({"op": "info"})
+        return self._info
+    
+    def ping(self) -> bool:
+        """
+        Periksa apakah server dapat dihubungi
+        
+        Returns:
+            Boolean server tersedia atau tidak
+        """
+        try:
+            self.info(refresh=True)
+            return True
+        except Exception as e:
+            logger.warning(f"Server inferensi tidak tersedia di {self.address}: {str(e)}")
+            return False
+    
+    def predict_logits(self, texts: List[str]) -> np.ndarray:
+        """
+        Minta logits untuk sekumpulan teks dari server
+        
+        Args:
+            texts: List teks yang sudah diproses
+            
+        Returns:
+            Array logits berukuran (jumlah teks, jumlah label)
+        """
+        if not texts:
+            return np.zeros((0, len(SENTIMENT_LABELS)), dtype=np.float32)
+        response = self._request({"op": "predict", "texts": list(texts)})
+        return np.asarray(response["logits"], dtype=np.float32).reshape(-1, len(SENTIMENT_LABELS))
+    
+    def close(self):
+        """
+        Tutup koneksi milik thread saat ini
+        """
+        connection = getattr(self._local, "connection", None)
+        if connection is not None:
+            sock, reader = connection
+            try:
+                reader.close()
+                sock.close()
+            except OSError:
+                pass
+            self._local.connection = None
+
+# Klien bersama per alamat
+_clients: Dict[str, InferenceClient] = {}
+_clients_lock = threading.Lock()
+
+def get_inference_client(address: str) -> InferenceClient:
+    """
+    Dapatkan klien bersama untuk sebuah alamat server
+    
+    Args:
+        address: "unix:/path/socket" atau "host:port"
+        
+    Returns:
+        Objek InferenceClient
+    """
+    with _clients_lock:
+        if address not in _clients:
+            _clients[address] = InferenceClient(address)
+        return _clients[address]
+
+def main():
+    parser = argparse.ArgumentParser(description="Server inferensi sentimen QuickShop")
+    parser.add_argument("--address", default="unix:/tmp/quickshop-sentiment.sock",
+                        help="unix:/path/socket atau host:port")
+    parser.add_argument("--model", default=SENTIMENT_MODEL_PATH, help="Path model sentimen")
+    parser.add_argument("--backend", default=SENTIMENT_BACKEND, choices=["torch", "onnx"])
+    parser.add_argument("--max-batch-size", type=int, default=INFERENCE_SERVER_MAX_BATCH_SIZE)
+    parser.add_argument("--max-wait-ms", type=float, default=INFERENCE_SERVER_MAX_WAIT_MS)
+    parser.add_argument("--batch-size", type=int, default=SENTIMENT_BATCH_SIZE)
+    args = parser.parse_args()
+    
+    try:
+        asyncio.run(serve(
+            args.address,
+            model_path=args.model,
+            backend=args.backend,
+            max_batch_size=args.max_batch_size,
+            max_wait_ms=args.max_wait_ms,
+            batch_size=args.batch_size
+        ))
+    except KeyboardInterrupt:
+        logger.info("Server inferensi dihentikan")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
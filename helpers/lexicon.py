@@ -0,0 +1,177 @@
+"""
+Module untuk pencocokan leksikon kata positif/negatif dengan automaton Aho-Corasick
+"""
+
+import os
+import logging
+from collections import deque
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from helpers.config import (
+    POSITIVE_WORDS, NEGATIVE_WORDS, POSITIVE_WORDS_FILE, NEGATIVE_WORDS_FILE,
+    LEXICON_WORD_BOUNDARY
+)
+
+# Setup logging
+logging.basicConfig(level=logging.INFO, 
+                   format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+logger = logging.getLogger("lexicon")
+
+def load_lexicon_file(path: str) -> List[str]:
+    """
+    Memuat daftar kata leksikon dari file teks
+    
+    Args:
+        path: Path file, satu kata atau frasa per baris (baris '#' diabaikan)
+        
+    Returns:
+        List kata dalam huruf kecil
+    """
+    words = []
+    try:
+        with open(path, encoding='utf-8') as f:
+            for line in f:
+                word = line.strip().lower()
+                if word and not word.startswith('#'):
+                    words.append(word)
+        logger.info(f"Memuat {len(words)} kata leksikon dari {path}")
+    except OSError as e:
+        logger.error(f"Gagal memuat leksikon {path}: {str(e)}")
+    return words
+
+class LexiconMatcher:
+    """
+    Automaton Aho-Corasick untuk menghitung kata dari beberapa leksikon dalam satu pemindaian
+    
+    Setiap kata dihitung paling banyak sekali per teks, sama seperti pengecekan
+    `word in text` sebelumnya, sehingga jumlahnya adalah banyaknya kata leksikon
+    berbeda yang muncul.
+    """
+    
+    def __init__(self, lexicons: Dict[str, Iterable[str]], word_boundary: bool = False):
+        """
+        Args:
+            lexicons: Kamus nama leksikon ke daftar kata/frasa
+            word_boundary: Hanya cocokkan kata yang tidak diapit huruf/angka
+        """
+        self.categories = list(lexicons.keys())
+        self.word_boundary = word_boundary
+        
+        # Trie: transisi per node, dan output (id kata, kategori, panjang kata)
+        self._goto: List[Dict[str, int]] = [{}]
+        self._outputs: List[List[Tuple[int, int, int]]] = [[]]
+        self._fail: List[int] = [0]
+        self.term_count = 0
+        
+        for category_index, category in enumerate(self.categories):
+            seen = set()
+            for word in lexicons[category]:
+                word = str(word).strip().lower()
+                if not word or word in seen:
+                    continue
+                seen.add(word)
+                self._add_term(word, category_index)
+        
+        self._build_failure_links()
+    
+    def _add_term(self, word: str, category_index: int):
+        node = 0
+        for char in word:
+            next_node = self._goto[node].get(char)
+            if next_node is None:
+                next_node = len(self._goto)
+                self._goto[node][char] = next_node
+                self._goto.append({})
+                self._outputs.append([])
+                self._fail.append(0)
+            node = next_node
+        self._outputs[node].append((self.term_count, category_index, len(word)))
+        self.term_count += 1
+    
+    def _build_failure_links(self):
+        queue = deque(self._goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for char, child in self._goto[node].items():
+                queue.append(child)
+                fallback = self._fail[node]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                target = self._goto[fallback].get(char, 0)
+                self._fail[child] = target if target != child else 0
+                # Gabungkan output dari sufiks agar tidak perlu menelusuri rantai fail saat pencarian
+                self._outputs[child] = self._outputs[child] + self._outputs[self._fail[child]]
+    
+    def count(self, text: str) -> Dict[str, int]:
+        """
+        Hitung kata leksikon berbeda yang muncul di teks untuk setiap kategori
+        
+        Args:
+            text: Teks yang akan diperiksa
+            
+        Returns:
+            Kamus nama kategori ke jumlah kata yang cocok
+        """
+        counts = [0] * len(self.categories)
+        text = str(text).lower()
+        goto, fail, outputs = self._goto, self._fail, self._outputs
+        matched = set()
+        node = 0
+        
+        for position, char in enumerate(text):
+            while node and char not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(char, 0)
+            
+            for term_id, category_index, length in outputs[node]:
+                if term_id in matched:
+                    continue
+                if self.word_boundary and not self._at_word_boundary(text, position - length + 1, position + 1):
+                    continue
+                matched.add(term_id)
+                counts[category_index] += 1
+        
+        return dict(zip(self.categories, counts))
+    
+    @staticmethod
+    def _at_word_boundary(text: str, start: int, end: int) -> bool:
+        before_ok = start == 0 or not text[start - 1].isalnum()
+        after_ok = end >= len(text) or not text[end].isalnum()
+        return before_ok and after_ok
+
+# Matcher bersama untuk kata positif/negatif, dibuat saat pertama kali digunakan
+_sentiment_matcher: Optional[LexiconMatcher] = None
+
+def get_sentiment_matcher() -> LexiconMatcher:
+    """
+    Dapatkan matcher leksikon positif/negatif dari konfigurasi
+    
+    Returns:
+        LexiconMatcher dengan kategori 'positive' dan 'negative'
+    """
+    global _sentiment_matcher
+    if _sentiment_matcher is None:
+        positive_words = list(POSITIVE_WORDS)
+        negative_words = list(NEGATIVE_WORDS)
+        if POSITIVE_WORDS_FILE and os.path.exists(POSITIVE_WORDS_FILE):
+            positive_words.extend(load_lexicon_file(POSITIVE_WORDS_FILE))
+        if NEGATIVE_WORDS_FILE and os.path.exists(NEGATIVE_WORDS_FILE):
+            negative_words.extend(load_lexicon_file(NEGATIVE_WORDS_FILE))
+        _sentiment_matcher = LexiconMatcher(
+            {'positive': positive_words, 'negative': negative_words},
+            word_boundary=LEXICON_WORD_BOUNDARY
+        )
+    return _sentiment_matcher
+
+def count_sentiment_words(text: str) -> Tuple[int, int]:
+    """
+    Hitung jumlah kata positif dan negatif di dalam teks
+    
+    Args:
+        text: Teks ulasan yang sudah diproses
+        
+    Returns:
+        Tuple dari (jumlah kata positif, jumlah kata negatif)
+    """
+    counts = get_sentiment_matcher().count(text)
+    return counts['positive'], counts['negative']
@@ -0,0 +1,347 @@
+"""
+Module untuk pencatatan waktu per tahap pipeline (span/timer) dan ekspor metrik Prometheus
+
+Setiap span mencatat waktu wall, waktu CPU proses, serta memori resident di
+akhir span dan puncaknya selama span. Metrik dapat ditulis ke file teks format
+Prometheus atau disajikan lewat endpoint HTTP lokal.
+
+Batasan: waktu CPU dan memori diukur untuk seluruh proses (semua thread, tanpa
+proses anak), sehingga span yang berjalan bersamaan ikut terhitung. Puncak
+memori diambil dari sampling RSS berkala, jadi lonjakan yang lebih singkat dari
+METRICS_MEMORY_SAMPLE_INTERVAL bisa terlewat.
+"""
+
+import os
+import time
+import logging
+import threading
+from collections import deque
+from contextlib import contextmanager
+from functools import wraps
+from typing import Any, Callable, Deque, Dict, Iterator, List, Optional
+
+from helpers.config import (
+    METRICS_ENABLED, METRICS_EXPORT_PATH, METRICS_HTTP_PORT, METRICS_HISTOGRAM_BUCKETS,
+    METRICS_MEMORY_SAMPLE_INTERVAL
+)
+
+# Setup logging
+logging.basicConfig(level=logging.INFO, 
+                   format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+logger = logging.getLogger("metrics")
+
+class MemorySampler:
+    """
+    Sampling RSS proses di thread latar belakang selama ada span aktif
+    
+    VmHWM dan ru_maxrss hanya mencatat puncak sepanjang umur proses, sedangkan
+    mereset VmHWM (/proc/self/clear_refs) akan merusak span bersarang atau
+    paralel. Sampler ini mencatat puncak RSS per span secara terpisah.
+    """
+    
+    def __init__(self, interval: float = METRICS_MEMORY_SAMPLE_INTERVAL):
+        """
+        Args:
+            interval: Jeda antar sampling RSS (detik)
+        """
+        self.interval = interval
+        self._condition = threading.Condition()
+        self._peaks: Dict[int, float] = {}
+        self._next_token = 0
+        self._thread: Optional[threading.Thread] = None
+    
+    def start(self) -> int:
+        """
+        Mulai mencatat puncak RSS untuk satu span
+        
+        Returns:
+            Token untuk stop()
+        """
+        from helpers.model_registry import get_resident_memory_mb
+        
+        current = get_resident_memory_mb()
+        with self._condition:
+            token = self._next_token
+            self._next_token += 1
+            self._peaks[token] = current
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, daemon=True, name="metrics-memory-sampler")
+                self._thread.start()
+            self._condition.notify()
+        return token
+    
+    def stop(self, token: int) -> float:
+        """
+        Selesai mencatat satu span
+        
+        Args:
+            token: Token dari start()
+            
+        Returns:
+            Puncak RSS selama span dalam MB
+        """
+        from helpers.model_registry import get_resident_memory_mb
+        
+        current = get_resident_memory_mb()
+        with self._condition:
+            peak = self._peaks.pop(token, current)
+        return max(peak, current)
+    
+    def _run(self):
+        from helpers.model_registry import get_resident_memory_mb
+        
+        while True:
+            with self._condition:
+                while not self._peaks:
+                    self._condition.wait()
+            current = get_resident_memory_mb()
+            with self._condition:
+                for token, peak in self._peaks.items():
+                    if current > peak:
+                        self._peaks[token] = current
+            time.sleep(self.interval)
+
+class MetricsRegistry:
+    """
+    Kumpulan metrik per tahap: jumlah, total waktu, histogram waktu wall, dan memori
+    """
+    
+    def __init__(self, buckets: List[float] = METRICS_HISTOGRAM_BUCKETS, history: int = 100):
+        """
+        Args:
+            buckets: Batas atas bucket histogram waktu wall (detik)
+            history: Jumlah span terakhir yang disimpan untuk ditampilkan
+        """
+        self.buckets = sorted(buckets)
+        self._lock = threading.Lock()
+        self._stages: Dict[str, Dict[str, Any]] = {}
+        self._recent: Deque[Dict[str, Any]] = deque(maxlen=history)
+    
+    def record(self, stage: str, wall_seconds: float, cpu_seconds: float, memory_mb: float,
+               peak_memory_mb: float, error: bool = False):
+        """
+        Catat hasil satu span
+        
+        Args:
+            stage: Nama tahap
+            wall_seconds: Waktu wall
+            cpu_seconds: Waktu CPU proses selama span
+            memory_mb: Memori resident di akhir span
+            peak_memory_mb: Puncak memori resident proses selama span
+            error: Span berakhir dengan exception
+        """
+        with self._lock:
+            data = self._stages.setdefault(stage, {
+                "count": 0, "errors": 0, "wall_seconds": 0.0, "cpu_seconds": 0.0,
+                "bucket_counts": [0] * len(self.buckets), "memory_mb": 0.0, "peak_memory_mb": 0.0
+            })
+            data["count"] += 1
+            data["errors"] += int(error)
+            data["wall_seconds"] += wall_seconds
+            data["cpu_seconds"] += cpu_seconds
+            data["memory_mb"] = memory_mb
+            data["peak_memory_mb"] = max(data["peak_memory_mb"], peak_memory_mb)
+            for index, bound in enumerate(self.buckets):
+                if wall_seconds <= bound:
+                    data["bucket_counts"][index] += 1
+            
+            self._recent.append({
+                "stage": stage,
+                "wall_seconds": round(wall_seconds, 4),
+                "cpu_seconds": round(cpu_seconds, 4),
+                "memory_mb": round(memory_mb, 1),
+                "peak_memory_mb": round(peak_memory_mb, 1),
+                "error": error,
+                "finished_at": time.time()
+            })
+    
+    def recent_spans(self, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """
+        Span terakhir, dari yang paling lama ke yang terbaru
+        """
+        with self._lock:
+            spans = list(self._recent)
+        return spans[-limit:] if limit else spans
+    
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Salinan metrik per tahap
+        """
+        with self._lock:
+            return {stage: dict(data, bucket_counts=list(data["bucket_counts"]))
+                    for stage, data in self._stages.items()}
+    
+    def export_prometheus(self, prefix: str = "quickshop") -> str:
+        """
+        Format metrik sebagai teks eksposisi Prometheus
+        
+        Args:
+            prefix: Prefix nama metrik
+            
+        Returns:
+            Teks metrik Prometheus
+        """
+        stages = self.snapshot()
+        lines = [
+            f"# HELP {prefix}_stage_duration_seconds Waktu wall per tahap pipeline",
+            f"# TYPE {prefix}_stage_duration_seconds histogram",
+        ]
+        for stage, data in sorted(stages.items()):
+            for bound, count in zip(self.buckets, data["bucket_counts"]):
+                lines.append(f'{prefix}_stage_duration_seconds_bucket{{stage="{stage}",le="{bound}"}} {count}')
+            lines.append(f'{prefix}_stage_duration_seconds_bucket{{stage="{stage}",le="+Inf"}} {data["count"]}')
+            lines.append(f'{prefix}_stage_duration_seconds_sum{{stage="{stage}"}} {data["wall_seconds"]:.6f}')
+            lines.append(f'{prefix}_stage_duration_seconds_count{{stage="{stage}"}} {data["count"]}')
+        
+        counters = [
+            ("stage_cpu_seconds_total", "cpu_seconds",
+             "Waktu CPU proses per tahap pipeline (semua thread, tanpa proses anak; termasuk span paralel)",
+             "counter"),
+            ("stage_errors_total", "errors", "Jumlah span yang gagal per tahap", "counter"),
+            ("stage_memory_mb", "memory_mb", "Memori resident proses di akhir span terakhir", "gauge"),
+            ("stage_peak_memory_mb", "peak_memory_mb",
+             f"Puncak RSS proses selama span tahap ini (sampling tiap {METRICS_MEMORY_SAMPLE_INTERVAL}s; "
+             "termasuk span paralel)",
+             "gauge"),
+        ]
+        for name, key, help_text, metric_type in counters:
+            lines.append(f"# HELP {prefix}_{name} {help_text}")
+            lines.append(f"# TYPE {prefix}_{name} {metric_type}")
+            for stage, data in sorted(stages.items()):
+                lines.append(f'{prefix}_{name}{{stage="{stage}"}} {data[key]:.6g}')
+        
+        return "\n".join(lines) + "\n"
+    
+    def write_prometheus(self, path: str = METRICS_EXPORT_PATH) -> bool:
+        """
+        Tulis metrik ke file teks Prometheus (misalnya untuk textfile collector node_exporter)
+        
+        Args:
+            path: Lokasi file
+            
+        Returns:
+            Boolean menandakan sukses atau gagal
+        """
+        try:
+            directory = os.path.dirname(path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            # Tulis ke file sementara lalu ganti agar pembaca tidak melihat file setengah jadi
+            temp_path = f"{path}.tmp"
+            with open(temp_path, "w", encoding="utf-8") as f:
+                f.write(self.export_prometheus())
+            os.replace(temp_path, path)
+            return True
+        except OSError as e:
+            logger.error(f"Gagal menulis metrik: {str(e)}")
+            return False
+    
+    def reset(self):
+        """
+        Hapus semua metrik
+        """
+        with self._lock:
+            self._stages.clear()
+            self._recent.clear()
+
+# Registry metrik dan sampler memori bersama untuk seluruh proses
+metrics = MetricsRegistry()
+memory_sampler = MemorySampler()
+
+@contextmanager
+def span(stage: str) -> Iterator[None]:
+    """
+    Ukur satu tahap pipeline
+    
+    Contoh:
+        with span("sentiment"):
+            analyze_sentiment(reviews)
+    
+    Args:
+        stage: Nama tahap
+    """
+    if not METRICS_ENABLED:
+        yield
+        return
+    
+    from helpers.model_registry import get_resident_memory_mb
+    
+    memory_token = memory_sampler.start()
+    wall_start = time.perf_counter()
+    cpu_start = time.process_time()
+    error = False
+    try:
+        yield
+    except BaseException:
+        error = True
+        raise
+    finally:
+        metrics.record(
+            stage,
+            time.perf_counter() - wall_start,
+            time.process_time() - cpu_start,
+            get_resident_memory_mb(),
+            memory_sampler.stop(memory_token),
+            error=error
+        )
+
+def timed(stage: str) -> Callable:
+    """
+    Decorator untuk mengukur setiap pemanggilan fungsi sebagai satu span
+    
+    Args:
+        stage: Nama tahap
+    """
+    def decorator(func: Callable) -> Callable:
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            with span(stage):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+_http_server = None
+_http_server_lock = threading.Lock()
+
+def start_metrics_server(port: Optional[int] = METRICS_HTTP_PORT) -> bool:
+    """
+    Sajikan metrik Prometheus di http://127.0.0.1:<port>/metrics (sekali per proses)
+    
+    Args:
+        port: Port HTTP (None untuk menonaktifkan)
+        
+    Returns:
+        Boolean menandakan server berjalan
+    """
+    global _http_server
+    if port is None:
+        return False
+    
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+    
+    class MetricsHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path.rstrip("/") != "/metrics":
+                self.send_error(404)
+                return
+            body = metrics.export_prometheus().encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+        
+        def log_message(self, format, *args):
+            pass
+    
+    with _http_server_lock:
+        if _http_server is not None:
+            return True
+        try:
+            _http_server = ThreadingHTTPServer(("127.0.0.1", port), MetricsHandler)
+        except OSError as e:
+            logger.error(f"Gagal menjalankan server metrik di port {port}: {str(e)}")
+            return False
+        threading.Thread(target=_http_server.serve_forever, daemon=True, name="metrics-http").start()
+        logger.info(f"Metrik Prometheus tersedia di http://127.0.0.1:{port}/metrics")
+        return True
@@ -0,0 +1,312 @@
+"""
+Module untuk registry model sentimen bersama yang thread-safe untuk semua sesi Streamlit
+"""
+
+import os
+import time
+import logging
+import threading
+from typing import Any, Dict, List, Optional
+
+from helpers.config import (
+    SENTIMENT_LABELS, SENTIMENT_BACKEND, ONNX_QUANTIZE, DEFAULT_SENTIMENT_MODEL,
+    MODEL_WARMUP_TEXT
+)
+from helpers.sentiment_cache import get_model_version
+
+# Setup logging
+logging.basicConfig(level=logging.INFO, 
+                   format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+logger = logging.getLogger("model_registry")
+
+def get_resident_memory_mb() -> float:
+    """
+    Ukur memori resident (RSS) proses saat ini
+    
+    Returns:
+        RSS dalam MB, atau 0 jika tidak dapat diukur
+    """
+    try:
+        with open("/proc/self/statm") as f:
+            resident_pages = int(f.read().split()[1])
+        return resident_pages * os.sysconf("SC_PAGE_SIZE") / (1024 * 1024)
+    except (OSError, ValueError, IndexError, AttributeError):
+        pass
+    
+    try:
+        import resource
+        import sys
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # macOS melaporkan byte, Linux melaporkan KB
+        return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+    except (ImportError, OSError):
+        return 0.0
+
+class LoadedModel:
+    """
+    Tokenizer dan model yang sudah dimuat beserta metadatanya
+    """
+    
+    def __init__(self, name: str, model_path: Optional[str], backend: str, tokenizer: Any, model: Any):
+        """
+        Args:
+            name: Nama model di registry
+            model_path: Path model lokal (None untuk model default Hugging Face)
+            backend: Backend yang benar-benar dipakai ("torch" atau "onnx")
+            tokenizer: Tokenizer Hugging Face
+            model: Model PyTorch atau OnnxSentimentModel
+        """
+        self.name = name
+        self.model_path = model_path
+        self.backend = backend
+        self.tokenizer = tokenizer
+        self.model = model
+        
+        source = model_path or DEFAULT_SENTIMENT_MODEL
+        self.model_id = f"{source}:{backend}"
+        if backend == "onnx" and ONNX_QUANTIZE:
+            self.model_id += ":int8"
+        self.model_version = get_model_version(source)
+        
+        self.load_seconds = 0.0
+        self.warmup_seconds = 0.0
+        self.memory_mb = 0.0
+    
+    def describe(self) -> Dict[str, Any]:
+        """
+        Ringkasan metadata model untuk ditampilkan atau dicatat
+        
+        Returns:
+            Dictionary berisi nama, backend, waktu muat, dan memori
+        """
+        return {
+            "name": self.name,
+            "model_id": self.model_id,
+            "backend": self.backend,
+            "load_seconds": round(self.load_seconds, 3),
+            "warmup_seconds": round(self.warmup_seconds, 3),
+            "memory_mb": round(self.memory_mb, 1),
+        }
+
+def _load_model(
+    name: str,
+    model_path: Optional[str],
+    backend: str,
+    num_threads: Optional[int]
+) -> LoadedModel:
+    """
+    Muat tokenizer dan model dengan backend yang diminta
+    """
+    # Import berat ditunda sampai model benar-benar dimuat
+    import torch
+    from transformers import AutoTokenizer, AutoModelForSequenceClassification
+    
+    # Opsi 1: Jika path model disediakan, gunakan model lokal
+    if model_path:
+        logger.info(f"Loading local model from {model_path}")
+        source = model_path
+        
+    # Opsi 2: Gunakan model IndoBERT dari Hugging Face
+    else:
+        logger.info("Loading IndoBERT from Hugging Face")
+        source = DEFAULT_SENTIMENT_MODEL
+    
+    tokenizer = AutoTokenizer.from_pretrained(source)
+    model = None
+    
+    if backend == "onnx":
+        try:
+            from helpers.onnx_backend import load_onnx_model
+            if num_threads:
+                model = load_onnx_model(source, num_threads=num_threads)
+            else:
+                model = load_onnx_model(source)
+        except Exception as e:
+            logger.warning(f"ONNX backend tidak tersedia, menggunakan PyTorch: {str(e)}")
+            backend = "torch"
+    
+    if backend != "onnx":
+        if num_threads:
+            torch.set_num_threads(num_threads)
+        model = AutoModelForSequenceClassification.from_pretrained(
+            source, num_labels=len(SENTIMENT_LABELS)
+        )
+        model.eval()
+    
+    return LoadedModel(name, model_path, backend, tokenizer, model)
+
+def warm_up_model(loaded: LoadedModel) -> float:
+    """
+    Jalankan satu forward pass agar alokasi memori dan inisialisasi kernel tidak terjadi di request pertama
+    
+    Args:
+        loaded: Model yang sudah dimuat
+        
+    Returns:
+        Durasi warm-up dalam detik
+    """
+    start = time.perf_counter()
+    if loaded.backend == "onnx":
+        loaded.model.predict(loaded.tokenizer([MODEL_WARMUP_TEXT], return_tensors="np"))
+    else:
+        import torch
+        with torch.no_grad():
+            loaded.model(**loaded.tokenizer([MODEL_WARMUP_TEXT], return_tensors="pt"))
+    return time.perf_counter() - start
+
+class ModelRegistry:
+    """
+    Registry proses-wide yang memuat setiap model tepat sekali di balik lock
+    """
+    
+    def __init__(self):
+        self._models: Dict[str, LoadedModel] = {}
+        self._lock = threading.Lock()
+        self._name_locks: Dict[str, threading.Lock] = {}
+        self._background: Dict[str, threading.Thread] = {}
+    
+    @staticmethod
+    def make_name(model_path: Optional[str], backend: str) -> str:
+        """
+        Nama default sebuah model di registry
+        
+        Args:
+            model_path: Path model (None untuk model default)
+            backend: Backend inferensi
+            
+        Returns:
+            String nama model
+        """
+        return f"{model_path or DEFAULT_SENTIMENT_MODEL}:{backend}"
+    
+    def get(self, name: str) -> Optional[LoadedModel]:
+        """
+        Ambil model yang sudah dimuat tanpa memuatnya
+        
+        Args:
+            name: Nama model di registry
+            
+        Returns:
+            LoadedModel, atau None jika belum dimuat
+        """
+        with self._lock:
+            return self._models.get(name)
+    
+    def load(
+        self,
+        model_path: Optional[str] = None,
+        backend: str = SENTIMENT_BACKEND,
+        name: Optional[str] = None,
+        num_threads: Optional[int] = None,
+        warmup: bool = True
+    ) -> LoadedModel:
+        """
+        Muat model sekali per proses; pemanggil lain menunggu pemuatan yang sedang berjalan
+        
+        Args:
+            model_path: Path model lokal (None untuk model default Hugging Face)
+            backend: Backend inferensi ("torch" atau "onnx")
+            name: Nama model di registry (default dari path dan backend)
+            num_threads: Batas thread inferensi (opsional)
+            warmup: Jalankan forward pass warm-up setelah model dimuat
+            
+        Returns:
+            LoadedModel yang siap dipakai
+        """
+        name = name or self.make_name(model_path, backend)
+        
+        with self._lock:
+            if name in self._models:
+                return self._models[name]
+            name_lock = self._name_locks.setdefault(name, threading.Lock())
+        
+        # Lock per nama agar model lain tetap bisa dimuat bersamaan
+        with name_lock:
+            with self._lock:
+                if name in self._models:
+                    return self._models[name]
+            
+            logger.info(f"Loading sentiment model '{name}'...")
+            memory_before = get_resident_memory_mb()
+            start = time.perf_counter()
+            loaded = _load_model(name, model_path, backend, num_threads)
+            loaded.load_seconds = time.perf_counter() - start
+            
+            if warmup:
+                try:
+                    loaded.warmup_seconds = warm_up_model(loaded)
+                except Exception as e:
+                    logger.warning(f"Warm-up model '{name}' gagal: {str(e)}")
+            
+            loaded.memory_mb = max(0.0, get_resident_memory_mb() - memory_before)
+            logger.info(
+                f"Model '{name}' siap ({loaded.backend}): muat {loaded.load_seconds:.2f}s, "
+                f"warm-up {loaded.warmup_seconds:.2f}s, +{loaded.memory_mb:.0f} MB RSS"
+            )
+            
+            with self._lock:
+                self._models[name] = loaded
+            return loaded
+    
+    def load_in_background(
+        self,
+        model_path: Optional[str] = None,
+        backend: str = SENTIMENT_BACKEND,
+        name: Optional[str] = None
+    ) -> Optional[threading.Thread]:
+        """
+        Mulai memuat dan warm-up model di thread latar belakang
+        
+        Aman dipanggil berulang kali (misalnya di setiap rerun Streamlit): tidak ada
+        thread baru jika model sudah dimuat atau sedang dimuat.
+        
+        Args:
+            model_path: Path model lokal
+            backend: Backend inferensi
+            name: Nama model di registry
+            
+        Returns:
+            Thread yang sedang memuat model, atau None jika model sudah siap
+        """
+        name = name or self.make_name(model_path, backend)
+        
+        def target():
+            try:
+                self.load(model_path, backend=backend, name=name)
+            except Exception as e:
+                logger.error(f"Error loading sentiment model: {str(e)}")
+        
+        with self._lock:
+            if name in self._models:
+                return None
+            thread = self._background.get(name)
+            if thread is not None and thread.is_alive():
+                return thread
+            thread = threading.Thread(target=target, name=f"model-warmup-{name}", daemon=True)
+            self._background[name] = thread
+        
+        thread.start()
+        return thread
+    
+    def unload(self, name: str):
+        """
+        Hapus model dari registry
+        
+        Args:
+            name: Nama model di registry
+        """
+        with self._lock:
+            self._models.pop(name, None)
+    
+    def describe(self) -> List[Dict[str, Any]]:
+        """
+        Metadata semua model yang sudah dimuat
+        
+        Returns:
+            List dictionary metadata model
+        """
+        with self._lock:
+            return [loaded.describe() for loaded in self._models.values()]
+
+# Registry bersama untuk seluruh proses
+registry = ModelRegistry()
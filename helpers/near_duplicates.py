@@ -0,0 +1,169 @@
+"""
+Module untuk mendeteksi ulasan yang hampir identik dengan MinHash dan LSH banding
+
+Ulasan yang hanya berbeda emoji, huruf berulang, atau satu-dua kata diberi
+ID cluster yang sama. Perbandingan hanya dilakukan di dalam bucket LSH
+sehingga biayanya tidak kuadratik terhadap jumlah ulasan.
+"""
+
+import zlib
+import logging
+from collections import defaultdict
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+
+from helpers.config import (
+    NEAR_DUPLICATE_THRESHOLD, MINHASH_NUM_PERM, MINHASH_SHINGLE_SIZE, LSH_BANDS
+)
+
+# Setup logging
+logging.basicConfig(level=logging.INFO, 
+                   format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+logger = logging.getLogger("near_duplicates")
+
+# Bilangan prima Mersenne 2^31 - 1 agar a * x + b tetap muat di uint64
+MERSENNE_PRIME = (1 << 31) - 1
+
+def shingle_hashes(text: str, size: int = MINHASH_SHINGLE_SIZE) -> np.ndarray:
+    """
+    Hash 32-bit dari himpunan shingle karakter sebuah teks
+    
+    Args:
+        text: Teks yang sudah diproses
+        size: Panjang shingle karakter
+        
+    Returns:
+        Array uint64 berisi hash shingle unik
+    """
+    text = " ".join(text.split())
+    if len(text) <= size:
+        shingles = {text}
+    else:
+        shingles = {text[i:i + size] for i in range(len(text) - size + 1)}
+    return np.fromiter(
+        (zlib.crc32(shingle.encode("utf-8")) & MERSENNE_PRIME for shingle in shingles),
+        dtype=np.uint64, count=len(shingles)
+    )
+
+class MinHasher:
+    """
+    Pembuat signature MinHash dengan keluarga hash universal (a * x + b) mod p
+    """
+    
+    def __init__(self, num_perm: int = MINHASH_NUM_PERM, seed: int = 1):
+        rng = np.random.default_rng(seed)
+        self.num_perm = num_perm
+        self.a = rng.integers(1, MERSENNE_PRIME, size=num_perm, dtype=np.uint64)
+        self.b = rng.integers(0, MERSENNE_PRIME, size=num_perm, dtype=np.uint64)
+        
+    def signature(self, hashes: np.ndarray) -> np.ndarray:
+        """
+        Hitung signature MinHash dari hash shingle
+        
+        Args:
+            hashes: Array hash shingle
+            
+        Returns:
+            Array uint64 berukuran num_perm
+        """
+        permuted = (np.outer(self.a, hashes) + self.b[:, None]) % MERSENNE_PRIME
+        return permuted.min(axis=1)
+
+def estimate_similarity(first: np.ndarray, second: np.ndarray) -> float:
+    """
+    Perkiraan kemiripan Jaccard dari dua signature MinHash
+    """
+    return float(np.mean(first == second))
+
+class _UnionFind:
+    def __init__(self, size: int):
+        self.parent = list(range(size))
+        
+    def find(self, item: int) -> int:
+        while self.parent[item] != item:
+            self.parent[item] = self.parent[self.parent[item]]
+            item = self.parent[item]
+        return item
+    
+    def union(self, first: int, second: int):
+        first_root, second_root = self.find(first), self.find(second)
+        if first_root != second_root:
+            self.parent[max(first_root, second_root)] = min(first_root, second_root)
+
+def cluster_near_duplicates(
+    texts: Sequence[str],
+    threshold: float = NEAR_DUPLICATE_THRESHOLD,
+    num_perm: int = MINHASH_NUM_PERM,
+    bands: int = LSH_BANDS
+) -> List[int]:
+    """
+    Kelompokkan teks yang hampir identik dan beri ID cluster untuk setiap teks
+    
+    Teks identik langsung digabung; teks unik dibandingkan hanya dengan
+    perwakilan cluster yang berbagi bucket LSH dengannya.
+    
+    Args:
+        texts: Teks hasil preprocess_text
+        threshold: Kemiripan Jaccard minimum agar dua teks dianggap duplikat
+        num_perm: Jumlah fungsi hash MinHash
+        bands: Jumlah band LSH (num_perm harus habis dibagi bands)
+        
+    Returns:
+        List ID cluster (0, 1, 2, ... sesuai urutan kemunculan pertama)
+    """
+    if num_perm % bands:
+        raise ValueError(f"num_perm ({num_perm}) harus habis dibagi bands ({bands})")
+    rows = num_perm // bands
+    
+    # Teks identik cukup diproses sekali
+    unique_index: Dict[str, int] = {}
+    inverse = [unique_index.setdefault(text, len(unique_index)) for text in texts]
+    unique_texts = list(unique_index)
+    
+    hasher = MinHasher(num_perm)
+    signatures = np.stack([hasher.signature(shingle_hashes(text)) for text in unique_texts]) \
+        if unique_texts else np.empty((0, num_perm), dtype=np.uint64)
+    
+    union_find = _UnionFind(len(unique_texts))
+    for band in range(bands):
+        buckets: Dict[bytes, List[int]] = defaultdict(list)
+        band_signatures = signatures[:, band * rows:(band + 1) * rows]
+        for index in range(len(unique_texts)):
+            buckets[band_signatures[index].tobytes()].append(index)
+        
+        for members in buckets.values():
+            # Bandingkan dengan perwakilan bucket saja, bukan semua pasangan anggota
+            if len(members) < 2:
+                continue
+            leaders = [members[0]]
+            for index in members[1:]:
+                similarities = (signatures[leaders] == signatures[index]).mean(axis=1)
+                matches = np.flatnonzero(similarities >= threshold)
+                if len(matches):
+                    union_find.union(index, leaders[matches[0]])
+                else:
+                    leaders.append(index)
+    
+    cluster_ids: Dict[int, int] = {}
+    unique_clusters = [
+        cluster_ids.setdefault(union_find.find(index), len(cluster_ids))
+        for index in range(len(unique_texts))
+    ]
+    logger.info(f"{len(texts)} ulasan dikelompokkan menjadi {len(cluster_ids)} cluster")
+    return [unique_clusters[index] for index in inverse]
+
+def cluster_representatives(cluster_ids: Sequence[int]) -> List[int]:
+    """
+    Indeks anggota pertama dari setiap cluster, berurutan sesuai ID cluster
+    
+    Args:
+        cluster_ids: Hasil cluster_near_duplicates
+        
+    Returns:
+        List indeks perwakilan cluster
+    """
+    representatives: Dict[int, int] = {}
+    for index, cluster_id in enumerate(cluster_ids):
+        representatives.setdefault(cluster_id, index)
+    return [representatives[cluster_id] for cluster_id in sorted(representatives)]
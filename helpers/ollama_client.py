@@ -9,6 +9,7 @@ import requests
 import json
 
 from helpers.config import OLLAMA_HOST, OLLAMA_MODEL, CHATBOT_TEMPLATE
+from helpers.metrics import timed
 
 # Setup logging
 logging.basicConfig(level=logging.INFO, 
@@ -72,6 +73,7 @@ def pull_model(model_name: str = OLLAMA_MODEL) -> bool:
         logger.error(f"Gagal mengunduh model: {str(e)}")
         return False
 
+@timed("ollama_conclusion")
 def generate_conclusion(
     description: str, 
     sentiment_summary: str,
@@ -126,6 +128,7 @@ def generate_conclusion(
         logger.error(f"Error saat generate kesimpulan: {str(e)}")
         return "Tidak dapat menghasilkan kesimpulan karena error sistem."
 
+@timed("ollama_chat")
 def get_chat_response(
     user_question: str,
     product_data: Dict[str, Any],
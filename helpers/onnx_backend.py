@@ -0,0 +1,256 @@
+"""
+Module untuk backend ONNX Runtime (opsional int8) dari model sentimen IndoBERT
+"""
+
+import os
+import sys
+import glob
+import json
+import logging
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+from helpers.config import ONNX_MODEL_DIR, ONNX_QUANTIZE, ONNX_INTRA_OP_THREADS, SENTIMENT_LABELS
+from helpers.sentiment_cache import get_model_version
+
+# Setup logging
+logging.basicConfig(level=logging.INFO, 
+                   format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+logger = logging.getLogger("onnx_backend")
+
+ONNX_INPUT_NAMES = ["input_ids", "attention_mask", "token_type_ids"]
+
+# Contoh ulasan untuk pemeriksaan kesetaraan backend
+PARITY_SAMPLE_TEXTS = [
+    "barang bagus banget sesuai deskripsi pengiriman cepat",
+    "kualitas jelek barang rusak kecewa",
+    "lumayan sesuai harga",
+    "mantap original recommended seller",
+    "pengiriman lambat packing kurang rapi",
+    "oke",
+    "tidak sesuai gambar warna beda tidak worth it",
+    "terima kasih barang sampai aman puas",
+]
+
+def get_onnx_path(model_path: str, quantize: bool = ONNX_QUANTIZE) -> str:
+    """
+    Tentukan lokasi file ONNX untuk sebuah model
+    
+    Untuk model lokal, nama file memuat versi model (get_model_version) sehingga
+    model yang dilatih ulang di direktori yang sama diekspor ulang.
+    
+    Args:
+        model_path: Path atau nama model Hugging Face
+        quantize: Gunakan versi int8 yang sudah dikuantisasi
+        
+    Returns:
+        Path file .onnx
+    """
+    model_name = os.path.basename(os.path.normpath(model_path)).replace('/', '_')
+    version = get_model_version(model_path)
+    stem = "model" if version == model_path else f"model.{version}"
+    filename = f"{stem}.int8.onnx" if quantize else f"{stem}.onnx"
+    return os.path.join(ONNX_MODEL_DIR, model_name, filename)
+
+def remove_stale_exports(model_path: str, keep: List[str]):
+    """
+    Hapus file ONNX dari versi model sebelumnya
+    
+    Args:
+        model_path: Path atau nama model Hugging Face
+        keep: Path file .onnx yang masih dipakai
+    """
+    directory = os.path.dirname(get_onnx_path(model_path, quantize=False))
+    keep = {os.path.abspath(path) for path in keep}
+    for path in glob.glob(os.path.join(directory, "model*.onnx")):
+        if os.path.abspath(path) not in keep:
+            try:
+                os.remove(path)
+                logger.info(f"Menghapus ekspor ONNX lama: {path}")
+            except OSError as e:
+                logger.warning(f"Gagal menghapus ekspor ONNX lama {path}: {str(e)}")
+
+def export_to_onnx(model_path: str, quantize: bool = ONNX_QUANTIZE) -> str:
+    """
+    Ekspor model PyTorch ke ONNX sekali per versi model, lalu kuantisasi dinamis int8 jika diminta
+    
+    File untuk versi model yang sama tidak diekspor ulang; file dari versi lama
+    dihapus setelah ekspor baru selesai.
+    
+    Args:
+        model_path: Path atau nama model Hugging Face
+        quantize: Terapkan kuantisasi dinamis int8
+        
+    Returns:
+        Path file .onnx yang siap dipakai
+    """
+    fp32_path = get_onnx_path(model_path, quantize=False)
+    target_path = get_onnx_path(model_path, quantize=quantize)
+    
+    if os.path.exists(target_path):
+        return target_path
+    
+    os.makedirs(os.path.dirname(fp32_path), exist_ok=True)
+    
+    if not os.path.exists(fp32_path):
+        import torch
+        from transformers import AutoModelForSequenceClassification
+        
+        logger.info(f"Mengekspor {model_path} ke ONNX: {fp32_path}")
+        torch_model = AutoModelForSequenceClassification.from_pretrained(
+            model_path, num_labels=len(SENTIMENT_LABELS)
+        )
+        torch_model.eval()
+        
+        class LogitsOnly(torch.nn.Module):
+            def __init__(self, wrapped):
+                super().__init__()
+                self.wrapped = wrapped
+            
+            def forward(self, input_ids, attention_mask, token_type_ids):
+                return self.wrapped(
+                    input_ids=input_ids,
+                    attention_mask=attention_mask,
+                    token_type_ids=token_type_ids
+                ).logits
+        
+        dummy = torch.ones((1, 8), dtype=torch.long)
+        dynamic_axes = {name: {0: "batch", 1: "sequence"} for name in ONNX_INPUT_NAMES}
+        dynamic_axes["logits"] = {0: "batch"}
+        with torch.no_grad():
+            torch.onnx.export(
+                LogitsOnly(torch_model),
+                (dummy, dummy, torch.zeros_like(dummy)),
+                fp32_path,
+                input_names=ONNX_INPUT_NAMES,
+                output_names=["logits"],
+                dynamic_axes=dynamic_axes,
+                opset_version=14,
+                do_constant_folding=True
+            )
+    
+    if quantize:
+        from onnxruntime.quantization import quantize_dynamic, QuantType
+        
+        logger.info(f"Mengkuantisasi model ONNX ke int8: {target_path}")
+        quantize_dynamic(fp32_path, target_path, weight_type=QuantType.QInt8)
+    
+    remove_stale_exports(model_path, keep=[fp32_path, target_path])
+    return target_path
+
+class OnnxSentimentModel:
+    """
+    Pembungkus InferenceSession ONNX Runtime untuk klasifikasi sentimen
+    """
+    
+    def __init__(self, onnx_path: str, num_threads: int = ONNX_INTRA_OP_THREADS):
+        """
+        Args:
+            onnx_path: Path file .onnx
+            num_threads: Jumlah thread intra-op (0 = default ONNX Runtime)
+        """
+        import onnxruntime as ort
+        
+        options = ort.SessionOptions()
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        if num_threads:
+            options.intra_op_num_threads = num_threads
+        
+        self.onnx_path = onnx_path
+        self.session = ort.InferenceSession(
+            onnx_path, sess_options=options, providers=["CPUExecutionProvider"]
+        )
+        self.input_names = [node.name for node in self.session.get_inputs()]
+    
+    def predict(self, inputs: Dict[str, Any]) -> np.ndarray:
+        """
+        Jalankan forward pass untuk satu batch
+        
+        Args:
+            inputs: Hasil tokenizer dengan return_tensors="np"
+            
+        Returns:
+            Array logits berukuran (batch, jumlah label)
+        """
+        feed = {}
+        for name in self.input_names:
+            if name in inputs:
+                feed[name] = np.asarray(inputs[name], dtype=np.int64)
+            else:
+                feed[name] = np.zeros_like(np.asarray(inputs["input_ids"], dtype=np.int64))
+        return self.session.run(["logits"], feed)[0]
+
+def load_onnx_model(
+    model_path: str,
+    quantize: bool = ONNX_QUANTIZE,
+    num_threads: int = ONNX_INTRA_OP_THREADS
+) -> OnnxSentimentModel:
+    """
+    Ekspor (jika perlu) dan muat model ONNX
+    
+    Args:
+        model_path: Path atau nama model Hugging Face
+        quantize: Gunakan model int8
+        num_threads: Jumlah thread intra-op
+        
+    Returns:
+        Objek OnnxSentimentModel
+    """
+    onnx_path = export_to_onnx(model_path, quantize=quantize)
+    logger.info(f"Loading ONNX model from {onnx_path}")
+    return OnnxSentimentModel(onnx_path, num_threads=num_threads)
+
+def check_backend_parity(
+    model_path: str,
+    texts: Optional[List[str]] = None,
+    quantize: bool = ONNX_QUANTIZE,
+    num_threads: int = ONNX_INTRA_OP_THREADS
+) -> Dict[str, Any]:
+    """
+    Bandingkan label dan logits backend ONNX dengan backend PyTorch
+    
+    Args:
+        model_path: Path atau nama model Hugging Face
+        texts: Teks yang sudah diproses untuk dibandingkan (default contoh bawaan)
+        quantize: Bandingkan model int8
+        num_threads: Jumlah thread intra-op ONNX Runtime
+        
+    Returns:
+        Dictionary berisi jumlah teks, kesesuaian label, dan selisih logits maksimum
+    """
+    import torch
+    from transformers import AutoTokenizer, AutoModelForSequenceClassification
+    
+    texts = texts or PARITY_SAMPLE_TEXTS
+    tokenizer = AutoTokenizer.from_pretrained(model_path)
+    torch_model = AutoModelForSequenceClassification.from_pretrained(
+        model_path, num_labels=len(SENTIMENT_LABELS)
+    )
+    torch_model.eval()
+    onnx_model = load_onnx_model(model_path, quantize=quantize, num_threads=num_threads)
+    
+    with torch.no_grad():
+        torch_logits = torch_model(
+            **tokenizer(texts, padding=True, truncation=True, return_tensors="pt")
+        ).logits.numpy()
+    onnx_logits = onnx_model.predict(
+        tokenizer(texts, padding=True, truncation=True, return_tensors="np")
+    )
+    
+    torch_labels = torch_logits.argmax(axis=-1)
+    onnx_labels = onnx_logits.argmax(axis=-1)
+    report = {
+        "texts": len(texts),
+        "quantized": quantize,
+        "label_agreement": float((torch_labels == onnx_labels).mean()),
+        "mismatches": [texts[i] for i in np.flatnonzero(torch_labels != onnx_labels)],
+        "max_abs_logit_diff": float(np.abs(torch_logits - onnx_logits).max()),
+    }
+    logger.info(f"Parity ONNX vs PyTorch: {report['label_agreement']:.2%} label sama")
+    return report
+
+if __name__ == "__main__":
+    # Contoh: python -m helpers.onnx_backend quickshop-indobert-sentiment
+    parity = check_backend_parity(sys.argv[1] if len(sys.argv) > 1 else "quickshop-indobert-sentiment")
+    print(json.dumps(parity, indent=2, ensure_ascii=False))
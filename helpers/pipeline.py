@@ -0,0 +1,138 @@
+"""
+Module untuk pipeline streaming scraping-ke-analisis yang menumpuk I/O dan inferensi
+"""
+
+import queue
+import logging
+import threading
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from helpers.config import MAX_REVIEWS_DEFAULT, BROWSER_HEADLESS_DEFAULT
+from helpers.scraper import iter_tokopedia_reviews
+from helpers.analyzer import analyze_sentiment, load_sentiment_model
+
+# Setup logging
+logging.basicConfig(level=logging.INFO, 
+                   format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+logger = logging.getLogger("pipeline")
+
+# Penanda akhir stream dari thread scraper
+_END_OF_STREAM = object()
+
+def _run_scraper(
+    event_queue: "queue.Queue",
+    stop_event: threading.Event,
+    product_url: str,
+    max_reviews: int,
+    headless: bool
+):
+    """
+    Jalankan generator scraper di thread terpisah dan teruskan semua event ke antrian
+    
+    Callback status scraper juga diteruskan lewat antrian agar UI hanya
+    diperbarui dari thread utama.
+    """
+    def forward_status(message, is_progress=False):
+        event_queue.put({"type": "progress" if is_progress else "status", "value": message})
+    
+    events = iter_tokopedia_reviews(product_url, max_reviews, headless, forward_status)
+    try:
+        for event in events:
+            event_queue.put(event)
+            if stop_event.is_set():
+                break
+    except Exception as e:
+        logger.error(f"Error pada thread scraper: {str(e)}", exc_info=True)
+        event_queue.put({"type": "error", "message": str(e)})
+    finally:
+        # Pastikan browser ditutup walaupun konsumen berhenti lebih awal
+        events.close()
+        event_queue.put(_END_OF_STREAM)
+
+def stream_scrape_and_analyze(
+    product_url: str,
+    max_reviews: int = MAX_REVIEWS_DEFAULT,
+    headless: bool = BROWSER_HEADLESS_DEFAULT,
+    model_path: Optional[str] = None,
+    status_callback: Optional[Callable] = None,
+    progress_callback: Optional[Callable[[str, float], None]] = None
+) -> Tuple[Optional[Dict[str, Any]], Tuple[List[str], List[str], List[int], List[int], List[float]]]:
+    """
+    Scrape ulasan per halaman sambil menganalisis halaman yang sudah selesai
+    
+    Scraper berjalan di thread latar belakang sehingga klasifikasi setiap halaman
+    berlangsung ketika browser sedang memuat halaman berikutnya.
+    
+    Args:
+        product_url: URL produk Tokopedia
+        max_reviews: Jumlah maksimum ulasan yang akan diambil
+        headless: Boolean untuk menjalankan browser tanpa GUI
+        model_path: Path model sentimen yang dimuat sambil scraper berjalan
+        status_callback: Callback untuk pesan status (dipanggil dari thread pemanggil)
+        progress_callback: Callback (tahap, persentase) dengan tahap "scraping" atau "analysis"
+        
+    Returns:
+        Tuple dari (data produk atau None jika gagal, hasil analyze_sentiment untuk semua ulasan)
+    """
+    event_queue: "queue.Queue" = queue.Queue()
+    stop_event = threading.Event()
+    scraper_thread = threading.Thread(
+        target=_run_scraper,
+        args=(event_queue, stop_event, product_url, max_reviews, headless),
+        name="scraper-stream",
+        daemon=True
+    )
+    scraper_thread.start()
+    
+    # Muat model selagi browser disiapkan
+    if not load_sentiment_model(model_path):
+        logger.warning("Gagal memuat model sentimen, menggunakan fallback")
+    
+    scraped_data = None
+    failed = False
+    results: Tuple[List, ...] = ([], [], [], [], [])
+    analyzed = 0
+    
+    try:
+        while True:
+            event = event_queue.get()
+            if event is _END_OF_STREAM:
+                break
+            
+            if event["type"] == "status":
+                if status_callback:
+                    status_callback(event["value"])
+            elif event["type"] == "progress":
+                if progress_callback:
+                    progress_callback("scraping", event["value"])
+            elif event["type"] == "error":
+                failed = True
+            elif event["type"] == "product":
+                scraped_data = {
+                    "product_name": event["product_name"],
+                    "description": event["description"],
+                    "reviews": []
+                }
+            elif event["type"] == "reviews":
+                page_reviews = event["reviews"]
+                scraped_data["reviews"].extend(page_reviews)
+                
+                # Klasifikasi halaman ini selagi scraper memuat halaman berikutnya
+                page_results = analyze_sentiment(page_reviews)
+                for collected, page_values in zip(results, page_results):
+                    collected.extend(page_values)
+                
+                analyzed += len(page_reviews)
+                if progress_callback:
+                    progress_callback("analysis", min(analyzed / max(max_reviews, 1), 1.0))
+    finally:
+        stop_event.set()
+        scraper_thread.join()
+    
+    if failed or scraped_data is None:
+        return None, results
+    
+    if progress_callback:
+        progress_callback("analysis", 1.0)
+    
+    return scraped_data, results
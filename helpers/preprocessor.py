@@ -0,0 +1,177 @@
+"""
+Module untuk praproses teks ulasan sebelum analisis sentimen
+"""
+
+import re
+import logging
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from helpers.config import EMOJI_REPLACEMENTS, SLANG_REPLACEMENTS
+
+# Setup logging
+logging.basicConfig(level=logging.INFO, 
+                   format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+logger = logging.getLogger("preprocessor")
+
+# Pola regex yang dikompilasi sekali saat import
+REPEATED_CHAR_PATTERN = re.compile(r'(.)\1{2,}')
+PUNCTUATION_PATTERN = re.compile(r'[^\w\s]')
+WHITESPACE_PATTERN = re.compile(r'\s+')
+
+def build_replacement_pattern(
+    emoji_map: Dict[str, str],
+    slang_map: Dict[str, str]
+) -> Tuple[re.Pattern, Dict[str, str]]:
+    """
+    Gabungkan kamus emoji dan singkatan menjadi satu regex dan satu tabel lookup
+    
+    Emoji diganti di posisi mana pun, sedangkan singkatan hanya diganti jika
+    berdiri sebagai kata utuh (misalnya "ga" tidak diganti di dalam "harga").
+    
+    Args:
+        emoji_map: Kamus emoji ke kata pengganti
+        slang_map: Kamus singkatan ke kata baku
+        
+    Returns:
+        Tuple dari (pola regex gabungan, tabel lookup hasil pencocokan ke pengganti)
+    """
+    lookup = {emoji: f" {replacement} " for emoji, replacement in emoji_map.items()}
+    lookup.update(slang_map)
+    
+    # Alternatif terpanjang didahulukan agar "bgttt" tidak terpotong oleh "bgt"
+    emoji_alternatives = [re.escape(e) for e in sorted(emoji_map, key=len, reverse=True)]
+    slang_alternatives = [re.escape(w) for w in sorted(slang_map, key=len, reverse=True)]
+    
+    parts = []
+    if emoji_alternatives:
+        parts.append('|'.join(emoji_alternatives))
+    if slang_alternatives:
+        parts.append(r'(?<!\w)(?:' + '|'.join(slang_alternatives) + r')(?!\w)')
+    
+    pattern = re.compile('|'.join(parts)) if parts else re.compile(r'(?!x)x')
+    return pattern, lookup
+
+class TextPreprocessor:
+    """
+    Praproses teks ulasan dengan pola yang dikompilasi dan stopword remover yang di-cache
+    """
+    
+    def __init__(
+        self,
+        emoji_map: Optional[Dict[str, str]] = None,
+        slang_map: Optional[Dict[str, str]] = None,
+        remove_stopwords: bool = True
+    ):
+        """
+        Args:
+            emoji_map: Kamus emoji ke kata (default dari config)
+            slang_map: Kamus singkatan ke kata baku (default dari config)
+            remove_stopwords: Hapus stopword dengan Sastrawi jika tersedia
+        """
+        self.emoji_map = EMOJI_REPLACEMENTS if emoji_map is None else emoji_map
+        self.slang_map = SLANG_REPLACEMENTS if slang_map is None else slang_map
+        self.emoji_pattern, self.emoji_lookup = build_replacement_pattern(self.emoji_map, {})
+        self.replacement_pattern, self.replacement_lookup = build_replacement_pattern(
+            self.emoji_map, self.slang_map
+        )
+        self.remove_stopwords = remove_stopwords
+        self._stopword_remover = None
+        self._stopword_remover_loaded = False
+    
+    @property
+    def stopword_remover(self):
+        """
+        Stopword remover Sastrawi, dibuat sekali saat pertama kali dibutuhkan
+        """
+        if not self._stopword_remover_loaded:
+            self._stopword_remover_loaded = True
+            try:
+                from Sastrawi.StopWordRemover.StopWordRemoverFactory import StopWordRemoverFactory
+                self._stopword_remover = StopWordRemoverFactory().create_stop_word_remover()
+            except Exception as e:
+                logger.warning(f"Couldn't remove stopwords: {str(e)}")
+                self._stopword_remover = None
+        return self._stopword_remover
+    
+    def replace_emojis(self, text: str) -> str:
+        """
+        Mengganti emoji dengan teks yang sesuai
+        
+        Args:
+            text: Teks yang mengandung emoji
+            
+        Returns:
+            Teks yang sudah diganti emojinya
+        """
+        return self.emoji_pattern.sub(lambda m: self.emoji_lookup[m.group(0)], text)
+    
+    def preprocess(self, text: str) -> str:
+        """
+        Praproses satu teks ulasan
+        
+        Args:
+            text: Teks ulasan asli
+            
+        Returns:
+            Teks yang sudah diproses
+        """
+        text = str(text).lower()
+        
+        # Ganti emoji dan singkatan dalam satu kali pemindaian
+        text = self.replacement_pattern.sub(lambda m: self.replacement_lookup[m.group(0)], text)
+        
+        # Hapus karakter berulang
+        text = REPEATED_CHAR_PATTERN.sub(r'\1', text)
+        
+        # Hapus tanda baca
+        text = PUNCTUATION_PATTERN.sub(' ', text)
+        
+        # Hapus spasi berlebih
+        text = WHITESPACE_PATTERN.sub(' ', text).strip()
+        
+        # Hapus stopword jika Sastrawi tersedia
+        if self.remove_stopwords and self.stopword_remover is not None:
+            text = self.stopword_remover.remove(text)
+            text = WHITESPACE_PATTERN.sub(' ', text).strip()
+        
+        return text
+    
+    def preprocess_many(self, texts: Iterable[str]) -> List[str]:
+        """
+        Praproses sekumpulan teks ulasan
+        
+        Args:
+            texts: Iterable teks ulasan asli
+            
+        Returns:
+            List teks yang sudah diproses, urutan sama dengan input
+        """
+        preprocess = self.preprocess
+        return [preprocess(text) for text in texts]
+
+# Instance bersama, dibuat saat pertama kali digunakan
+_default_preprocessor: Optional[TextPreprocessor] = None
+
+def get_preprocessor() -> TextPreprocessor:
+    """
+    Dapatkan instance TextPreprocessor bersama
+    
+    Returns:
+        Objek TextPreprocessor dengan konfigurasi default
+    """
+    global _default_preprocessor
+    if _default_preprocessor is None:
+        _default_preprocessor = TextPreprocessor()
+    return _default_preprocessor
+
+def preprocess_many(texts: Iterable[str]) -> List[str]:
+    """
+    Praproses sekumpulan teks ulasan dengan preprocessor bersama
+    
+    Args:
+        texts: Iterable teks ulasan asli
+        
+    Returns:
+        List teks yang sudah diproses
+    """
+    return get_preprocessor().preprocess_many(texts)
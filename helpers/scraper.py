@@ -4,24 +4,28 @@ Module untuk scraping data produk dan ulasan dari Tokopedia
 
 import time
 import re
-from typing import Dict, List, Optional, Any
+from typing import Dict, Iterator, List, Optional, Any, TYPE_CHECKING
 import logging
 
-from selenium import webdriver
-from selenium.webdriver.chrome.options import Options
-from selenium.webdriver.chrome.service import Service
-from selenium.webdriver.common.by import By
-from webdriver_manager.chrome import ChromeDriverManager
-from bs4 import BeautifulSoup
-
-from helpers.config import TOKOPEDIA_DOMAIN, MAX_REVIEWS_DEFAULT, BROWSER_HEADLESS_DEFAULT
+from helpers.config import (
+    TOKOPEDIA_DOMAIN, MAX_REVIEWS_DEFAULT, BROWSER_HEADLESS_DEFAULT, EMPTY_REVIEW_PLACEHOLDER,
+    SCRAPER_PAGE_LOAD_TIMEOUT, SCRAPER_POPUP_TIMEOUT, SCRAPER_CONTENT_TIMEOUT,
+    SCRAPER_DESCRIPTION_TIMEOUT, SCRAPER_PAGE_CHANGE_TIMEOUT, SCRAPER_POLL_INTERVAL,
+    DRIVER_POOL_ENABLED, DRIVER_POOL_ACQUIRE_TIMEOUT, DRIVER_PAGE_LOAD_TIMEOUT, DRIVER_SCRIPT_TIMEOUT,
+    SCRAPER_BACKEND
+)
+from helpers.metrics import span, timed
+from helpers import dom_selectors as selectors
 
 # Setup logging
 logging.basicConfig(level=logging.INFO, 
                    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
 logger = logging.getLogger("tokopedia_scraper")
 
-def setup_driver(headless: bool = True) -> webdriver.Chrome:
+if TYPE_CHECKING:
+    from selenium import webdriver
+
+def setup_driver(headless: bool = True) -> "webdriver.Chrome":
     """
     Setup Chrome driver untuk scraping
     
@@ -31,6 +35,12 @@ def setup_driver(headless: bool = True) -> webdriver.Chrome:
     Returns:
         Objek webdriver.Chrome yang sudah dikonfigurasi
     """
+    # Selenium baru diimpor saat browser benar-benar dibutuhkan
+    from selenium import webdriver
+    from selenium.webdriver.chrome.options import Options
+    from selenium.webdriver.chrome.service import Service
+    from helpers.driver_pool import get_chromedriver_path
+    
     # Setup Chrome options
     chrome_options = Options()
     if headless:
@@ -44,16 +54,196 @@ def setup_driver(headless: bool = True) -> webdriver.Chrome:
     chrome_options.add_experimental_option("useAutomationExtension", False)
     
     # Create Chrome driver
-    service = Service(ChromeDriverManager().install())
+    service = Service(get_chromedriver_path())
     driver = webdriver.Chrome(service=service, options=chrome_options)
     
     # Mengubah user agent untuk menghindari deteksi otomatisasi
     driver.execute_cdp_cmd('Network.setUserAgentOverride', {
         "userAgent": 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
     })
+    set_driver_timeouts(driver)
     
     return driver
 
+def set_driver_timeouts(
+    driver: "webdriver.Chrome",
+    page_load: float = DRIVER_PAGE_LOAD_TIMEOUT,
+    script: float = DRIVER_SCRIPT_TIMEOUT
+):
+    """
+    Batasi lama navigasi dan eksekusi script agar driver tidak menggantung tanpa batas
+    
+    Args:
+        driver: Objek webdriver
+        page_load: Batas waktu driver.get (detik)
+        script: Batas waktu execute_script (detik)
+    """
+    driver.set_page_load_timeout(max(1, page_load))
+    driver.set_script_timeout(max(1, script))
+
+def time_left(deadline: Optional[float], timeout: float) -> float:
+    """
+    Potong batas waktu sebuah langkah agar tidak melewati deadline scraping
+    
+    Args:
+        deadline: Batas akhir dalam detik time.monotonic() (None = tanpa deadline)
+        timeout: Batas waktu normal langkah tersebut (detik)
+        
+    Returns:
+        Batas waktu yang tersisa untuk langkah tersebut (detik)
+        
+    Raises:
+        TimeoutError: Jika deadline sudah lewat
+    """
+    if deadline is None:
+        return timeout
+    remaining = deadline - time.monotonic()
+    if remaining <= 0:
+        raise TimeoutError("Scraping melewati batas waktu")
+    return min(timeout, remaining)
+
+def wait_until(driver: "webdriver.Chrome", name: str, condition, timeout: float) -> Any:
+    """
+    Tunggu sampai kondisi halaman terpenuhi, paling lama `timeout` detik
+    
+    Lama tunggu sebenarnya dicatat sebagai span metrik "scrape_wait_<name>".
+    
+    Args:
+        driver: Objek webdriver
+        name: Nama kondisi untuk log dan metrik
+        condition: Callable yang menerima driver dan mengembalikan nilai truthy jika siap
+        timeout: Batas waktu tunggu (detik)
+        
+    Returns:
+        Nilai dari kondisi, atau None jika batas waktu habis
+    """
+    from selenium.common.exceptions import TimeoutException
+    from selenium.webdriver.support.ui import WebDriverWait
+    
+    start = time.perf_counter()
+    with span(f"scrape_wait_{name}"):
+        try:
+            result = WebDriverWait(driver, timeout, poll_frequency=SCRAPER_POLL_INTERVAL).until(condition)
+        except TimeoutException:
+            result = None
+    logger.debug(
+        f"Menunggu {name}: {time.perf_counter() - start:.2f}s "
+        f"({'siap' if result is not None else 'batas waktu habis'})"
+    )
+    return result
+
+def first_review_signature(driver: "webdriver.Chrome") -> Optional[str]:
+    """
+    Identitas ulasan pertama di halaman, dipakai untuk mendeteksi pergantian halaman
+    
+    Args:
+        driver: Objek webdriver
+        
+    Returns:
+        Teks kontainer ulasan pertama, atau None jika belum ada
+    """
+    from selenium.common.exceptions import StaleElementReferenceException
+    from selenium.webdriver.common.by import By
+    
+    try:
+        containers = driver.find_elements(By.CSS_SELECTOR, selectors.REVIEW_CONTAINER)
+        return containers[0].text if containers else None
+    except StaleElementReferenceException:
+        return None
+
+# Ambil field ulasan langsung di browser dalam satu panggilan, tanpa serialisasi seluruh halaman
+EXTRACT_REVIEWS_SCRIPT = """
+const [containerSelector, textSelector, nameSelector, ratingSelector] = arguments;
+return Array.from(document.querySelectorAll(containerSelector)).map(container => {
+    const text = container.querySelector(textSelector);
+    const name = container.querySelector(nameSelector);
+    const rating = container.querySelector(ratingSelector);
+    return {
+        text: text ? text.textContent.trim() : null,
+        name: name ? name.textContent.trim() : null,
+        rating: rating ? rating.getAttribute('aria-label') : null
+    };
+});
+"""
+
+EXTRACT_OUTER_HTML_SCRIPT = """
+return Array.from(document.querySelectorAll(arguments[0])).map(element => element.outerHTML);
+"""
+
+EXTRACT_PRODUCT_SCRIPT = """
+const [nameSelector, descriptionSelector, totalSelector] = arguments;
+const read = selector => {
+    const element = document.querySelector(selector);
+    return element ? element.textContent.trim() : null;
+};
+return {name: read(nameSelector), description: read(descriptionSelector), total: read(totalSelector)};
+"""
+
+def parse_review_fragments(fragments: List[str]) -> List[Dict[str, Optional[str]]]:
+    """
+    Ambil field ulasan dari outerHTML kontainer ulasan (fallback jika script gagal)
+    
+    Hanya fragmen kontainer yang di-parse, dengan lxml jika tersedia.
+    
+    Args:
+        fragments: outerHTML setiap kontainer ulasan
+        
+    Returns:
+        List dictionary {"text", "name", "rating"} seperti extract_review_fields
+    """
+    from bs4 import BeautifulSoup
+    try:
+        import lxml  # noqa: F401
+        parser = "lxml"
+    except ImportError:
+        parser = "html.parser"
+    
+    fields = []
+    for fragment in fragments:
+        container = BeautifulSoup(fragment, parser)
+        text_elem = container.select_one(selectors.REVIEW_TEXT)
+        name_elem = container.select_one(selectors.REVIEW_NAME)
+        rating_elem = container.select_one(selectors.REVIEW_RATING)
+        fields.append({
+            "text": text_elem.get_text().strip() if text_elem else None,
+            "name": name_elem.get_text().strip() if name_elem else None,
+            "rating": rating_elem.get("aria-label") if rating_elem else None
+        })
+    return fields
+
+def extract_review_fields(driver: "webdriver.Chrome") -> List[Dict[str, Optional[str]]]:
+    """
+    Ambil teks, nama, dan label rating dari semua kontainer ulasan di halaman
+    
+    Args:
+        driver: Objek webdriver
+        
+    Returns:
+        List dictionary {"text", "name", "rating"} (None jika elemen tidak ada)
+    """
+    try:
+        return driver.execute_script(
+            EXTRACT_REVIEWS_SCRIPT,
+            selectors.REVIEW_CONTAINER, selectors.REVIEW_TEXT, selectors.REVIEW_NAME, selectors.REVIEW_RATING
+        ) or []
+    except Exception as e:
+        logger.warning(f"Ekstraksi ulasan lewat script gagal, memakai outerHTML: {str(e)}")
+        return parse_review_fragments(driver.execute_script(EXTRACT_OUTER_HTML_SCRIPT, selectors.REVIEW_CONTAINER) or [])
+
+def extract_product_info(driver: "webdriver.Chrome") -> Dict[str, Optional[str]]:
+    """
+    Ambil nama produk, deskripsi, dan teks total ulasan dalam satu panggilan script
+    
+    Args:
+        driver: Objek webdriver
+        
+    Returns:
+        Dictionary {"name", "description", "total"} (None jika elemen tidak ada)
+    """
+    return driver.execute_script(
+        EXTRACT_PRODUCT_SCRIPT, selectors.PRODUCT_NAME, selectors.PRODUCT_DESCRIPTION, selectors.REVIEW_TOTAL
+    ) or {}
+
 def validate_tokopedia_url(url: str) -> bool:
     """
     Memvalidasi URL produk Tokopedia
@@ -66,31 +256,84 @@ def validate_tokopedia_url(url: str) -> bool:
     """
     return TOKOPEDIA_DOMAIN in url.lower() and "http" in url.lower()
 
-def scrape_tokopedia_reviews(
+def iter_tokopedia_reviews(
     product_url: str, 
     max_reviews: int = MAX_REVIEWS_DEFAULT, 
     headless: bool = BROWSER_HEADLESS_DEFAULT,
-    status_callback = None
-) -> Optional[Dict[str, Any]]:
+    status_callback = None,
+    backend: str = SCRAPER_BACKEND,
+    deadline: Optional[float] = None
+) -> Iterator[Dict[str, Any]]:
     """
-    Scrape data produk dan ulasan dari Tokopedia
+    Scrape data produk dan ulasan dari Tokopedia secara bertahap per halaman
+    
+    Generator ini menghasilkan event berikut secara berurutan:
+    - {"type": "product", "product_name": ..., "description": ...}
+    - {"type": "reviews", "page": nomor halaman, "reviews": [ulasan baru di halaman itu]}
+    - {"type": "error", "message": ...} jika scraping gagal
     
     Args:
         product_url: URL produk Tokopedia
         max_reviews: Jumlah maksimum ulasan yang akan diambil
         headless: Boolean untuk menjalankan browser tanpa GUI
         status_callback: Callback function untuk melaporkan status (opsional)
+        backend: "http" (endpoint GraphQL, fallback ke Selenium) atau "selenium"
+        deadline: Batas akhir scraping dalam detik time.monotonic() (opsional)
         
-    Returns:
-        Dictionary berisi data produk dan ulasan, atau None jika gagal
+    Yields:
+        Dictionary event scraping
     """
     # Validasi URL
     if not validate_tokopedia_url(product_url):
         if status_callback:
             status_callback("❌ URL produk tidak valid! Pastikan ini adalah URL produk Tokopedia.")
         logger.error(f"URL tidak valid: {product_url}")
-        return None
+        yield {"type": "error", "message": "URL produk tidak valid"}
+        return
+    
+    if backend == "http":
+        from helpers.http_fetcher import iter_http_reviews, HttpFetchError
+        
+        started = False
+        try:
+            for event in iter_http_reviews(product_url, max_reviews, status_callback, deadline=deadline):
+                started = True
+                yield event
+            return
+        except HttpFetchError as e:
+            logger.warning(f"Pengambilan lewat HTTP gagal: {str(e)}")
+            if started:
+                # Event yang sudah dikirim tidak dapat diulang dengan Selenium; pakai hasil sebagian
+                return
+            if status_callback:
+                status_callback("<div class='scraping-container'>ℹ️ Beralih ke scraping dengan Chrome...</div>")
     
+    yield from iter_selenium_reviews(product_url, max_reviews, headless, status_callback, deadline)
+
+def iter_selenium_reviews(
+    product_url: str, 
+    max_reviews: int = MAX_REVIEWS_DEFAULT, 
+    headless: bool = BROWSER_HEADLESS_DEFAULT,
+    status_callback = None,
+    deadline: Optional[float] = None
+) -> Iterator[Dict[str, Any]]:
+    """
+    Scrape data produk dan ulasan dengan Chrome (Selenium), event sama seperti iter_tokopedia_reviews
+    
+    Jika deadline diberikan, setiap tunggu, navigasi, dan script dipotong agar
+    selesai sebelum deadline, dan scraping berhenti dengan event error saat
+    deadline lewat.
+    
+    Args:
+        product_url: URL produk Tokopedia yang sudah divalidasi
+        max_reviews: Jumlah maksimum ulasan yang akan diambil
+        headless: Boolean untuk menjalankan browser tanpa GUI
+        status_callback: Callback function untuk melaporkan status (opsional)
+        deadline: Batas akhir scraping dalam detik time.monotonic() (opsional)
+        
+    Yields:
+        Dictionary event scraping
+    """
     # Setup status updates
     def update_status(message):
         logger.info(message)
@@ -99,59 +342,100 @@ def scrape_tokopedia_reviews(
     
     update_status("⏳ Menyiapkan Chrome driver...")
     
-    # Setup driver
-    driver = setup_driver(headless=headless)
+    from selenium.webdriver.common.by import By
+    from selenium.webdriver.support import expected_conditions as EC
+    
+    # Setup driver (dipinjam dari pool jika aktif)
+    with span("scrape_driver_setup"):
+        if DRIVER_POOL_ENABLED:
+            from helpers.driver_pool import get_driver_pool
+            driver_pool = get_driver_pool()
+            driver = driver_pool.acquire(headless, timeout=time_left(deadline, DRIVER_POOL_ACQUIRE_TIMEOUT))
+        else:
+            driver_pool = None
+            driver = setup_driver(headless=headless)
     
     try:
-        # Arahkan ke URL produk
-        update_status("⏳ Membuka halaman produk Tokopedia...")
-        driver.get(product_url)
-        time.sleep(7)  # Tunggu halaman dimuat
-        
-        # Tutup iklan jika ada
-        try:
-            update_status("⏳ Menangani popup...")
-            div_iklan = driver.find_element(By.CLASS_NAME, "css-11hzwo5")
-            iklan_button = div_iklan.find_element(By.TAG_NAME, "button")
-            iklan_button.click()
-            time.sleep(4)
-        except Exception as e:
-            update_status(f"ℹ️ Tidak ada popup untuk ditutup atau tidak dapat ditutup: {str(e)}")
+        # Navigasi dan script juga dibatasi deadline (dikembalikan saat driver di-reset)
+        if deadline is not None:
+            set_driver_timeouts(
+                driver,
+                page_load=time_left(deadline, DRIVER_PAGE_LOAD_TIMEOUT),
+                script=time_left(deadline, DRIVER_SCRIPT_TIMEOUT)
+            )
         
-        # Scroll ke bawah untuk memuat konten
-        update_status("⏳ Memuat konten halaman...")
-        driver.execute_script("window.scrollBy(0, 2000);")
-        time.sleep(5)
+        with span("scrape_product_page"):
+            # Arahkan ke URL produk
+            update_status("⏳ Membuka halaman produk Tokopedia...")
+            driver.get(product_url)
+            # Tunggu halaman dimuat
+            wait_until(
+                driver, "product_page",
+                EC.presence_of_element_located((By.CSS_SELECTOR, selectors.PRODUCT_NAME)),
+                time_left(deadline, SCRAPER_PAGE_LOAD_TIMEOUT)
+            )
+            
+            # Tutup iklan jika ada
+            try:
+                update_status("⏳ Menangani popup...")
+                iklan_button = wait_until(
+                    driver, "popup",
+                    EC.element_to_be_clickable((By.CSS_SELECTOR, selectors.POPUP_BUTTON)),
+                    time_left(deadline, SCRAPER_POPUP_TIMEOUT)
+                )
+                if iklan_button is not None:
+                    iklan_button.click()
+                    wait_until(
+                        driver, "popup_closed",
+                        EC.invisibility_of_element_located((By.CSS_SELECTOR, selectors.POPUP)),
+                        time_left(deadline, SCRAPER_POPUP_TIMEOUT)
+                    )
+            except TimeoutError:
+                raise
+            except Exception as e:
+                update_status(f"ℹ️ Tidak ada popup untuk ditutup atau tidak dapat ditutup: {str(e)}")
+            
+            # Scroll ke bawah untuk memuat konten
+            update_status("⏳ Memuat konten halaman...")
+            driver.execute_script("window.scrollBy(0, 2000);")
+            wait_until(
+                driver, "review_containers",
+                EC.presence_of_element_located((By.CSS_SELECTOR, selectors.REVIEW_CONTAINER)),
+                time_left(deadline, SCRAPER_CONTENT_TIMEOUT)
+            )
 
-        # Coba klik tombol "Lihat Selengkapnya" untuk deskripsi
-        try:
-            update_status("⏳ Mencoba membuka deskripsi lengkap...")
-            see_more_button = driver.find_element(By.XPATH, "//button[@data-testid='btnPDPSeeMore']")
-            see_more_button.click()
-            time.sleep(5)
-        except Exception as e:
-            update_status(f"ℹ️ Tidak dapat membuka deskripsi lengkap: {str(e)}")
-        
-        # Ambil deskripsi dan nama produk
-        update_status("⏳ Mengambil informasi produk...")
-        soup = BeautifulSoup(driver.page_source, "html.parser")
-        description_elem = soup.select_one("div[data-testid='lblPDPDescriptionProduk']")
-        description = description_elem.get_text(strip=True) if description_elem else "Deskripsi tidak ditemukan"
-        
-        product_name_elem = soup.select_one("h1[data-testid='lblPDPDetailProductName']")
-        product_name = product_name_elem.get_text(strip=True) if product_name_elem else "Produk Tidak Diketahui"
+            # Coba klik tombol "Lihat Selengkapnya" untuk deskripsi
+            try:
+                update_status("⏳ Mencoba membuka deskripsi lengkap...")
+                see_more_button = driver.find_element(By.XPATH, selectors.SEE_MORE_BUTTON_XPATH)
+                see_more_button.click()
+                # Deskripsi sudah terbuka jika tombol hilang atau berganti
+                wait_until(
+                    driver, "description", EC.staleness_of(see_more_button),
+                    time_left(deadline, SCRAPER_DESCRIPTION_TIMEOUT)
+                )
+            except TimeoutError:
+                raise
+            except Exception as e:
+                update_status(f"ℹ️ Tidak dapat membuka deskripsi lengkap: {str(e)}")
+            
+            # Ambil deskripsi dan nama produk
+            update_status("⏳ Mengambil informasi produk...")
+            product_info = extract_product_info(driver)
+            description = product_info.get("description") or "Deskripsi tidak ditemukan"
+            product_name = product_info.get("name") or "Produk Tidak Diketahui"
 
         update_status(f"✅ Produk terdeteksi: {product_name}")
+        yield {"type": "product", "product_name": product_name, "description": description}
         
         # Ambil ulasan
-        reviews_data = []
+        review_count = 0
         collected_reviews = set()
         
         # Hitung total ulasan
         try:
-            total_elem = soup.find("p", {"data-testid": "reviewSortingSubtitle"})
-            if total_elem:
-                total_text = total_elem.get_text()
+            total_text = product_info.get("total")
+            if total_text:
                 match = re.search(r'dari (\d+)', total_text)
                 if match:
                     total_available = int(match.group(1))
@@ -162,73 +446,126 @@ def scrape_tokopedia_reviews(
         
         # Proses halaman-halaman ulasan
         page = 1
-        while len(reviews_data) < max_reviews:
+        while review_count < max_reviews:
+            # Berhenti jika deadline sudah lewat
+            time_left(deadline, 0)
             update_status(f"⏳ Memproses halaman ulasan {page}...")
             
-            soup = BeautifulSoup(driver.page_source, "html.parser")
-            containers = soup.find_all("article", class_="css-15m2bcr")
-            
-            if not containers:
-                update_status("⚠️ Tidak ditemukan kontainer ulasan")
-                break
+            with span("scrape_review_page"):
+                containers = extract_review_fields(driver)
                 
-            for container in containers:
-                if len(reviews_data) >= max_reviews:
+                if not containers:
+                    update_status("⚠️ Tidak ditemukan kontainer ulasan")
                     break
-                    
-                try:
-                    review_elem = container.select_one("p span[data-testid='lblItemUlasan']")
-                    review_text = review_elem.text.strip() if review_elem else "Tidak ada ulasan"
-                    
-                    if review_text in collected_reviews:
-                        continue
+                
+                page_reviews = []
+                for container in containers:
+                    if review_count >= max_reviews:
+                        break
                         
-                    name_elem = container.select_one("div.css-k4rf3m span.name")
-                    name = name_elem.text.strip() if name_elem else "Unknown"
-                    
-                    rating_elem = container.select_one("div[data-testid='icnStarRating']")
-                    rating = rating_elem["aria-label"] if rating_elem else "Tidak ada rating"
-                    rating = int(re.search(r'\d+', rating).group()) if rating != "Tidak ada rating" else 0
-                    
-                    reviews_data.append({"Nama": name, "Rating": rating, "Ulasan": review_text})
-                    collected_reviews.add(review_text)
-                    
-                    # Report progress - percent completion
-                    progress_percentage = min(len(reviews_data) / max_reviews, 1.0)
-                    if status_callback:
-                        status_callback(progress_percentage, is_progress=True)
-                    
-                except Exception as e:
-                    update_status(f"⚠️ Error saat ekstraksi ulasan: {str(e)}")
+                    try:
+                        review_text = container["text"] if container["text"] is not None else EMPTY_REVIEW_PLACEHOLDER
+                        
+                        if review_text in collected_reviews:
+                            continue
+                            
+                        name = container["name"] if container["name"] is not None else "Unknown"
+                        
+                        rating = container["rating"] or "Tidak ada rating"
+                        rating = int(re.search(r'\d+', rating).group()) if rating != "Tidak ada rating" else 0
+                        
+                        page_reviews.append({"Nama": name, "Rating": rating, "Ulasan": review_text})
+                        collected_reviews.add(review_text)
+                        review_count += 1
+                        
+                        # Report progress - percent completion
+                        progress_percentage = min(review_count / max_reviews, 1.0)
+                        if status_callback:
+                            status_callback(progress_percentage, is_progress=True)
+                        
+                    except Exception as e:
+                        update_status(f"⚠️ Error saat ekstraksi ulasan: {str(e)}")
+                
+            if page_reviews:
+                yield {"type": "reviews", "page": page, "reviews": page_reviews}
             
             # Klik halaman berikutnya jika diperlukan
-            if len(reviews_data) < max_reviews:
+            if review_count < max_reviews:
                 try:
-                    next_page_button = driver.find_element(By.XPATH, "//button[@aria-label='Laman berikutnya']")
-                    next_page_button.click()
-                    time.sleep(5)
+                    with span("scrape_next_page"):
+                        next_page_button = driver.find_element(By.XPATH, selectors.NEXT_PAGE_BUTTON_XPATH)
+                        previous_signature = first_review_signature(driver)
+                        previous_count = len(containers)
+                        next_page_button.click()
+                        
+                        # Halaman sudah berganti jika ulasan pertama atau jumlah kontainer berubah
+                        def page_changed(driver):
+                            signature = first_review_signature(driver)
+                            if signature is None:
+                                return False
+                            current_count = len(driver.find_elements(By.CSS_SELECTOR, selectors.REVIEW_CONTAINER))
+                            return signature != previous_signature or current_count != previous_count
+                        
+                        if not wait_until(
+                            driver, "next_page", page_changed, time_left(deadline, SCRAPER_PAGE_CHANGE_TIMEOUT)
+                        ):
+                            update_status("⚠️ Halaman ulasan berikutnya tidak termuat tepat waktu")
                     page += 1
+                except TimeoutError:
+                    raise
                 except Exception as e:
                     update_status(f"⚠️ Tidak dapat beralih ke halaman berikutnya: {str(e)}")
                     break
         
         # Scraping selesai
-        update_status(f"✅ Scraping selesai! Berhasil mengambil {len(reviews_data)} ulasan")
-        
-        # Siapkan data hasil scraping
-        scraped_data = {
-            "product_name": product_name,
-            "description": description,
-            "reviews": reviews_data
-        }
-        
-        return scraped_data
+        update_status(f"✅ Scraping selesai! Berhasil mengambil {review_count} ulasan")
         
     except Exception as e:
         update_status(f"❌ Error saat scraping: {str(e)}")
         logger.error(f"Error scraping: {str(e)}", exc_info=True)
-        return None
+        yield {"type": "error", "message": str(e)}
     finally:
-        # Tutup browser
-        update_status("🔄 Menutup browser Chrome...")
-        driver.quit()
\ No newline at end of file
+        # Kembalikan browser ke pool, atau tutup jika pool tidak aktif
+        if driver_pool is not None:
+            update_status("🔄 Mengembalikan browser Chrome ke pool...")
+            driver_pool.release(driver)
+        else:
+            update_status("🔄 Menutup browser Chrome...")
+            driver.quit()
+
+@timed("scrape")
+def scrape_tokopedia_reviews(
+    product_url: str, 
+    max_reviews: int = MAX_REVIEWS_DEFAULT, 
+    headless: bool = BROWSER_HEADLESS_DEFAULT,
+    status_callback = None,
+    backend: str = SCRAPER_BACKEND
+) -> Optional[Dict[str, Any]]:
+    """
+    Scrape data produk dan ulasan dari Tokopedia
+    
+    Args:
+        product_url: URL produk Tokopedia
+        max_reviews: Jumlah maksimum ulasan yang akan diambil
+        headless: Boolean untuk menjalankan browser tanpa GUI
+        status_callback: Callback function untuk melaporkan status (opsional)
+        backend: "http" (endpoint GraphQL, fallback ke Selenium) atau "selenium"
+        
+    Returns:
+        Dictionary berisi data produk dan ulasan, atau None jika gagal
+    """
+    scraped_data = None
+    
+    for event in iter_tokopedia_reviews(product_url, max_reviews, headless, status_callback, backend):
+        if event["type"] == "error":
+            return None
+        if event["type"] == "product":
+            scraped_data = {
+                "product_name": event["product_name"],
+                "description": event["description"],
+                "reviews": []
+            }
+        elif event["type"] == "reviews":
+            scraped_data["reviews"].extend(event["reviews"])
+    
+    return scraped_data
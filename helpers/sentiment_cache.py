@@ -0,0 +1,192 @@
+"""
+Module untuk cache hasil analisis sentimen yang persisten di disk (SQLite)
+"""
+
+import os
+import time
+import hashlib
+import sqlite3
+import logging
+import threading
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from helpers.config import SENTIMENT_CACHE_PATH, SENTIMENT_CACHE_MAX_ENTRIES
+
+# Setup logging
+logging.basicConfig(level=logging.INFO, 
+                   format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+logger = logging.getLogger("sentiment_cache")
+
+def get_model_version(model_path: str) -> str:
+    """
+    Tentukan versi model dari isi config dan ukuran/waktu ubah file bobot
+    
+    Args:
+        model_path: Path direktori model lokal atau nama model Hugging Face
+        
+    Returns:
+        String versi model (hash pendek), atau nama model jika bukan direktori lokal
+    """
+    if not os.path.isdir(model_path):
+        return model_path
+    
+    digest = hashlib.sha256()
+    for filename in sorted(os.listdir(model_path)):
+        filepath = os.path.join(model_path, filename)
+        if not os.path.isfile(filepath):
+            continue
+        if filename == "config.json":
+            with open(filepath, 'rb') as f:
+                digest.update(f.read())
+        else:
+            stat = os.stat(filepath)
+            digest.update(f"{filename}:{stat.st_size}:{int(stat.st_mtime)}".encode('utf-8'))
+    return digest.hexdigest()[:16]
+
+def make_cache_key(text: str, model_id: str, model_version: str) -> str:
+    """
+    Buat kunci cache dari teks yang sudah diproses, identitas model, dan versinya
+    
+    Args:
+        text: Teks ulasan yang sudah diproses
+        model_id: Identitas model (nama dan backend)
+        model_version: Versi model
+        
+    Returns:
+        Hash SHA-256 dalam bentuk hex
+    """
+    payload = "\0".join((model_id, model_version, text))
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+class SentimentCache:
+    """
+    Cache logits dan label model berbasis SQLite dengan batas ukuran dan eviksi LRU
+    """
+    
+    def __init__(self, path: str = SENTIMENT_CACHE_PATH, max_entries: int = SENTIMENT_CACHE_MAX_ENTRIES):
+        """
+        Args:
+            path: Lokasi file SQLite
+            max_entries: Jumlah entri maksimum sebelum entri terlama dihapus
+        """
+        self.path = path
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS sentiment_cache ("
+            " key TEXT PRIMARY KEY,"
+            " logits BLOB NOT NULL,"
+            " label INTEGER NOT NULL,"
+            " last_access REAL NOT NULL)"
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_sentiment_cache_access ON sentiment_cache (last_access)"
+        )
+        self._conn.commit()
+    
+    def get_many(self, keys: List[str]) -> Dict[str, Tuple[np.ndarray, int]]:
+        """
+        Ambil entri cache untuk sekumpulan kunci dan perbarui waktu aksesnya
+        
+        Args:
+            keys: List kunci cache
+            
+        Returns:
+            Dictionary kunci ke (logits, label) untuk kunci yang ditemukan
+        """
+        found = {}
+        unique_keys = list(dict.fromkeys(keys))
+        
+        with self._lock:
+            # Batasi jumlah parameter per query sesuai limit SQLite
+            for start in range(0, len(unique_keys), 500):
+                chunk = unique_keys[start:start + 500]
+                placeholders = ",".join("?" * len(chunk))
+                rows = self._conn.execute(
+                    f"SELECT key, logits, label FROM sentiment_cache WHERE key IN ({placeholders})",
+                    chunk
+                ).fetchall()
+                for key, logits, label in rows:
+                    found[key] = (np.frombuffer(logits, dtype=np.float32).copy(), int(label))
+            
+            if found:
+                now = time.time()
+                self._conn.executemany(
+                    "UPDATE sentiment_cache SET last_access = ? WHERE key = ?",
+                    [(now, key) for key in found]
+                )
+                self._conn.commit()
+        
+        return found
+    
+    def put_many(self, entries: Dict[str, np.ndarray]):
+        """
+        Simpan logits model ke cache, lalu hapus entri terlama jika melebihi batas
+        
+        Args:
+            entries: Dictionary kunci ke array logits satu ulasan
+        """
+        if not entries:
+            return
+        
+        now = time.time()
+        rows = [
+            (key, np.asarray(logits, dtype=np.float32).tobytes(), int(np.argmax(logits)), now)
+            for key, logits in entries.items()
+        ]
+        
+        with self._lock:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO sentiment_cache (key, logits, label, last_access) VALUES (?, ?, ?, ?)",
+                rows
+            )
+            total = self._conn.execute("SELECT COUNT(*) FROM sentiment_cache").fetchone()[0]
+            if total > self.max_entries:
+                self._conn.execute(
+                    "DELETE FROM sentiment_cache WHERE key IN ("
+                    " SELECT key FROM sentiment_cache ORDER BY last_access ASC LIMIT ?)",
+                    (total - self.max_entries,)
+                )
+            self._conn.commit()
+    
+    def clear(self):
+        """
+        Hapus semua entri cache
+        """
+        with self._lock:
+            self._conn.execute("DELETE FROM sentiment_cache")
+            self._conn.commit()
+    
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM sentiment_cache").fetchone()[0]
+
+# Cache bersama, dibuat saat pertama kali digunakan
+_default_cache: Optional[SentimentCache] = None
+_default_cache_lock = threading.Lock()
+
+def get_sentiment_cache() -> Optional[SentimentCache]:
+    """
+    Dapatkan cache sentimen bersama
+    
+    Returns:
+        Objek SentimentCache, atau None jika cache tidak dapat dibuka
+    """
+    global _default_cache
+    with _default_cache_lock:
+        if _default_cache is None:
+            try:
+                _default_cache = SentimentCache()
+            except sqlite3.Error as e:
+                logger.error(f"Gagal membuka cache sentimen: {str(e)}")
+                return None
+        return _default_cache
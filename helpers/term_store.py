@@ -0,0 +1,241 @@
+"""
+Module untuk tabel frekuensi kata per produk yang persisten dan diperbarui bertahap (SQLite)
+
+Setiap produk diidentifikasi dengan nama file dari `format_product_name_for_filename`.
+Ulasan yang sudah pernah dihitung dilewati, sehingga pembaruan hanya memproses
+ulasan baru dan wordcloud per sentimen dapat dibuat tanpa membaca ulang riwayat.
+Jika label sentimen ulasan lama berubah (misalnya setelah ganti model), frekuensi
+katanya dipindahkan ke label yang baru.
+"""
+
+import os
+import hashlib
+import sqlite3
+import logging
+import threading
+from collections import Counter
+from typing import Any, Dict, List, Optional, Tuple
+
+from helpers.config import TERM_STORE_PATH, EMPTY_REVIEW_PLACEHOLDER
+
+# Setup logging
+logging.basicConfig(level=logging.INFO, 
+                   format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+logger = logging.getLogger("term_store")
+
+def make_review_hash(review: Dict[str, Any]) -> str:
+    """
+    Buat hash identitas ulasan dari nama pengguna, rating, dan teks aslinya
+    
+    Args:
+        review: Dictionary ulasan
+        
+    Returns:
+        Hash SHA-256 dalam bentuk hex
+    """
+    payload = "\0".join(str(review.get(field, "")) for field in ("Nama", "Rating", "Ulasan"))
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+def has_review_text(review: Dict[str, Any]) -> bool:
+    """
+    Cek apakah ulasan memiliki teks (bukan kosong atau placeholder scraper)
+    """
+    text = str(review.get('Ulasan', '')).strip()
+    return bool(text) and text != EMPTY_REVIEW_PLACEHOLDER and bool(str(review.get('Preprocessed', '')).strip())
+
+class TermFrequencyStore:
+    """
+    Frekuensi kata per produk dan per label sentimen berbasis SQLite
+    """
+    
+    def __init__(self, path: str = TERM_STORE_PATH):
+        """
+        Args:
+            path: Lokasi file SQLite
+        """
+        self.path = path
+        self._lock = threading.Lock()
+        
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS product_reviews ("
+            " product TEXT NOT NULL,"
+            " review_hash TEXT NOT NULL,"
+            " sentiment TEXT NOT NULL,"
+            " PRIMARY KEY (product, review_hash))"
+        )
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS term_frequencies ("
+            " product TEXT NOT NULL,"
+            " sentiment TEXT NOT NULL,"
+            " term TEXT NOT NULL,"
+            " count INTEGER NOT NULL,"
+            " PRIMARY KEY (product, sentiment, term))"
+        )
+        self._conn.commit()
+    
+    def add_reviews(self, product: str, reviews: List[Dict[str, Any]]) -> int:
+        """
+        Tambahkan frekuensi kata dari ulasan yang belum pernah dihitung
+        
+        Ulasan tanpa teks dilewati. Ulasan lama yang label sentimennya berubah
+        dipindahkan frekuensi katanya dari label lama ke label baru.
+        
+        Args:
+            product: Nama file produk
+            reviews: List ulasan yang sudah dianalisis (kolom 'Preprocessed' dan 'Sentimen')
+            
+        Returns:
+            Jumlah ulasan baru yang ditambahkan
+        """
+        from helpers.analyzer import count_words
+        
+        hashes = {make_review_hash(review): review for review in reviews if has_review_text(review)}
+        
+        with self._lock:
+            stored: Dict[str, str] = {}
+            hash_list = list(hashes)
+            # Batasi jumlah parameter per query sesuai limit SQLite
+            for start in range(0, len(hash_list), 500):
+                chunk = hash_list[start:start + 500]
+                placeholders = ",".join("?" * len(chunk))
+                rows = self._conn.execute(
+                    f"SELECT review_hash, sentiment FROM product_reviews WHERE product = ? AND review_hash IN ({placeholders})",
+                    [product] + chunk
+                ).fetchall()
+                stored.update(rows)
+            
+            new_count = 0
+            changed: Dict[str, Dict[str, Any]] = {}
+            # Selisih frekuensi kata per label sentimen: ulasan baru ditambahkan,
+            # ulasan yang labelnya berubah dipindahkan dari label lama
+            frequencies: Dict[str, Counter] = {}
+            for key, review in hashes.items():
+                sentiment = str(review.get('Sentimen', ''))
+                previous = stored.get(key)
+                if previous == sentiment:
+                    continue
+                terms = count_words([str(review.get('Preprocessed', ''))])
+                if previous is None:
+                    new_count += 1
+                else:
+                    frequencies.setdefault(previous, Counter()).subtract(terms)
+                frequencies.setdefault(sentiment, Counter()).update(terms)
+                changed[key] = review
+            
+            if not changed:
+                return 0
+            
+            self._conn.executemany(
+                "INSERT INTO product_reviews (product, review_hash, sentiment) VALUES (?, ?, ?)"
+                " ON CONFLICT (product, review_hash) DO UPDATE SET sentiment = excluded.sentiment",
+                [(product, key, str(review.get('Sentimen', ''))) for key, review in changed.items()]
+            )
+            self._conn.executemany(
+                "INSERT INTO term_frequencies (product, sentiment, term, count) VALUES (?, ?, ?, ?)"
+                " ON CONFLICT (product, sentiment, term) DO UPDATE SET count = count + excluded.count",
+                [
+                    (product, sentiment, term, count)
+                    for sentiment, counter in frequencies.items()
+                    for term, count in counter.items()
+                    if count
+                ]
+            )
+            self._conn.execute("DELETE FROM term_frequencies WHERE product = ? AND count <= 0", (product,))
+            self._conn.commit()
+        
+        relabeled = len(changed) - new_count
+        logger.info(f"{new_count} ulasan baru ditambahkan dan {relabeled} ulasan diperbarui labelnya pada frekuensi kata {product}")
+        return new_count
+    
+    def frequencies(self, product: str, sentiment: Optional[str] = None) -> Counter:
+        """
+        Ambil tabel frekuensi kata produk
+        
+        Args:
+            product: Nama file produk
+            sentiment: Label sentimen (None untuk semua label)
+            
+        Returns:
+            Tabel frekuensi kata
+        """
+        query = "SELECT term, SUM(count) FROM term_frequencies WHERE product = ?"
+        params: List[Any] = [product]
+        if sentiment is not None:
+            query += " AND sentiment = ?"
+            params.append(sentiment)
+        query += " GROUP BY term"
+        
+        with self._lock:
+            return Counter(dict(self._conn.execute(query, params).fetchall()))
+    
+    def top_terms(self, product: str, sentiment: Optional[str] = None, limit: int = 20) -> List[Tuple[str, int]]:
+        """
+        Kata yang paling sering muncul untuk produk
+        
+        Args:
+            product: Nama file produk
+            sentiment: Label sentimen (None untuk semua label)
+            limit: Jumlah kata maksimum
+            
+        Returns:
+            List (kata, jumlah) terurut dari yang terbanyak
+        """
+        query = "SELECT term, SUM(count) AS total FROM term_frequencies WHERE product = ?"
+        params: List[Any] = [product]
+        if sentiment is not None:
+            query += " AND sentiment = ?"
+            params.append(sentiment)
+        query += " GROUP BY term ORDER BY total DESC, term ASC LIMIT ?"
+        params.append(limit)
+        
+        with self._lock:
+            return [(term, int(total)) for term, total in self._conn.execute(query, params).fetchall()]
+    
+    def review_count(self, product: str) -> int:
+        """
+        Jumlah ulasan yang sudah dihitung untuk produk
+        """
+        with self._lock:
+            return self._conn.execute(
+                "SELECT COUNT(*) FROM product_reviews WHERE product = ?", (product,)
+            ).fetchone()[0]
+    
+    def clear(self, product: Optional[str] = None):
+        """
+        Hapus frekuensi kata satu produk, atau semua produk jika product None
+        """
+        with self._lock:
+            if product is None:
+                self._conn.execute("DELETE FROM product_reviews")
+                self._conn.execute("DELETE FROM term_frequencies")
+            else:
+                self._conn.execute("DELETE FROM product_reviews WHERE product = ?", (product,))
+                self._conn.execute("DELETE FROM term_frequencies WHERE product = ?", (product,))
+            self._conn.commit()
+
+# Store bersama, dibuat saat pertama kali digunakan
+_default_store: Optional[TermFrequencyStore] = None
+_default_store_lock = threading.Lock()
+
+def get_term_store() -> Optional[TermFrequencyStore]:
+    """
+    Dapatkan store frekuensi kata bersama
+    
+    Returns:
+        Objek TermFrequencyStore, atau None jika store tidak dapat dibuka
+    """
+    global _default_store
+    with _default_store_lock:
+        if _default_store is None:
+            try:
+                _default_store = TermFrequencyStore()
+            except sqlite3.Error as e:
+                logger.error(f"Gagal membuka store frekuensi kata: {str(e)}")
+                return None
+        return _default_store
@@ -4,8 +4,10 @@ Modul utilitas untuk aplikasi QuickShop
 
 import os
 import logging
-from typing import Dict, Any, List
-import pandas as pd
+from typing import Dict, Any, List, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    import pandas as pd
 
 # Setup logging
 logging.basicConfig(level=logging.INFO, 
@@ -21,7 +23,7 @@ def create_directories():
     os.makedirs('models', exist_ok=True)
     logger.info("Direktori aplikasi disiapkan")
 
-def convert_to_dataframe(reviews: List[Dict[str, Any]]) -> pd.DataFrame:
+def convert_to_dataframe(reviews: List[Dict[str, Any]]) -> "pd.DataFrame":
     """
     Mengubah list dictionary menjadi pandas DataFrame
     
@@ -31,6 +33,8 @@ def convert_to_dataframe(reviews: List[Dict[str, Any]]) -> pd.DataFrame:
     Returns:
         pandas DataFrame
     """
+    import pandas as pd
+    
     try:
         df = pd.DataFrame(reviews)
         return df
@@ -81,6 +85,7 @@ def load_product_data(filename: str) -> Dict[str, Any]:
             return {}
         
         # Baca dari CSV
+        import pandas as pd
         df = pd.read_csv(filepath)
         
         # Konversi kembali ke format data produk